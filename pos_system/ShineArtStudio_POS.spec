@@ -1,9 +1,11 @@
 # -*- mode: python ; coding: utf-8 -*-
-from PyInstaller.utils.hooks import collect_all
+from PyInstaller.utils.hooks import collect_all, collect_submodules
 
 datas = [('auth', 'auth'), ('database', 'database'), ('services', 'services'), ('ui', 'ui')]
 binaries = []
 hiddenimports = ['customtkinter', 'reportlab', 'tkcalendar', 'babel.numbers', 'darkdetect']
+# Page frames and services are imported by name on first use
+hiddenimports += collect_submodules('ui') + collect_submodules('services')
 tmp_ret = collect_all('customtkinter')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 tmp_ret = collect_all('tkcalendar')
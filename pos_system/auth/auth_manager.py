@@ -3,6 +3,8 @@ import sqlite3
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from database.db_manager import DatabaseManager
+
 
 class AuthManager:
     """Handle user authentication and password management"""
@@ -42,6 +44,7 @@ class AuthManager:
                     UPDATE users SET last_login = ? WHERE id = ?
                 ''', (current_time, user['id']))
                 conn.commit()
+                DatabaseManager.mark_written(self.db_path)
                 
                 # Store last_login in current_user
                 self.current_user['last_login'] = current_time
@@ -177,6 +180,7 @@ class AuthManager:
             ''', (new_hash, user_id))
             
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
             
@@ -199,6 +203,7 @@ class AuthManager:
             
             user_id = cursor.lastrowid
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return user_id
             
@@ -235,6 +240,7 @@ class AuthManager:
             ''', (user_id,))
             
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
             
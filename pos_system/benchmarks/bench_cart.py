@@ -0,0 +1,61 @@
+"""
+Building a large order in the billing cart. "Before" is the old list cart:
+each add scans the list for a duplicate line, then the totals are re-summed
+and every line is re-formatted for the Treeview. "After" is the keyed Cart:
+a dict lookup, running totals and one formatted line per change.
+
+Usage: python benchmarks/bench_cart.py
+"""
+from bench_utils import time_call, print_header
+from services.cart import Cart
+
+LINES = 300
+REPEATS = 3
+
+
+def format_line(item):
+    """The values one Treeview row shows"""
+    return (item['name'], item['type'], item['quantity'],
+            f"{item['unit_price']:.2f}", f"{item['total']:.2f}")
+
+
+def order_with_list():
+    """Old cart: list scan for duplicates, full re-sum and redraw per add"""
+    cart_items = []
+    for _ in range(REPEATS):
+        for i in range(LINES):
+            item_type = 'Service' if i % 2 else 'Frame'
+            for existing in cart_items:
+                if existing['id'] == i and existing['type'] == item_type:
+                    existing['quantity'] += 1
+                    existing['total'] = existing['unit_price'] * existing['quantity']
+                    break
+            else:
+                cart_items.append({'type': item_type, 'id': i, 'name': f'Item {i}',
+                                   'quantity': 1, 'unit_price': 1500.0, 'total': 1500.0})
+            [format_line(item) for item in cart_items]
+            sum(item['total'] for item in cart_items)
+            any(item['type'] == 'Service' for item in cart_items)
+
+
+def order_with_cart():
+    """Keyed cart: one lookup, running totals, one redrawn line per add"""
+    cart = Cart()
+    for _ in range(REPEATS):
+        for i in range(LINES):
+            item_type = 'Service' if i % 2 else 'Frame'
+            key = cart.add(item_type, i, f'Item {i}', 1500.0, 1)
+            format_line(cart.get(key))
+            cart.total(500)
+
+
+def main():
+    print_header(f"Adding {LINES} items {REPEATS} times each")
+    before = time_call(order_with_list, repeat=3)
+    after = time_call(order_with_cart, repeat=3)
+    print(f"{'list cart':<22} {before:>8.2f} ms")
+    print(f"{'keyed cart':<22} {after:>8.2f} ms   ({before / after:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Catalog lookups during a sale: opening the category picker, choosing a
+category and checking frame stock while editing the cart. "Before" runs the
+same SQL each lookup used to send; "after" is served from the in-memory
+Catalog, which loads each table once. The category picker is also timed on
+its own: per-category service lookups (as SQL, and from the catalog), the
+grouped SQL sent on every open, and the catalog's categories, which carry
+their service count and free service since the grouped SQL loads them.
+
+Usage: python benchmarks/bench_catalog.py
+"""
+from bench_utils import temp_database, time_call, print_header
+from database import DatabaseManager
+
+CATEGORIES = 50
+SERVICES_PER_CATEGORY = 10
+FRAMES = 200
+CART_EDITS = 20
+PLAIN_CATEGORIES = 'SELECT * FROM categories ORDER BY category_name'
+
+
+def seed(db: DatabaseManager):
+    """Insert CATEGORIES categories with their services, and FRAMES frames"""
+    with db.pool.connection() as conn:
+        conn.executemany('INSERT INTO categories (category_name, service_cost) VALUES (?, ?)',
+                         [(f'Category {i:03d}', 500 * (i % 3)) for i in range(CATEGORIES)])
+        conn.executemany('INSERT INTO services (service_name, price, category_id) VALUES (?, ?, ?)',
+                         [(f'Service {c}-{s}', 0 if s == 0 else 1000 * s, c + 1)
+                          for c in range(CATEGORIES) for s in range(SERVICES_PER_CATEGORY)])
+        conn.executemany('''
+            INSERT INTO photo_frames (frame_name, size, price, quantity, buying_price, selling_price)
+            VALUES (?, ?, 1500, 20, 800, 1500)
+        ''', [(f'Frame {i}', f'{4 + i % 8}x{6 + i % 8}') for i in range(FRAMES)])
+        conn.commit()
+    db.catalog.invalidate()
+
+
+def sale_with_queries(db: DatabaseManager):
+    """The lookups one sale used to send to the database"""
+    categories = db.execute_query(PLAIN_CATEGORIES)
+    for category in categories:
+        db.execute_query('SELECT * FROM services WHERE category_id = ?', (category['id'],))
+    db.execute_query('SELECT * FROM services WHERE category_id = ?', (categories[0]['id'],))
+    db.execute_query(db.CATALOG_QUERIES['photo_frames'])
+    for i in range(CART_EDITS):
+        db.execute_query('SELECT * FROM photo_frames WHERE id = ?', (i % FRAMES + 1,))
+
+
+def sale_with_catalog(db: DatabaseManager):
+    """The same lookups through the catalog"""
+    categories = db.get_all_categories()
+    for category in categories:
+        db.get_services_by_category(category['id'])
+    db.get_services_by_category(categories[0]['id'])
+    db.get_all_photo_frames()
+    for i in range(CART_EDITS):
+        db.get_photo_frame_by_id(i % FRAMES + 1)
+
+
+def picker_per_category(db: DatabaseManager):
+    """Old category picker: every category, then its services to find a free one"""
+    for category in db.execute_query(PLAIN_CATEGORIES):
+        services = db.execute_query('SELECT * FROM services WHERE category_id = ? ORDER BY service_name',
+                                    (category['id'],))
+        category['free_service_name'] = next((s['service_name'] for s in services if s['price'] == 0), None)
+
+
+def picker_per_category_catalog(db: DatabaseManager):
+    """The same per-category lookups served from the catalog"""
+    for category in db.get_all_categories():
+        services = db.get_services_by_category(category['id'])
+        category['free_service_name'] = next((s['service_name'] for s in services if s['price'] == 0), None)
+
+
+def main():
+    with temp_database() as db_path:
+        db = DatabaseManager(db_path)
+        seed(db)
+
+        print_header(f"One sale's catalog lookups, {CATEGORIES} categories, {FRAMES} frames")
+        before = time_call(lambda: sale_with_queries(db))
+        first = time_call(lambda: (db.catalog.invalidate(), sale_with_catalog(db)), repeat=3)
+        after = time_call(lambda: sale_with_catalog(db))
+        print(f"{'queries':<22} {before:>8.2f} ms")
+        print(f"{'catalog, cold':<22} {first:>8.2f} ms")
+        print(f"{'catalog, warm':<22} {after:>8.2f} ms   ({before / after:.0f}x)")
+
+        print_header(f"Category picker, {CATEGORIES} categories")
+        before = time_call(lambda: picker_per_category(db))
+        per_category = time_call(lambda: picker_per_category_catalog(db))
+        grouped = time_call(lambda: db.execute_query(db.CATALOG_QUERIES['categories']))
+        after = time_call(db.get_categories_with_services)
+        print(f"{'query per category':<22} {before:>8.2f} ms")
+        print(f"{'catalog per category':<22} {per_category:>8.2f} ms")
+        print(f"{'grouped query':<22} {grouped:>8.2f} ms")
+        print(f"{'catalog with counts':<22} {after:>8.2f} ms   ({per_category / after:.0f}x vs catalog per category)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Customer type-ahead on 100k customers: search_customers (LIKE '%term%', a
+full scan of the customers table) versus suggest_customers, served from the
+in-memory CustomerIndex. Also times building the index and keeping it current
+through add_customer/update_customer/delete_customer.
+
+Usage: python benchmarks/bench_customer_lookup.py
+"""
+import random
+import time
+
+from bench_utils import temp_database, time_call, print_header
+from database import DatabaseManager
+
+CUSTOMERS = 100_000
+FIRST_NAMES = ['Nimal', 'Kamal', 'Sunil', 'Amara', 'Dilani', 'Kasun', 'Ruwan', 'Sanduni',
+               'Tharindu', 'Chamari', 'Nuwan', 'Ishara', 'Malith', 'Hasini', 'Pradeep', 'Madushi']
+LAST_NAMES = ['Perera', 'Fernando', 'Silva', 'Jayasinghe', 'Bandara', 'Wickramasinghe',
+              'Rathnayake', 'Dissanayake', 'Gunawardena', 'Herath', 'Karunaratne', 'Senanayake']
+# (label, term): billing suggests after five typed characters
+TERMS = [
+    ("Mobile prefix (5 digits)", '07712'),
+    ("Mobile prefix (8 digits)", '07712345'),
+    ("Name word prefix", 'wickr'),
+    ("Two name words", 'kasun bandara'),
+]
+
+
+def seed(db: DatabaseManager):
+    """Insert CUSTOMERS customers with random names and unique mobile numbers"""
+    rng = random.Random(17)
+    mobiles = rng.sample(range(70_000_000, 80_000_000), CUSTOMERS)
+    with db.pool.connection() as conn:
+        conn.executemany('INSERT INTO customers (full_name, mobile_number) VALUES (?, ?)', [
+            (f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', f'0{mobile}')
+            for mobile in mobiles
+        ])
+        conn.commit()
+
+
+def main():
+    with temp_database() as db_path:
+        db = DatabaseManager(db_path)
+        print(f"Seeding {CUSTOMERS:,} customers...")
+        seed(db)
+
+        start = time.perf_counter()
+        db.load_customer_index()
+        print(f"Index built in {(time.perf_counter() - start) * 1000:.0f} ms (once per run)")
+
+        print_header(f"Customer suggestions, {CUSTOMERS:,} customers (top 5)")
+        print(f"{'Lookup':<26} {'LIKE scan (ms)':>15} {'index (us)':>11} {'speedup':>9}")
+        for label, term in TERMS:
+            before = time_call(lambda: db.search_customers(term)[:5])
+            after = time_call(lambda: db.suggest_customers(term, limit=5), repeat=50)
+            print(f"{label:<26} {before:>15.2f} {after * 1000:>11.1f} {before / after:>8.0f}x")
+
+        # Writes keep the index current without a reload
+        customer_id = db.add_customer('Zelda Quintero', '0799999999')
+        assert [c['id'] for c in db.suggest_customers('zel')] == [customer_id]
+        db.update_customer(customer_id, 'Zelda Marquez', '0799999998')
+        assert not db.suggest_customers('quin') and db.suggest_customers('0799999998')
+        db.delete_customer(customer_id)
+        assert not db.suggest_customers('zelda')
+
+        update_ms = time_call(lambda: db.update_customer(customer_id - 1, 'Renamed Customer', '0700000001'))
+        print(f"\nupdate_customer including index maintenance: {update_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Dashboard statistics: the original twelve-connection path, the single
+aggregate pass, and a repeat view served from the DashboardService cache.
+
+Usage: python benchmarks/bench_dashboard_stats.py
+"""
+from bench_utils import temp_database, time_call, print_header
+from database import DatabaseManager
+from services import DashboardService
+
+INVOICE_COUNTS = [1_000, 10_000, 100_000]
+ITEMS_PER_INVOICE = 3
+STEP_SECONDS = 600
+
+
+def seed(db: DatabaseManager, invoices: int):
+    """Insert invoices ending today plus three items each (one of them a frame)"""
+    with db.pool.connection() as conn:
+        conn.execute('''
+            WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO invoices (invoice_number, subtotal, total_amount, paid_amount,
+                                  balance_amount, created_by, created_at)
+            SELECT 'INV' || n, 1000, 1000, 800 + (n % 2) * 200, 200 - (n % 2) * 200, 1,
+                   datetime('now', '-' || (n * ?) || ' seconds')
+            FROM seq
+        ''', (invoices - 1, STEP_SECONDS))
+        conn.execute('''
+            INSERT INTO invoice_items (invoice_id, item_type, item_id, item_name, quantity,
+                                       unit_price, total_price, buying_price)
+            SELECT i.id, CASE k.n WHEN 0 THEN 'Frame' ELSE 'Service' END, 1, 'Item', 1,
+                   300, 300, CASE k.n WHEN 0 THEN 120 ELSE 0 END
+            FROM invoices i, (SELECT 0 AS n UNION ALL SELECT 1 UNION ALL SELECT 2) k
+            WHERE k.n < ?
+        ''', (ITEMS_PER_INVOICE,))
+        conn.commit()
+        conn.execute('ANALYZE')
+
+
+def per_method_stats(service: DashboardService):
+    """The original approach: one connection and query per statistic"""
+    return {
+        'today_sales': service.get_today_sales(),
+        'today_invoices': service.get_today_invoices(),
+        'total_invoices': service.get_total_invoices(),
+        'pending_balances': service.get_pending_balances(),
+        'total_customers': service.get_total_customers(),
+        'pending_bookings': service.get_pending_bookings(),
+        'low_stock_frames': service.get_low_stock_frames(),
+        'weekly_sales': service.get_weekly_sales(),
+        'monthly_sales': service.get_monthly_sales(),
+        'frame_profit': service.get_frame_profit_stats(),
+        'today_frame_profit': service.get_today_frame_profit(),
+        'monthly_frame_profit': service.get_monthly_frame_profit(),
+    }
+
+
+def main():
+    print_header("Admin dashboard statistics")
+    print(f"{'Invoices':>9} {'12 conns (ms)':>14} {'1 pass (ms)':>12} {'cached (ms)':>12} {'speedup':>8}")
+    for invoices in INVOICE_COUNTS:
+        with temp_database() as db_path:
+            seed(DatabaseManager(db_path), invoices)
+            service = DashboardService(db_path)
+            assert per_method_stats(service) == service.get_admin_dashboard_stats(), "stats differ"
+            before = time_call(lambda: per_method_stats(service))
+            after = time_call(lambda: service._collect_stats(include_frame_profit=True))
+            cached = time_call(service.get_admin_dashboard_stats)
+            print(f"{invoices:>9,} {before:>14.1f} {after:>12.1f} {cached:>12.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+DATE(created_at) = ? versus half-open range scans on 1M invoices.
+Wrapping the column in DATE() forces a full table scan; comparing the raw
+column against date_window bounds lets SQLite seek the created_at indexes.
+
+Usage: python benchmarks/bench_date_ranges.py
+"""
+from bench_utils import temp_database, time_call, print_header
+from database import DatabaseManager, day_window, month_window
+
+ROWS = 1_000_000
+STAFF = 5
+# One invoice every 95 seconds covers roughly three years
+START = '2023-01-01'
+STEP_SECONDS = 95
+DAY = '2025-06-15'
+
+QUERIES = [
+    (
+        "Day total",
+        'SELECT COALESCE(SUM(total_amount), 0) FROM invoices WHERE DATE(created_at) = ?',
+        lambda: (DAY,),
+        'SELECT COALESCE(SUM(total_amount), 0) FROM invoices WHERE created_at >= ? AND created_at < ?',
+        lambda: day_window(DAY),
+    ),
+    (
+        "Month total",
+        'SELECT COALESCE(SUM(total_amount), 0) FROM invoices WHERE DATE(created_at) >= ? AND DATE(created_at) < ?',
+        lambda: month_window(DAY),
+        'SELECT COALESCE(SUM(total_amount), 0) FROM invoices WHERE created_at >= ? AND created_at < ?',
+        lambda: month_window(DAY),
+    ),
+    (
+        "Staff invoices on a day",
+        'SELECT * FROM invoices WHERE created_by = ? AND DATE(created_at) = ? ORDER BY created_at',
+        lambda: (1, DAY),
+        'SELECT * FROM invoices WHERE created_by = ? AND created_at >= ? AND created_at < ? ORDER BY created_at',
+        lambda: (1, *day_window(DAY)),
+    ),
+]
+
+
+def seed(db: DatabaseManager):
+    """Insert ROWS invoices spread evenly from START, rotating through STAFF users"""
+    with db.pool.connection() as conn:
+        conn.execute('''
+            WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO invoices (invoice_number, subtotal, total_amount, paid_amount,
+                                  balance_amount, created_by, created_at)
+            SELECT 'INV' || n, 1000, 1000, 1000, 0, n % ? + 1,
+                   datetime(?, (n * ?) || ' seconds')
+            FROM seq
+        ''', (ROWS - 1, STAFF, START, STEP_SECONDS))
+        conn.commit()
+        conn.execute('ANALYZE')
+
+
+def main():
+    with temp_database() as db_path:
+        db = DatabaseManager(db_path)
+        print(f"Seeding {ROWS:,} invoices...")
+        seed(db)
+
+        print_header(f"Date filters on {ROWS:,} invoices")
+        print(f"{'Query':<26} {'DATE() ms':>10} {'range ms':>10} {'speedup':>8}")
+        with db.pool.connection() as conn:
+            for label, old_sql, old_params, new_sql, new_params in QUERIES:
+                old_result = conn.execute(old_sql, old_params()).fetchall()
+                new_result = conn.execute(new_sql, new_params()).fetchall()
+                assert old_result == new_result, f"{label}: results differ"
+                before = time_call(lambda: conn.execute(old_sql, old_params()).fetchall())
+                after = time_call(lambda: conn.execute(new_sql, new_params()).fetchall())
+                print(f"{label:<26} {before:>10.2f} {after:>10.2f} {before / after:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
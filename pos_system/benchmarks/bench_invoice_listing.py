@@ -0,0 +1,64 @@
+"""
+Invoice history listing latency on a database with 10k invoices.
+"Before" is the old InvoiceHistoryFrame pattern: list invoices, then call
+get_booking_by_id once per row for the service name. "After" reads the
+service name joined into the listing query itself.
+
+Usage: python benchmarks/bench_invoice_listing.py
+"""
+from bench_utils import temp_database, time_call, print_header
+from database import DatabaseManager
+
+INVOICES = 10000
+LIMITS = [200, 1000, INVOICES]
+
+
+def seed(db: DatabaseManager):
+    """Insert INVOICES invoices, every other one linked to a booking"""
+    with db.pool.connection() as conn:
+        conn.executemany('''
+            INSERT INTO bookings (customer_name, mobile_number, photoshoot_category, full_amount,
+                                  advance_payment, balance_amount, booking_date, created_by)
+            VALUES (?, ?, ?, 5000, 1000, 4000, '2025-01-01', 1)
+        ''', [(f'Customer {i}', f'07{i:08d}', f'Wedding - Package {i % 7}')
+              for i in range(INVOICES // 2)])
+        conn.executemany('''
+            INSERT INTO invoices (invoice_number, booking_id, guest_name, subtotal, total_amount,
+                                  paid_amount, balance_amount, created_by, created_at)
+            VALUES (?, ?, ?, 5000, 5000, 1000, 4000, 1, datetime('2025-01-01', ? || ' minutes'))
+        ''', [(f'BK-{i:08d}' if i % 2 else f'BILL{i:06d}',
+               i // 2 + 1 if i % 2 else None, f'Guest {i}', i)
+              for i in range(INVOICES)])
+        conn.commit()
+
+
+def list_with_lookups(db: DatabaseManager, limit: int):
+    """Old pattern: one extra query per booking invoice"""
+    rows = db.get_all_invoices(page_size=limit)
+    for row in rows:
+        if row.get('booking_id'):
+            booking = db.get_booking_by_id(row['booking_id'])
+            row['service_name'] = booking.get('photoshoot_category') if booking else None
+    return rows
+
+
+def list_joined(db: DatabaseManager, limit: int):
+    """New pattern: service name comes back with the listing"""
+    return db.get_all_invoices(page_size=limit)
+
+
+def main():
+    with temp_database() as db_path:
+        db = DatabaseManager(db_path)
+        seed(db)
+
+        print_header(f"Invoice listing, {INVOICES} invoices")
+        print(f"{'Rows':>8} {'N+1 (ms)':>10} {'joined (ms)':>12} {'speedup':>8}")
+        for limit in LIMITS:
+            before = time_call(lambda: list_with_lookups(db, limit))
+            after = time_call(lambda: list_joined(db, limit))
+            print(f"{limit:>8} {before:>10.1f} {after:>12.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Sidebar navigation latency, cycling through the pages a cashier uses most.
+"Rebuild" is the old behaviour (FrameCache capacity 0: every visit destroys
+the previous page and constructs the next one); "cached" keeps pages alive
+and swaps them with pack_forget/pack. Times include Tk layout of the page.
+
+Without a display (or with --headless) each page is a stub that makes the
+database reads the real page makes when it is built, and again on show after
+a write. Those times leave out widget construction, so they understate what
+the rebuild mode costs on screen. The database is seeded with CUSTOMERS
+customers and BOOKINGS bookings, each with an invoice.
+
+Usage: python benchmarks/bench_navigation.py [--headless]
+"""
+import itertools
+import os
+import statistics
+import sys
+import time
+import tkinter
+
+from bench_utils import temp_database, print_header
+import customtkinter as ctk
+from auth import AuthManager
+from database import DatabaseManager
+from services.dashboard_service import DashboardService
+from ui.components import FrameCache
+from main import MainApplication
+
+PAGES = ['dashboard', 'billing', 'customers', 'bookings', 'invoices']
+ROUNDS = 5
+CUSTOMERS = 20000
+BOOKINGS = 5000
+
+
+def seed(db: DatabaseManager):
+    """Insert CUSTOMERS customers and BOOKINGS bookings with one invoice each"""
+    with db.pool.connection() as conn:
+        conn.executemany('INSERT INTO customers (full_name, mobile_number) VALUES (?, ?)',
+                         [(f'Customer {i}', f'07{i:08d}') for i in range(CUSTOMERS)])
+        conn.executemany('''
+            INSERT INTO bookings (customer_name, mobile_number, photoshoot_category, full_amount,
+                                  advance_payment, balance_amount, booking_date, created_by)
+            VALUES (?, ?, ?, 5000, 1000, 4000, '2025-01-01', 1)
+        ''', [(f'Customer {i}', f'07{i:08d}', f'Wedding - Package {i % 7}') for i in range(BOOKINGS)])
+        conn.executemany('''
+            INSERT INTO invoices (invoice_number, booking_id, guest_name, subtotal, total_amount,
+                                  paid_amount, balance_amount, created_by, created_at)
+            VALUES (?, ?, ?, 5000, 5000, 1000, 4000, 1, datetime('2025-01-01', ? || ' minutes'))
+        ''', [(f'BK-{i:08d}', i + 1, f'Customer {i}', i) for i in range(BOOKINGS)])
+        conn.commit()
+    DatabaseManager.mark_written(db.db_path)
+
+
+class StubPage:
+    """A page without widgets: building it, and showing it after a write, runs load()"""
+
+    def __init__(self, db: DatabaseManager, load):
+        self.db = db
+        self.load = load
+        self.hidden_generation = None
+        load()
+
+    def pack(self, **kwargs):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def winfo_exists(self):
+        return True
+
+    def destroy(self):
+        pass
+
+    def on_hide(self):
+        self.hidden_generation = DatabaseManager.get_write_generation(self.db.db_path)
+
+    def on_show(self):
+        if DatabaseManager.get_write_generation(self.db.db_path) != self.hidden_generation:
+            self.load()
+
+
+def page_loads(db: DatabaseManager):
+    """The reads each page makes when it is built (first table page of 100 rows)"""
+    return {
+        'dashboard': lambda: DashboardService(db.db_path).get_admin_dashboard_stats(),
+        'billing': lambda: (db.get_all_categories(), db.load_customer_index()),
+        'customers': lambda: db.get_all_customers(page_size=100),
+        'bookings': lambda: (db.get_all_categories(), db.get_all_bookings(page_size=100)),
+        'invoices': lambda: db.get_all_invoices(page_size=100, kind='booking'),
+    }
+
+
+def navigate(cache: FrameCache, root, create, rounds: int, write=None):
+    """Visit every page rounds times and return the per-visit times in milliseconds.
+    write, if given, runs (untimed) once before every round"""
+    times = []
+    for n in range(rounds):
+        if write:
+            write(n)
+        for page in PAGES:
+            start = time.perf_counter()
+            cache.show(page, lambda: create(page))
+            if root is not None:
+                root.update_idletasks()
+            times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def run_headless(db_path: str):
+    """Time navigation over stub pages, with no writes and with one write per round"""
+    db = DatabaseManager(db_path)
+    loads = page_loads(db)
+
+    def create(page):
+        return StubPage(db, loads[page])
+
+    added = itertools.count()
+
+    def write(_):
+        n = next(added)
+        db.add_customer(f'Walk-in {n}', f'08{n:08d}')
+
+    print_header(f"Navigation over {len(PAGES)} stub pages, {ROUNDS} rounds (no widgets)")
+    print(f"{'Mode':<10} {'Writes':<10} {'median (ms)':>12} {'max (ms)':>9}")
+    for writes, label_writes in [(None, 'none'), (write, 'per round')]:
+        for label, capacity in [('rebuild', 0), ('cached', MainApplication.FRAME_CACHE_SIZE)]:
+            cache = FrameCache(None, capacity)
+            navigate(cache, None, create, 1)
+            times = navigate(cache, None, create, ROUNDS, writes)
+            print(f"{label:<10} {label_writes:<10} {statistics.median(times):>12.2f} {max(times):>9.2f}")
+            cache.clear()
+
+
+def run(db_path: str):
+    """Time navigation with and without the frame cache"""
+    db = DatabaseManager(db_path)
+    auth = AuthManager(db_path)
+    auth.authenticate('admin', 'admin123')
+
+    root = ctk.CTk()
+    root.geometry("1500x850")
+    content = ctk.CTkFrame(root)
+    content.pack(fill="both", expand=True)
+
+    def create(page):
+        frame_class = MainApplication.load_frame_class(page)
+        if page in ["profile", "dashboard"]:
+            return frame_class(content, auth, db, None)
+        return frame_class(content, auth, db)
+
+    print_header(f"Navigation over {len(PAGES)} pages, {ROUNDS} rounds")
+    print(f"{'Mode':<10} {'median (ms)':>12} {'max (ms)':>9}")
+    for label, capacity in [('rebuild', 0), ('cached', MainApplication.FRAME_CACHE_SIZE)]:
+        cache = FrameCache(content, capacity)
+        # The first round builds every page in both modes; time the rest
+        navigate(cache, root, create, 1)
+        times = navigate(cache, root, create, ROUNDS)
+        print(f"{label:<10} {statistics.median(times):>12.1f} {max(times):>9.1f}")
+        cache.clear()
+
+    root.destroy()
+
+
+def main():
+    # Services that open the default database path find the seeded one
+    cwd = os.getcwd()
+    with temp_database('pos_database.db') as db_path:
+        os.chdir(os.path.dirname(db_path))
+        try:
+            seed(DatabaseManager(db_path))
+            if '--headless' in sys.argv:
+                run_headless(db_path)
+            else:
+                try:
+                    run(db_path)
+                except tkinter.TclError as e:
+                    print(f"No display ({e}); using stub pages")
+                    run_headless(db_path)
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Read throughput with N reader threads and one writer.
+Compares the reader/writer model in DatabaseManager against the old
+behaviour where a single class-wide lock serialized every query.
+SQLite releases the GIL while stepping, so read scaling needs more than
+one CPU core to show up.
+
+Usage: python benchmarks/bench_read_concurrency.py
+"""
+import itertools
+import threading
+import time
+
+from bench_utils import temp_database, print_header
+from database import DatabaseManager
+
+DURATION = 2.0
+READER_COUNTS = [1, 2, 4, 8]
+SEED_CUSTOMERS = 20000
+WRITE_BATCH = 500
+
+_mobile_counter = itertools.count()
+
+
+class GlobalLockDatabaseManager(DatabaseManager):
+    """Old behaviour: reads and writes share one global lock"""
+
+    _global_lock = threading.Lock()
+
+    def execute_query(self, query, params=()):
+        with self._global_lock:
+            return super().execute_query(query, params)
+
+    def execute_update(self, query, params=()):
+        with self._global_lock:
+            return super().execute_update(query, params)
+
+
+def seed(db: DatabaseManager):
+    with db.pool.connection() as conn:
+        conn.executemany(
+            'INSERT INTO customers (full_name, mobile_number) VALUES (?, ?)',
+            [(f'Customer {i}', f'07{i:08d}') for i in range(SEED_CUSTOMERS)]
+        )
+        conn.commit()
+
+
+def run(manager_class, readers: int):
+    """Return (reads/s, worst read latency in ms, write batches/s) on a fresh database"""
+    with temp_database() as db_path:
+        db = manager_class(db_path)
+        seed(db)
+        return _run(db, readers)
+
+
+def _run(db: DatabaseManager, readers: int):
+    stop = threading.Event()
+    counts = [0] * readers
+    worst = [0.0] * readers
+    writes = [0]
+
+    def reader(slot):
+        while not stop.is_set():
+            start = time.perf_counter()
+            db.execute_query(
+                'SELECT COUNT(*) AS total FROM customers WHERE full_name LIKE ?', ('%99%',)
+            )
+            worst[slot] = max(worst[slot], (time.perf_counter() - start) * 1000)
+            counts[slot] += 1
+
+    def writer():
+        # Batch inserts keep the write lock held long enough to matter
+        while not stop.is_set():
+            base = next(_mobile_counter) * WRITE_BATCH
+            db.execute_update('''
+                WITH RECURSIVE seq(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+                INSERT INTO customers (full_name, mobile_number)
+                SELECT 'Writer ' || n, '08' || printf('%08d', ? + n) FROM seq
+            ''', (WRITE_BATCH - 1, base))
+            writes[0] += 1
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    return sum(counts) / DURATION, max(worst), writes[0] / DURATION
+
+
+def main():
+    print_header("Read throughput: N readers + 1 writer")
+    print(f"{'':>8} {'--- global lock ---':>27} {'--- reader/writer ---':>28}")
+    print(f"{'Readers':>8} {'reads/s':>9} {'max ms':>8} {'writes/s':>9} "
+          f"{'reads/s':>9} {'max ms':>8} {'writes/s':>9}")
+    for readers in READER_COUNTS:
+        legacy = run(GlobalLockDatabaseManager, readers)
+        current = run(DatabaseManager, readers)
+        print(f"{readers:>8} {legacy[0]:>9.0f} {legacy[1]:>8.1f} {legacy[2]:>9.1f} "
+              f"{current[0]:>9.0f} {current[1]:>8.1f} {current[2]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
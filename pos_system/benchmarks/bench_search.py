@@ -0,0 +1,69 @@
+"""
+History search latency on a database with 200k invoices.
+"Before" is the old search_invoices query: six LIKE '%term%' predicates over
+the invoices/customers/bookings join, which scans every invoice. "After" is
+the ranked MATCH against the trigram full-text index (schema migration 4).
+
+Usage: python benchmarks/bench_search.py
+"""
+from bench_utils import temp_database, time_call, print_header
+from database import DatabaseManager
+
+INVOICES = 200000
+TERMS = ['BK-00012345', 'Customer 4242', '0700001234', 'Package 3']
+
+LIKE_QUERY = '''
+    SELECT i.id
+    FROM invoices i
+    LEFT JOIN customers c ON i.customer_id = c.id
+    LEFT JOIN bookings b ON i.booking_id = b.id
+    WHERE i.invoice_number LIKE ?
+       OR c.full_name LIKE ?
+       OR c.mobile_number LIKE ?
+       OR i.guest_name LIKE ?
+       OR b.customer_name LIKE ?
+       OR b.mobile_number LIKE ?
+    ORDER BY i.created_at DESC, i.id DESC
+'''
+
+
+def seed(db: DatabaseManager):
+    """Insert INVOICES invoices, every other one linked to a booking"""
+    with db.pool.connection() as conn:
+        conn.executemany('''
+            INSERT INTO bookings (customer_name, mobile_number, photoshoot_category, full_amount,
+                                  advance_payment, balance_amount, booking_date, created_by)
+            VALUES (?, ?, ?, 5000, 1000, 4000, '2025-01-01', 1)
+        ''', [(f'Customer {i}', f'07{i:08d}', f'Wedding - Package {i % 7}')
+              for i in range(INVOICES // 2)])
+        conn.executemany('''
+            INSERT INTO invoices (invoice_number, booking_id, guest_name, subtotal, total_amount,
+                                  paid_amount, balance_amount, created_by, created_at)
+            VALUES (?, ?, ?, 5000, 5000, 1000, 4000, 1, datetime('2025-01-01', ? || ' minutes'))
+        ''', [(f'BK-{i:08d}' if i % 2 else f'BILL{i:06d}',
+               i // 2 + 1 if i % 2 else None, f'Guest {i}', i)
+              for i in range(INVOICES)])
+        conn.commit()
+
+
+def search_like(db: DatabaseManager, term: str):
+    """Old pattern: LIKE scan over the three-way join"""
+    return db.execute_query(LIKE_QUERY, (f'%{term}%',) * 6)
+
+
+def main():
+    with temp_database() as db_path:
+        db = DatabaseManager(db_path)
+        seed(db)
+
+        print_header(f"Invoice search, {INVOICES} invoices")
+        print(f"{'Term':<16} {'hits':>6} {'LIKE (ms)':>10} {'FTS (ms)':>9} {'speedup':>8}")
+        for term in TERMS:
+            hits = len(db.search_invoices(term))
+            before = time_call(lambda: search_like(db, term), repeat=3)
+            after = time_call(lambda: db.search_invoices(term), repeat=3)
+            print(f"{term:<16} {hits:>6} {before:>10.1f} {after:>9.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cold-start import profile: what `import main` costs before the login window
+can open. Each run is a fresh interpreter with -X importtime; the table
+shows the median cumulative import time of main and the heaviest packages
+it pulls in, and whether ReportLab was loaded at startup.
+
+Pass another checkout's application folder to compare against it.
+
+Usage: python benchmarks/bench_startup.py [app_dir]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from bench_utils import APP_DIR, print_header
+
+RUNS = 7
+TOP = 10
+
+
+def profile_import(app_dir: str) -> dict:
+    """Import main once in a new interpreter and return {module: cumulative microseconds}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=app_dir, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented; keep the first (outermost) entry per module
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def main(argv):
+    app_dir = os.path.abspath(argv[0]) if argv else APP_DIR
+    # One warm-up run writes the bytecode caches
+    profile_import(app_dir)
+    runs = [profile_import(app_dir) for _ in range(RUNS)]
+
+    print_header(f"import main, {app_dir}")
+    total = statistics.median(run['main'] for run in runs) / 1000
+    print(f"Median of {RUNS} runs: {total:.1f} ms")
+    print(f"ReportLab loaded at startup: {'yes' if 'reportlab' in runs[0] else 'no'}")
+
+    # Heaviest top-level packages (cumulative time of their first import)
+    packages = {}
+    for name, micros in runs[0].items():
+        top = name.split('.')[0]
+        if top != 'main':
+            packages[top] = max(packages.get(top, 0), micros)
+    print(f"\n{'Package':<20} {'ms':>8}")
+    for name, micros in sorted(packages.items(), key=lambda item: -item[1])[:TOP]:
+        print(f"{name:<20} {micros / 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,111 @@
+"""
+Refreshing a long list screen after one record changes. "Rebuild" is the old
+behaviour (delete every Treeview row, insert every row again); "keyed" is
+KeyedTable.set_rows, which touches only the rows that differ. Times include
+Tk redrawing the table.
+
+Then the first load of the same rows: set_rows in one Tk callback against
+BaseFrame.fill_table, which inserts a chunk per after() callback. "Blocked"
+is the longest time the window could not respond.
+
+Needs a display (Tk window).
+
+Usage: python benchmarks/bench_table_refresh.py
+"""
+import time
+from tkinter import ttk
+
+from bench_utils import print_header
+import customtkinter as ctk
+from ui.components import BaseFrame, KeyedTable
+
+ROWS = 5000
+REPEATS = 5
+
+
+def make_rows(edit: int = -1):
+    """ROWS customer-like rows; row `edit` gets a changed name"""
+    return [{'id': i, 'full_name': f'Customer {i}{" (edited)" if i == edit else ""}',
+             'mobile_number': f'07{i:08d}', 'created_at': '2024-01-01 10:00:00'} for i in range(ROWS)]
+
+
+def row_values(row):
+    return (row['id'], row['full_name'], row['mobile_number'], row['created_at'])
+
+
+def rebuild(tree, rows):
+    """The old refresh: clear the table and insert everything again"""
+    for item in tree.get_children():
+        tree.delete(item)
+    for i, row in enumerate(rows):
+        tree.insert("", "end", values=row_values(row), tags=('evenrow' if i % 2 == 0 else 'oddrow',))
+
+
+def time_refreshes(root, refresh):
+    """Median time in milliseconds of REPEATS refreshes, each editing another row"""
+    times = []
+    for n in range(REPEATS):
+        rows = make_rows(edit=ROWS // 2 + n)
+        start = time.perf_counter()
+        refresh(rows)
+        root.update_idletasks()
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times)[len(times) // 2]
+
+
+def time_first_load(root, frame, columns):
+    """ms for one-callback set_rows, then longest callback and total ms for chunked fill_table"""
+    tree = ttk.Treeview(frame, columns=columns, show="headings")
+    tree.pack(fill="both", expand=True)
+    start = time.perf_counter()
+    KeyedTable(tree, row_values).set_rows(make_rows())
+    root.update_idletasks()
+    single = (time.perf_counter() - start) * 1000
+    tree.destroy()
+
+    tree = ttk.Treeview(frame, columns=columns, show="headings")
+    tree.pack(fill="both", expand=True)
+    finished = []
+    longest = 0.0
+    start = time.perf_counter()
+    frame.fill_table(KeyedTable(tree, row_values), make_rows(), lambda: finished.append(time.perf_counter()))
+    while not finished:
+        step = time.perf_counter()
+        root.update()
+        longest = max(longest, (time.perf_counter() - step) * 1000)
+    total = (finished[0] - start) * 1000
+    tree.destroy()
+    return single, longest, total
+
+
+def main():
+    root = ctk.CTk()
+    columns = ("ID", "Full Name", "Mobile Number", "Created At")
+
+    print_header(f"Refresh {ROWS} rows after editing one")
+    for label in ('rebuild', 'keyed'):
+        tree = ttk.Treeview(root, columns=columns, show="headings")
+        tree.pack(fill="both", expand=True)
+        if label == 'rebuild':
+            refresh = lambda rows: rebuild(tree, rows)
+        else:
+            table = KeyedTable(tree, row_values)
+            refresh = table.set_rows
+        refresh(make_rows())
+        root.update_idletasks()
+        print(f"{label:<22} {time_refreshes(root, refresh):>8.2f} ms")
+        tree.destroy()
+
+    print_header(f"First load of {ROWS} rows")
+    frame = BaseFrame(root, None, None)
+    frame.pack(fill="both", expand=True)
+    single, chunked_blocked, chunked_total = time_first_load(root, frame, columns)
+    print(f"{'Mode':<22} {'blocked (ms)':>12} {'total (ms)':>11}")
+    print(f"{'one callback':<22} {single:>12.2f} {single:>11.2f}")
+    print(f"{'chunked':<22} {chunked_blocked:>12.2f} {chunked_total:>11.2f}")
+    frame.destroy()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
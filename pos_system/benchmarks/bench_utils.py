@@ -0,0 +1,53 @@
+"""
+Shared helpers for the benchmark scripts in this folder.
+Benchmarks run against a throw-away database in a temp directory.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Make the application packages importable when run as a script
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from database import initialize_database, Catalog, ConnectionPool, CustomerIndex, DatabaseManager
+
+
+@contextmanager
+def temp_database(file_name: str = 'bench.db'):
+    """Create an initialized database in a temp folder and yield its path"""
+    folder = tempfile.mkdtemp(prefix='pos_bench_')
+    db_path = os.path.join(folder, file_name)
+    initialize_database(db_path)
+    try:
+        yield db_path
+    finally:
+        pool = ConnectionPool._pools.pop(db_path, None)
+        if pool:
+            pool.close_all()
+        CustomerIndex._indexes.pop(db_path, None)
+        Catalog._catalogs.pop(db_path, None)
+        DatabaseManager._search_index_available.pop(db_path, None)
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def time_call(func, repeat: int = 5) -> float:
+    """Run func repeat times and return the best wall time in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def print_header(title: str):
+    """Print a benchmark section header"""
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
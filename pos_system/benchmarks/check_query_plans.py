@@ -0,0 +1,101 @@
+"""
+Query plan regression check.
+Runs each hot DatabaseManager/DashboardService lookup against a throw-away
+database, captures the SQL it executes and asserts via EXPLAIN QUERY PLAN
+that the expected index is used. Exits with status 1 if any check fails.
+
+Usage: python benchmarks/check_query_plans.py
+"""
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+from bench_utils import temp_database, print_header
+from database import DatabaseManager
+from services import DashboardService
+
+
+@contextmanager
+def capture_statements():
+    """Trace every connection opened inside the block; yields a list that collects
+    the SQL (with bound values) they run. Clear it between checks."""
+    statements = []
+    original_connect = sqlite3.connect
+
+    def tracing_connect(*args, **kwargs):
+        conn = original_connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    sqlite3.connect = tracing_connect
+    try:
+        yield statements
+    finally:
+        sqlite3.connect = original_connect
+
+
+def build_checks(db: DatabaseManager, dashboard: DashboardService):
+    """(label, call, expected index) for every query that must stay indexed"""
+    return [
+        ("get_invoice_items", lambda: db.get_invoice_items(1), 'idx_invoice_items_invoice'),
+        ("get_bill_items", lambda: db.get_bill_items(1), 'idx_bill_items_bill'),
+        ("get_all_invoices", lambda: db.get_all_invoices(), 'idx_invoices_created'),
+        ("get_all_invoices(kind='booking')", lambda: db.get_all_invoices(kind='booking'), 'idx_invoices_created'),
+        ("get_all_invoices(kind='bill')", lambda: db.get_all_invoices(kind='bill'), 'idx_invoices_booking_created'),
+        ("get_all_invoices item counts", lambda: db.get_all_invoices(), 'idx_invoice_items_invoice'),
+        ("get_all_bills", lambda: db.get_all_bills(), 'idx_bills_created'),
+        ("get_all_bookings(status=...)", lambda: db.get_all_bookings(page_size=50, status='Pending'), 'idx_bookings_status'),
+        ("get_all_bookings", lambda: db.get_all_bookings(page_size=50), 'idx_bookings_date'),
+        ("get_bookings_by_mobile", lambda: db.get_bookings_by_mobile('0771234567'), 'idx_bookings_mobile'),
+        ("catalog categories loader", lambda: (db.catalog.invalidate('categories'), db.get_all_categories()),
+         'idx_services_category'),
+        ("get_staff_invoices_by_date", lambda: db.get_staff_invoices_by_date(1, '2025-01-01'), 'idx_invoices_created_by'),
+        ("get_staff_bookings_by_date", lambda: db.get_staff_bookings_by_date(1, '2025-01-01'), 'idx_bookings_created_by'),
+        ("get_staff_customers_by_date", lambda: db.get_staff_customers_by_date(1, '2025-01-01'), 'idx_customers_created'),
+        ("DashboardService.get_today_sales", dashboard.get_today_sales, 'idx_invoices_created'),
+        ("DashboardService.get_today_invoices", dashboard.get_today_invoices, 'idx_invoices_created'),
+        ("DashboardService.get_weekly_sales", dashboard.get_weekly_sales, 'idx_invoices_created'),
+        ("DashboardService.get_monthly_sales", dashboard.get_monthly_sales, 'idx_invoices_created'),
+        ("DashboardService.get_today_frame_profit", dashboard.get_today_frame_profit, 'idx_invoices_created'),
+        ("DashboardService.get_monthly_frame_profit", dashboard.get_monthly_frame_profit, 'idx_invoices_created'),
+        ("DashboardService.get_pending_bookings", dashboard.get_pending_bookings, 'idx_bookings_status'),
+        ("DashboardService.get_low_stock_frames", dashboard.get_low_stock_frames, 'idx_photo_frames_quantity'),
+    ]
+
+
+def query_plan(conn: sqlite3.Connection, statement: str) -> str:
+    """Get the EXPLAIN QUERY PLAN details of a statement as one string"""
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {statement}').fetchall()
+    return '\n'.join(row[3] for row in rows)
+
+
+def main() -> int:
+    failures = 0
+    with temp_database() as db_path:
+        # No ANALYZE: statistics from a near-empty database would favour table scans
+        plan_conn = sqlite3.connect(db_path)
+
+        print_header("Query plan check")
+        # Pooled connections are opened lazily, so they are traced too
+        with capture_statements() as statements:
+            db = DatabaseManager(db_path)
+            dashboard = DashboardService(db_path)
+            for label, call, index in build_checks(db, dashboard):
+                statements.clear()
+                call()
+                plans = [query_plan(plan_conn, s) for s in statements
+                         if s.lstrip().upper().startswith(('SELECT', 'WITH'))]
+                ok = any(index in plan for plan in plans)
+                failures += not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {label:<45} {index}")
+                if not ok:
+                    for plan in plans:
+                        print('     ' + plan.replace('\n', '\n     '))
+        plan_conn.close()
+
+    print(f"\n{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
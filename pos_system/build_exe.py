@@ -24,6 +24,9 @@ PyInstaller.__main__.run([
     '--hidden-import=tkcalendar',
     '--hidden-import=babel.numbers',
     '--hidden-import=darkdetect',
+    # Page frames and services are imported by name on first use
+    '--collect-submodules=ui',
+    '--collect-submodules=services',
     '--collect-all=customtkinter',
     '--collect-all=tkcalendar',
     '--noconfirm'
@@ -1,4 +1,9 @@
 from .schema import DatabaseSchema, initialize_database
+from .catalog import Catalog
+from .connection_pool import ConnectionPool
+from .customer_index import CustomerIndex
 from .db_manager import DatabaseManager
+from .date_window import date_window, day_window, last_days_window, month_window
 
-__all__ = ['DatabaseSchema', 'initialize_database', 'DatabaseManager']
+__all__ = ['DatabaseSchema', 'initialize_database', 'Catalog', 'ConnectionPool', 'CustomerIndex', 'DatabaseManager',
+           'date_window', 'day_window', 'last_days_window', 'month_window']
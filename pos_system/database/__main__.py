@@ -0,0 +1,26 @@
+import sys
+
+from .schema import DatabaseSchema
+
+# Maintenance commands, run from the application folder:
+#   python -m database --rebuild-rollup [db_path]
+#   python -m database --rebuild-search [db_path]
+
+COMMANDS = {
+    '--rebuild-rollup': DatabaseSchema.rebuild_daily_sales_rollup,
+    '--rebuild-search': DatabaseSchema.rebuild_search_index,
+}
+
+
+def main(argv):
+    """Run a database maintenance command"""
+    if not argv or argv[0] not in COMMANDS:
+        print(f"Usage: python -m database {{{'|'.join(COMMANDS)}}} [db_path]")
+        return 1
+    db_path = argv[1] if len(argv) > 1 else 'pos_database.db'
+    COMMANDS[argv[0]](DatabaseSchema(db_path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
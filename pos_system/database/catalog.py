@@ -0,0 +1,121 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Catalog:
+    """In-memory copy of the sellable catalog: categories, services and photo frames.
+
+    Each table is loaded once into dicts indexed by id (categories also by name,
+    services also by category), so price and stock lookups during a sale do not
+    touch the database. DatabaseManager's add/update/delete methods invalidate
+    the tables they change (a sale's stock change included); the next lookup
+    reloads just those tables. `version` is bumped on every change so screens
+    can tell when their own copies are stale.
+    One catalog is shared per database file.
+    """
+
+    TABLES = ('categories', 'services', 'photo_frames')
+
+    _catalogs = {}
+    _catalogs_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = 0
+        self._loaded = set()
+        self._categories: List[Dict[str, Any]] = []
+        self._categories_by_id: Dict[int, Dict[str, Any]] = {}
+        self._categories_by_name: Dict[str, Dict[str, Any]] = {}
+        self._services: List[Dict[str, Any]] = []
+        self._services_by_id: Dict[int, Dict[str, Any]] = {}
+        self._services_by_category: Dict[int, List[Dict[str, Any]]] = {}
+        self._frames: List[Dict[str, Any]] = []
+        self._frames_by_id: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def for_path(cls, db_path='pos_database.db') -> 'Catalog':
+        """Get the shared catalog for a database file (one catalog per path)"""
+        with cls._catalogs_lock:
+            catalog = cls._catalogs.get(db_path)
+            if catalog is None:
+                catalog = cls()
+                cls._catalogs[db_path] = catalog
+            return catalog
+
+    def invalidate(self, *tables: str):
+        """Drop the given tables (all if none given); they reload on next use"""
+        with self._lock:
+            self._loaded.difference_update(tables or self.TABLES)
+            self.version += 1
+
+    def _ensure(self, table: str, load_rows: Callable[[str], Optional[List[Dict[str, Any]]]]):
+        """Load a table through load_rows(table) unless it is already loaded.
+        load_rows returns None if the read failed; the table is then retried next time."""
+        if table in self._loaded:
+            return
+        rows = load_rows(table)
+        loaded = rows is not None
+        rows = rows or []
+        if table == 'categories':
+            self._categories = rows
+            self._categories_by_id = {row['id']: row for row in rows}
+            self._categories_by_name = {row['category_name']: row for row in rows}
+        elif table == 'services':
+            self._services = rows
+            self._services_by_id = {row['id']: row for row in rows}
+            self._services_by_category = {}
+            for row in rows:
+                # Uncategorized services are not listed under any category
+                if row['category_id'] is not None:
+                    self._services_by_category.setdefault(row['category_id'], []).append(row)
+        else:
+            self._frames = rows
+            self._frames_by_id = {row['id']: row for row in rows}
+        if loaded:
+            self._loaded.add(table)
+
+    # Lookups return copies, so callers may modify what they get back
+
+    def categories(self, load_rows) -> List[Dict[str, Any]]:
+        """All categories, ordered by name"""
+        with self._lock:
+            self._ensure('categories', load_rows)
+            return [dict(row) for row in self._categories]
+
+    def category(self, load_rows, category_id: int = None,
+                 category_name: str = None) -> Optional[Dict[str, Any]]:
+        """One category by id or by name"""
+        with self._lock:
+            self._ensure('categories', load_rows)
+            if category_name is not None:
+                row = self._categories_by_name.get(category_name)
+            else:
+                row = self._categories_by_id.get(category_id)
+            return dict(row) if row else None
+
+    def services(self, load_rows, category_id: Any = ...) -> List[Dict[str, Any]]:
+        """All services (or one category's), ordered by name"""
+        with self._lock:
+            self._ensure('services', load_rows)
+            rows = self._services if category_id is ... else self._services_by_category.get(category_id, [])
+            return [dict(row) for row in rows]
+
+    def service(self, load_rows, service_id: int) -> Optional[Dict[str, Any]]:
+        """One service by id"""
+        with self._lock:
+            self._ensure('services', load_rows)
+            row = self._services_by_id.get(service_id)
+            return dict(row) if row else None
+
+    def frames(self, load_rows) -> List[Dict[str, Any]]:
+        """All photo frames, ordered by name and size"""
+        with self._lock:
+            self._ensure('photo_frames', load_rows)
+            return [dict(row) for row in self._frames]
+
+    def frame(self, load_rows, frame_id: int) -> Optional[Dict[str, Any]]:
+        """One photo frame by id"""
+        with self._lock:
+            self._ensure('photo_frames', load_rows)
+            row = self._frames_by_id.get(frame_id)
+            return dict(row) if row else None
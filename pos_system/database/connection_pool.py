@@ -0,0 +1,154 @@
+import sqlite3
+import threading
+import time
+import queue
+from contextlib import contextmanager
+from typing import Dict, Any
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections, configured once and reused"""
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path='pos_database.db', max_size: int = 8, timeout: float = 30.0):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.wait_time = 0.0
+
+    @classmethod
+    def for_path(cls, db_path='pos_database.db') -> 'ConnectionPool':
+        """Get the shared pool for a database file (one pool per path)"""
+        with cls._pools_lock:
+            pool = cls._pools.get(db_path)
+            if pool is None or pool._closed:
+                pool = cls(db_path)
+                cls._pools[db_path] = pool
+            return pool
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Open a new connection and apply pragmas (runs once per connection)"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Enable WAL mode for better concurrent access
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a connection from the pool, opening a new one if below max_size"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self.hits += 1
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.max_size
+            if can_create:
+                self._created += 1
+                self.misses += 1
+
+        if can_create:
+            try:
+                return self._create_connection()
+            except sqlite3.Error:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Pool exhausted - wait for a connection to be released
+        start = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a pooled database connection")
+        finally:
+            with self._lock:
+                self.waits += 1
+                self.wait_time += time.perf_counter() - start
+        with self._lock:
+            self.hits += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False):
+        """Return a connection to the pool (rolls back any open transaction)"""
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        if discard or self._closed:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            with self._lock:
+                self._created -= 1
+            return
+
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Context manager that acquires and releases a pooled connection"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics"""
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'open_connections': self._created,
+                'idle_connections': self._idle.qsize(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'total_wait_time': self.wait_time,
+                'avg_wait_time': self.wait_time / self.waits if self.waits else 0.0,
+            }
+
+    def reset_stats(self):
+        """Reset usage statistics"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.waits = 0
+            self.wait_time = 0.0
+
+    def close_all(self):
+        """Close every idle connection and stop handing out new ones"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            with self._lock:
+                self._created -= 1
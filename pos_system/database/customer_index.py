@@ -0,0 +1,170 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _name_tokens(full_name: str) -> List[str]:
+    """Split a name into lowercase words"""
+    return (full_name or '').casefold().split()
+
+
+def _prefix_ids(keys: List[tuple], prefix: str):
+    """Yield ids whose key starts with prefix from a sorted list of (key, ..., id)"""
+    for i in range(bisect_left(keys, (prefix,)), len(keys)):
+        if not keys[i][0].startswith(prefix):
+            return
+        yield keys[i][-1]
+
+
+def _word_runs(names: List[tuple], prefix: str):
+    """Yield the runs of (word, full_name, id) entries for each word starting with prefix.
+    Within a run entries are already in (full_name, id) order."""
+    start = bisect_left(names, (prefix,))
+    while start < len(names) and names[start][0].startswith(prefix):
+        # '\0' sorts after the word itself but before any longer word
+        end = bisect_left(names, (names[start][0] + '\0',), start)
+        yield names[start:end]
+        start = end
+
+
+class CustomerIndex:
+    """In-memory prefix index over customer mobile numbers and name words.
+
+    Mobile numbers are kept as sorted (mobile, id) and name words as sorted
+    (word, full_name, id), both searched with bisect instead of a LIKE '%term%'
+    scan of the customers table. Because each word's entries are already in name
+    order, a limited lookup merges them lazily and stops after `limit` rows.
+    One index is shared per database file. It is loaded on first use and kept
+    current by DatabaseManager's add/update/delete_customer through refresh();
+    customers changed while the index is loading are re-read once it is built.
+    """
+
+    _indexes = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._customers: Dict[int, Dict[str, Any]] = {}
+        self._mobiles: List[tuple] = []
+        self._names: List[tuple] = []
+        self.loaded = False
+        # Guards _loading/_changed, so writers never wait for a load to finish
+        self._state_lock = threading.Lock()
+        self._loading = False
+        self._changed = set()
+
+    @classmethod
+    def for_path(cls, db_path='pos_database.db') -> 'CustomerIndex':
+        """Get the shared index for a database file (one index per path)"""
+        with cls._indexes_lock:
+            index = cls._indexes.get(db_path)
+            if index is None:
+                index = cls()
+                cls._indexes[db_path] = index
+            return index
+
+    def ensure_loaded(self, load_rows: Callable[[], List[Dict[str, Any]]],
+                      load_row: Callable[[int], Optional[Dict[str, Any]]]):
+        """Build the index from load_rows() unless it is already built.
+        Customers changed during the load are then re-read with load_row(id)."""
+        with self._lock:
+            if self.loaded:
+                return
+            with self._state_lock:
+                self._loading = True
+                self._changed = set()
+            try:
+                rows = load_rows()
+            except Exception:
+                # Not loaded, so the next use retries from scratch
+                with self._state_lock:
+                    self._loading = False
+                raise
+            self._customers = {row['id']: row for row in rows}
+            self._mobiles = sorted((row['mobile_number'], row['id']) for row in self._customers.values())
+            self._names = sorted((token, row['full_name'], row['id']) for row in self._customers.values()
+                                 for token in _name_tokens(row['full_name']))
+            with self._state_lock:
+                changed, self._changed = self._changed, set()
+                self._loading = False
+                self.loaded = True
+            # Later writes wait on _lock in refresh(), so they apply after these
+            for customer_id in changed:
+                self._replace(customer_id, load_row(customer_id))
+    
+    def refresh(self, customer_id: int, load_row: Callable[[int], Optional[Dict[str, Any]]]):
+        """Bring one customer up to date after a write (load_row returns None once deleted).
+        During a load the id is recorded and re-read when the load finishes;
+        before the first load there is nothing to update."""
+        with self._state_lock:
+            if self._loading:
+                self._changed.add(customer_id)
+                return
+            if not self.loaded:
+                return
+        with self._lock:
+            self._replace(customer_id, load_row(customer_id))
+    
+    def _replace(self, customer_id: int, customer: Optional[Dict[str, Any]]):
+        """Swap in a customer's current row, or drop it if customer is None"""
+        self._remove(customer_id)
+        if customer is None:
+            return
+        self._customers[customer_id] = customer
+        insort(self._mobiles, (customer['mobile_number'], customer_id))
+        for token in _name_tokens(customer['full_name']):
+            insort(self._names, (token, customer['full_name'], customer_id))
+
+    def _remove(self, customer_id: int):
+        customer = self._customers.pop(customer_id, None)
+        if customer is None:
+            return
+        self._discard(self._mobiles, (customer['mobile_number'], customer_id))
+        for token in _name_tokens(customer['full_name']):
+            self._discard(self._names, (token, customer['full_name'], customer_id))
+
+    @staticmethod
+    def _discard(keys: List[tuple], entry: tuple):
+        i = bisect_left(keys, entry)
+        if i < len(keys) and keys[i] == entry:
+            del keys[i]
+
+    def _prefix_count(self, prefix: str) -> int:
+        """Count name entries whose word starts with prefix"""
+        return (bisect_left(self._names, (prefix + '\U0010ffff',))
+                - bisect_left(self._names, (prefix,)))
+
+    def clear(self):
+        """Forget everything; the next lookup reloads from the database"""
+        with self._lock:
+            self._customers, self._mobiles, self._names = {}, [], []
+            self.loaded = False
+
+    def search(self, term: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find customers whose mobile number starts with term, or whose name has a
+        word starting with each word of term. Results are ordered by name."""
+        words = term.casefold().split()
+        if not words:
+            return []
+        with self._lock:
+            matches = set(_prefix_ids(self._mobiles, term.strip()))
+            # Walk name entries for the most selective word in name order,
+            # checking the other words against each candidate
+            words.sort(key=lambda word: self._prefix_count(word))
+            runs = list(_word_runs(self._names, words[0]))
+            name_matches = 0
+            for _, _, customer_id in heapq.merge(*runs, key=lambda entry: entry[1:]):
+                if customer_id in matches:
+                    continue
+                tokens = _name_tokens(self._customers[customer_id]['full_name'])
+                if all(any(token.startswith(word) for token in tokens) for word in words[1:]):
+                    matches.add(customer_id)
+                    name_matches += 1
+                    if limit and name_matches >= limit:
+                        break
+            rows = (self._customers[customer_id] for customer_id in matches)
+            order = lambda row: (row['full_name'], row['id'])
+            if limit:
+                return heapq.nsmallest(limit, rows, key=order)
+            return sorted(rows, key=order)
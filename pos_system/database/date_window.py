@@ -0,0 +1,43 @@
+from datetime import date, datetime, timedelta
+from typing import Tuple, Union
+
+# Timestamps are stored as 'YYYY-MM-DD HH:MM:SS' text, so bare 'YYYY-MM-DD'
+# bounds select whole days: start <= created_at < end. Unlike DATE(created_at),
+# comparing the raw column lets SQLite use an index on it.
+
+DateLike = Union[None, str, date, datetime]
+
+
+def _as_date(day: DateLike) -> date:
+    """Normalize None (today), 'YYYY-MM-DD' strings and datetimes to a date"""
+    if day is None:
+        return date.today()
+    if isinstance(day, datetime):
+        return day.date()
+    if isinstance(day, str):
+        return datetime.strptime(day[:10], '%Y-%m-%d').date()
+    return day
+
+
+def date_window(start: DateLike, end: DateLike) -> Tuple[str, str]:
+    """Get half-open (start, end) bounds for the days from start up to, not including, end"""
+    return _as_date(start).isoformat(), _as_date(end).isoformat()
+
+
+def day_window(day: DateLike = None) -> Tuple[str, str]:
+    """Get bounds covering one calendar day (default today)"""
+    start = _as_date(day)
+    return date_window(start, start + timedelta(days=1))
+
+
+def last_days_window(days: int, day: DateLike = None) -> Tuple[str, str]:
+    """Get bounds from N days before day (default today) through the end of day"""
+    end = _as_date(day) + timedelta(days=1)
+    return date_window(end - timedelta(days=days + 1), end)
+
+
+def month_window(day: DateLike = None) -> Tuple[str, str]:
+    """Get bounds covering the calendar month containing day (default today)"""
+    start = _as_date(day).replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return date_window(start, next_month)
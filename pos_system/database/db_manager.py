@@ -1,32 +1,75 @@
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 import threading
 
+from .catalog import Catalog
+from .connection_pool import ConnectionPool
+from .customer_index import CustomerIndex
+from .date_window import day_window
+
 
 class DatabaseManager:
     """Central database manager for all CRUD operations"""
     
-    _lock = threading.Lock()
+    # Only writers serialize; WAL mode lets readers run alongside them
+    _write_lock = threading.Lock()
+    # Bumped after every committed write, per database file; caches built from
+    # reads (e.g. dashboard stats) compare it to know when they are stale
+    _write_generations = {}
+    # Whether the full-text search tables (schema migration 4) exist, per database file
+    _search_index_available = {}
+    # Shortest term the trigram search indexes answer; shorter terms use LIKE
+    FTS_MIN_TERM_LENGTH = 3
     
     def __init__(self, db_path='pos_database.db'):
         self.db_path = db_path
-        
-    def get_connection(self):
-        """Get database connection with timeout and WAL mode"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
-        conn.row_factory = sqlite3.Row
-        # Enable WAL mode for better concurrent access
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=30000")
-        return conn
+        # Connections are pooled per database file and shared between managers
+        self.pool = ConnectionPool.for_path(db_path)
+        # Type-ahead customer lookups are served from memory (see suggest_customers)
+        self.customer_index = CustomerIndex.for_path(db_path)
+        # Categories, services and frames are served from memory (see get_catalog_version)
+        self.catalog = Catalog.for_path(db_path)
+    
+    @classmethod
+    def get_write_generation(cls, db_path='pos_database.db') -> int:
+        """Get the write generation for a database file (0 until its first write)"""
+        return cls._write_generations.get(db_path, 0)
+    
+    def _bump_write_generation(self):
+        """Mark a committed write; call while holding _write_lock"""
+        self._write_generations[self.db_path] = self._write_generations.get(self.db_path, 0) + 1
+    
+    @classmethod
+    def mark_written(cls, db_path='pos_database.db'):
+        """Mark a write committed outside DatabaseManager (UserService, SettingsService
+        and AuthManager use their own connections) so screens watching the write
+        generation reload"""
+        with cls._write_lock:
+            cls._write_generations[db_path] = cls._write_generations.get(db_path, 0) + 1
+    
+    def _search_phrase(self, search_term: str) -> Optional[str]:
+        """Get the FTS5 MATCH phrase for a search term, or None to fall back to LIKE.
+        The trigram index only answers terms of FTS_MIN_TERM_LENGTH or more characters."""
+        if len(search_term) < self.FTS_MIN_TERM_LENGTH:
+            return None
+        if self.db_path not in self._search_index_available:
+            rows = self.execute_query("SELECT 1 FROM sqlite_master WHERE name = 'invoices_fts'")
+            self._search_index_available[self.db_path] = bool(rows)
+        if not self._search_index_available[self.db_path]:
+            return None
+        # Quoted as one phrase so the term matches as a substring, like LIKE '%term%'
+        return '"' + search_term.replace('"', '""') + '"'
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics (hits, misses, wait time)"""
+        return self.pool.get_stats()
     
     def execute_query(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
         """Execute a SELECT query and return results as list of dicts"""
-        conn = None
         try:
-            with self._lock:
-                conn = self.get_connection()
+            with self.pool.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
@@ -34,44 +77,47 @@ class DatabaseManager:
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return []
-        finally:
-            if conn:
-                conn.close()
     
     def execute_update(self, query: str, params: Tuple = ()) -> bool:
         """Execute INSERT, UPDATE, or DELETE query"""
-        conn = None
         try:
-            with self._lock:
-                conn = self.get_connection()
+            with self._write_lock, self.pool.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params)
                 conn.commit()
+                self._bump_write_generation()
                 return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False
-        finally:
-            if conn:
-                conn.close()
     
     def execute_insert(self, query: str, params: Tuple = ()) -> Optional[int]:
         """Execute INSERT query and return last inserted id"""
-        conn = None
         try:
-            with self._lock:
-                conn = self.get_connection()
+            with self._write_lock, self.pool.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params)
                 last_id = cursor.lastrowid
                 conn.commit()
+                self._bump_write_generation()
                 return last_id
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return None
-        finally:
-            if conn:
-                conn.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one pooled connection as a single transaction.
+        Commits on success, rolls back if the block raises."""
+        with self._write_lock, self.pool.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.commit()
+                self._bump_write_generation()
+            except BaseException:
+                conn.rollback()
+                raise
     
     # Customer operations
     def add_customer(self, full_name: str, mobile_number: str) -> Optional[int]:
@@ -80,7 +126,10 @@ class DatabaseManager:
             INSERT INTO customers (full_name, mobile_number)
             VALUES (?, ?)
         '''
-        return self.execute_insert(query, (full_name, mobile_number))
+        customer_id = self.execute_insert(query, (full_name, mobile_number))
+        if customer_id:
+            self._refresh_indexed_customer(customer_id)
+        return customer_id
     
     def update_customer(self, customer_id: int, full_name: str, mobile_number: str) -> bool:
         """Update customer details"""
@@ -89,12 +138,33 @@ class DatabaseManager:
             SET full_name = ?, mobile_number = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         '''
-        return self.execute_update(query, (full_name, mobile_number, customer_id))
+        success = self.execute_update(query, (full_name, mobile_number, customer_id))
+        if success:
+            self._refresh_indexed_customer(customer_id)
+        return success
     
     def delete_customer(self, customer_id: int) -> bool:
         """Delete a customer"""
         query = 'DELETE FROM customers WHERE id = ?'
-        return self.execute_update(query, (customer_id,))
+        success = self.execute_update(query, (customer_id,))
+        if success:
+            self._refresh_indexed_customer(customer_id)
+        return success
+    
+    def _refresh_indexed_customer(self, customer_id: int):
+        """Copy a customer row into the lookup index after it changes"""
+        self.customer_index.refresh(customer_id, self.get_customer_by_id)
+    
+    def suggest_customers(self, search_term: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Type-ahead lookup: customers whose mobile starts with the term or whose name
+        words start with its words, ordered by name. Served from the in-memory index."""
+        self.load_customer_index()
+        return self.customer_index.search(search_term, limit)
+    
+    def load_customer_index(self):
+        """Build the in-memory customer index if it has not been built yet"""
+        self.customer_index.ensure_loaded(lambda: self.execute_query('SELECT * FROM customers'),
+                                          self.get_customer_by_id)
     
     def get_customer_by_id(self, customer_id: int) -> Optional[Dict[str, Any]]:
         """Get customer by ID"""
@@ -108,26 +178,88 @@ class DatabaseManager:
         results = self.execute_query(query, (mobile_number,))
         return results[0] if results else None
     
-    def get_all_customers(self) -> List[Dict[str, Any]]:
-        """Get all customers"""
-        query = 'SELECT * FROM customers ORDER BY full_name'
-        return self.execute_query(query)
+    def get_all_customers(self, page_size: Optional[int] = None, after_full_name: Optional[str] = None,
+                          after_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get customers ordered by name.
+        With page_size, returns one page; pass the full_name and id of the last row
+        seen as after_full_name/after_id to fetch the next one."""
+        conditions = []
+        params = []
+        if after_full_name is not None and after_id is not None:
+            conditions.append('(full_name, id) > (?, ?)')
+            params.extend([after_full_name, after_id])
+        query = 'SELECT * FROM customers'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY full_name, id'
+        if page_size is not None:
+            query += ' LIMIT ?'
+            params.append(page_size)
+        return self.execute_query(query, tuple(params))
     
     def search_customers(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search customers by name or mobile"""
-        query = '''
-            SELECT * FROM customers 
-            WHERE full_name LIKE ? OR mobile_number LIKE ?
-            ORDER BY full_name
+        """Search customers by name or mobile, best full-text matches first"""
+        phrase = self._search_phrase(search_term)
+        if phrase:
+            hits = 'SELECT rowid AS id, rank FROM customers_fts WHERE customers_fts MATCH ?'
+            params = (phrase,)
+        else:
+            hits = 'SELECT id, 0 AS rank FROM customers WHERE full_name LIKE ? OR mobile_number LIKE ?'
+            params = (f'%{search_term}%',) * 2
+        query = f'''
+            WITH hits AS ({hits})
+            SELECT c.* FROM hits h
+            JOIN customers c ON c.id = h.id
+            ORDER BY h.rank, c.full_name
         '''
-        search_pattern = f'%{search_term}%'
-        return self.execute_query(query, (search_pattern, search_pattern))
+        return self.execute_query(query, params)
+    
+    # Catalog loading
+    CATALOG_QUERIES = {
+        # Categories load with their service_count and free_service_name (the
+        # first free service by name, or None) for the billing category picker
+        'categories': '''
+            SELECT c.*,
+                   COUNT(s.id) as service_count,
+                   MIN(CASE WHEN s.price = 0 THEN s.service_name END) as free_service_name
+            FROM categories c
+            LEFT JOIN services s ON s.category_id = c.id
+            GROUP BY c.id
+            ORDER BY c.category_name
+        ''',
+        'services': '''
+            SELECT s.*, c.category_name 
+            FROM services s
+            LEFT JOIN categories c ON s.category_id = c.id
+            ORDER BY s.service_name
+        ''',
+        'photo_frames': 'SELECT * FROM photo_frames ORDER BY frame_name, size',
+    }
+    
+    def _load_catalog_table(self, table: str) -> Optional[List[Dict[str, Any]]]:
+        """Read one catalog table for the in-memory catalog (None if the read failed)"""
+        try:
+            with self.pool.connection() as conn:
+                return [dict(row) for row in conn.execute(self.CATALOG_QUERIES[table])]
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+    
+    def _catalog_write(self, success, *tables: str):
+        """Invalidate catalog tables after a successful write; returns success unchanged"""
+        if success:
+            self.catalog.invalidate(*tables)
+        return success
+    
+    def get_catalog_version(self) -> int:
+        """Get the catalog version, bumped whenever categories, services or frames change"""
+        return self.catalog.version
     
     # Category operations
     def add_category(self, category_name: str, service_cost: float = None) -> Optional[int]:
         """Add a new category with optional service cost"""
         query = 'INSERT INTO categories (category_name, service_cost) VALUES (?, ?)'
-        return self.execute_insert(query, (category_name, service_cost))
+        return self._catalog_write(self.execute_insert(query, (category_name, service_cost)), 'categories')
     
     def update_category(self, category_id: int, category_name: str, service_cost: float = None) -> bool:
         """Update a category with optional service cost"""
@@ -136,35 +268,44 @@ class DatabaseManager:
             SET category_name = ?, service_cost = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         '''
-        return self.execute_update(query, (category_name, service_cost, category_id))
+        # Services carry the category name, so they reload too
+        return self._catalog_write(self.execute_update(query, (category_name, service_cost, category_id)),
+                                   'categories', 'services')
     
     def delete_category(self, category_id: int) -> bool:
         """Delete a category"""
         query = 'DELETE FROM categories WHERE id = ?'
-        return self.execute_update(query, (category_id,))
+        return self._catalog_write(self.execute_update(query, (category_id,)), 'categories', 'services')
     
     def get_all_categories(self) -> List[Dict[str, Any]]:
         """Get all categories"""
-        query = 'SELECT * FROM categories ORDER BY category_name'
-        return self.execute_query(query)
+        return self.catalog.categories(self._load_catalog_table)
+    
+    def get_categories_with_services(self) -> List[Dict[str, Any]]:
+        """Get all categories, each with its service_count and free_service_name
+        (the first free service by name, or None); served from the catalog"""
+        return self.catalog.categories(self._load_catalog_table)
+    
+    def search_categories(self, search_term: str) -> List[Dict[str, Any]]:
+        """Search categories by name"""
+        query = 'SELECT * FROM categories WHERE category_name LIKE ? ORDER BY category_name'
+        return self.execute_query(query, (f'%{search_term}%',))
     
     def get_category_by_id(self, category_id: int) -> Optional[Dict[str, Any]]:
         """Get category by ID"""
-        query = 'SELECT * FROM categories WHERE id = ?'
-        results = self.execute_query(query, (category_id,))
-        return results[0] if results else None
+        return self.catalog.category(self._load_catalog_table, category_id=category_id)
     
     def get_category_by_name(self, category_name: str) -> Optional[Dict[str, Any]]:
         """Get category by name"""
-        query = 'SELECT * FROM categories WHERE category_name = ?'
-        results = self.execute_query(query, (category_name,))
-        return results[0] if results else None
+        return self.catalog.category(self._load_catalog_table, category_name=category_name)
     
     # Service operations
     def add_service(self, service_name: str, price: float, category_id: int = None) -> Optional[int]:
         """Add a new service"""
         query = 'INSERT INTO services (service_name, price, category_id) VALUES (?, ?, ?)'
-        return self.execute_insert(query, (service_name, price, category_id))
+        # Categories carry their service count and free service, so they reload too
+        return self._catalog_write(self.execute_insert(query, (service_name, price, category_id)),
+                                   'services', 'categories')
     
     def update_service(self, service_id: int, service_name: str, price: float, category_id: int = None) -> bool:
         """Update a service"""
@@ -173,44 +314,25 @@ class DatabaseManager:
             SET service_name = ?, price = ?, category_id = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         '''
-        return self.execute_update(query, (service_name, price, category_id, service_id))
+        return self._catalog_write(self.execute_update(query, (service_name, price, category_id, service_id)),
+                                   'services', 'categories')
     
     def delete_service(self, service_id: int) -> bool:
         """Delete a service"""
         query = 'DELETE FROM services WHERE id = ?'
-        return self.execute_update(query, (service_id,))
+        return self._catalog_write(self.execute_update(query, (service_id,)), 'services', 'categories')
     
     def get_all_services(self) -> List[Dict[str, Any]]:
         """Get all services with category info"""
-        query = '''
-            SELECT s.*, c.category_name 
-            FROM services s
-            LEFT JOIN categories c ON s.category_id = c.id
-            ORDER BY s.service_name
-        '''
-        return self.execute_query(query)
+        return self.catalog.services(self._load_catalog_table)
     
     def get_services_by_category(self, category_id: int) -> List[Dict[str, Any]]:
         """Get services filtered by category"""
-        query = '''
-            SELECT s.*, c.category_name 
-            FROM services s
-            LEFT JOIN categories c ON s.category_id = c.id
-            WHERE s.category_id = ?
-            ORDER BY s.service_name
-        '''
-        return self.execute_query(query, (category_id,))
+        return self.catalog.services(self._load_catalog_table, category_id)
     
     def get_service_by_id(self, service_id: int) -> Optional[Dict[str, Any]]:
         """Get service by ID"""
-        query = '''
-            SELECT s.*, c.category_name 
-            FROM services s
-            LEFT JOIN categories c ON s.category_id = c.id
-            WHERE s.id = ?
-        '''
-        results = self.execute_query(query, (service_id,))
-        return results[0] if results else None
+        return self.catalog.service(self._load_catalog_table, service_id)
     
     # Photo frame operations
     def add_photo_frame(self, frame_name: str, size: str, price: float, quantity: int,
@@ -220,7 +342,9 @@ class DatabaseManager:
             INSERT INTO photo_frames (frame_name, size, price, quantity, buying_price, selling_price)
             VALUES (?, ?, ?, ?, ?, ?)
         '''
-        return self.execute_insert(query, (frame_name, size, price, quantity, buying_price, selling_price))
+        return self._catalog_write(
+            self.execute_insert(query, (frame_name, size, price, quantity, buying_price, selling_price)),
+            'photo_frames')
     
     def update_photo_frame(self, frame_id: int, frame_name: str, size: str, 
                           price: float, quantity: int, buying_price: float = 0,
@@ -232,24 +356,22 @@ class DatabaseManager:
                 buying_price = ?, selling_price = ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         '''
-        return self.execute_update(query, (frame_name, size, price, quantity, 
-                                          buying_price, selling_price, frame_id))
+        return self._catalog_write(self.execute_update(query, (frame_name, size, price, quantity, 
+                                                               buying_price, selling_price, frame_id)),
+                                   'photo_frames')
     
     def delete_photo_frame(self, frame_id: int) -> bool:
         """Delete a photo frame"""
         query = 'DELETE FROM photo_frames WHERE id = ?'
-        return self.execute_update(query, (frame_id,))
+        return self._catalog_write(self.execute_update(query, (frame_id,)), 'photo_frames')
     
     def get_all_photo_frames(self) -> List[Dict[str, Any]]:
         """Get all photo frames"""
-        query = 'SELECT * FROM photo_frames ORDER BY frame_name, size'
-        return self.execute_query(query)
+        return self.catalog.frames(self._load_catalog_table)
     
     def get_photo_frame_by_id(self, frame_id: int) -> Optional[Dict[str, Any]]:
         """Get photo frame by ID"""
-        query = 'SELECT * FROM photo_frames WHERE id = ?'
-        results = self.execute_query(query, (frame_id,))
-        return results[0] if results else None
+        return self.catalog.frame(self._load_catalog_table, frame_id)
     
     def update_frame_quantity(self, frame_id: int, quantity_change: int) -> bool:
         """Update frame quantity (positive or negative change)"""
@@ -258,7 +380,7 @@ class DatabaseManager:
             SET quantity = quantity + ?, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         '''
-        return self.execute_update(query, (quantity_change, frame_id))
+        return self._catalog_write(self.execute_update(query, (quantity_change, frame_id)), 'photo_frames')
     
     # Invoice operations
     def create_invoice(self, invoice_number: str, customer_id: int, subtotal: float,
@@ -328,39 +450,112 @@ class DatabaseManager:
         query = 'SELECT * FROM invoice_items WHERE invoice_id = ?'
         return self.execute_query(query, (invoice_id,))
     
-    def get_all_invoices(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get all invoices with customer info (handles both registered and guest customers, and bookings)"""
-        query = '''
+    # SQL filters for the two kinds of document stored in the invoices table
+    INVOICE_KIND_FILTERS = {
+        'booking': "(i.booking_id IS NOT NULL OR i.invoice_number LIKE 'BK-%')",
+        'bill': "(i.booking_id IS NULL AND i.invoice_number NOT LIKE 'BK-%')",
+    }
+    
+    # Columns of a search_invoices row that the search term is matched against
+    INVOICE_SEARCH_FIELDS = ('invoice_number', 'customer_full_name', 'customer_mobile',
+                             'guest_name', 'booking_customer_name', 'booking_mobile', 'service_name')
+    
+    def _invoice_kind_filter(self, kind: Optional[str]) -> str:
+        """Get the WHERE condition for an invoice kind ('booking', 'bill' or None for all)"""
+        if kind is None:
+            return '1 = 1'
+        if kind not in self.INVOICE_KIND_FILTERS:
+            raise ValueError(f"Unknown invoice kind: {kind}")
+        return self.INVOICE_KIND_FILTERS[kind]
+    
+    def get_all_invoices(self, page_size: int = 100, kind: Optional[str] = None,
+                         after_created_at: Optional[str] = None,
+                         after_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get newest invoices with customer info, booking service name and item count/total.
+        kind selects 'booking' invoices or regular 'bill's; pass the created_at and id of the
+        last row seen as after_created_at/after_id to fetch the next page."""
+        conditions = [self._invoice_kind_filter(kind)]
+        params = []
+        if after_created_at is not None and after_id is not None:
+            conditions.append('(i.created_at, i.id) < (?, ?)')
+            params.extend([after_created_at, after_id])
+        params.append(page_size)
+        
+        # Page through invoices first so joins and item counts only touch the page
+        query = f'''
+            WITH page AS (
+                SELECT i.* FROM invoices i
+                WHERE {' AND '.join(conditions)}
+                ORDER BY i.created_at DESC, i.id DESC
+                LIMIT ?
+            )
             SELECT i.*, 
                    COALESCE(c.full_name, i.guest_name, b.customer_name) as full_name, 
-                   COALESCE(c.mobile_number, b.mobile_number) as mobile_number
-            FROM invoices i
+                   COALESCE(c.mobile_number, b.mobile_number) as mobile_number,
+                   b.photoshoot_category as service_name,
+                   COALESCE(ic.item_count, 0) as item_count,
+                   COALESCE(ic.items_total, 0) as items_total
+            FROM page i
             LEFT JOIN customers c ON i.customer_id = c.id
             LEFT JOIN bookings b ON i.booking_id = b.id
-            ORDER BY i.created_at DESC
-            LIMIT ?
+            LEFT JOIN (
+                SELECT invoice_id, COUNT(*) as item_count, SUM(total_price) as items_total
+                FROM invoice_items
+                WHERE invoice_id IN (SELECT id FROM page)
+                GROUP BY invoice_id
+            ) ic ON ic.invoice_id = i.id
+            ORDER BY i.created_at DESC, i.id DESC
         '''
-        return self.execute_query(query, (limit,))
+        return self.execute_query(query, tuple(params))
     
-    def search_invoices(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search invoices by invoice number or customer name/mobile (handles guest customers and bookings)"""
-        query = '''
+    def search_invoices(self, search_term: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search invoices by invoice number, customer/guest/booking name or mobile, or booking
+        category, best full-text matches first. kind limits results to 'booking' invoices or
+        regular 'bill's."""
+        phrase = self._search_phrase(search_term)
+        if phrase:
+            hits = 'SELECT rowid AS id, rank FROM invoices_fts WHERE invoices_fts MATCH ?'
+            params = (phrase,)
+        else:
+            # Too short for the trigram index: scan with LIKE
+            hits = '''
+                SELECT i.id, 0 AS rank
+                FROM invoices i
+                LEFT JOIN customers c ON i.customer_id = c.id
+                LEFT JOIN bookings b ON i.booking_id = b.id
+                WHERE i.invoice_number LIKE ? 
+                   OR c.full_name LIKE ? 
+                   OR c.mobile_number LIKE ?
+                   OR i.guest_name LIKE ?
+                   OR b.customer_name LIKE ?
+                   OR b.mobile_number LIKE ?
+                   OR b.photoshoot_category LIKE ?
+            '''
+            params = (f'%{search_term}%',) * 7
+        query = f'''
+            WITH hits AS ({hits})
             SELECT i.*, 
                    COALESCE(c.full_name, i.guest_name, b.customer_name) as full_name, 
-                   COALESCE(c.mobile_number, b.mobile_number) as mobile_number
-            FROM invoices i
+                   COALESCE(c.mobile_number, b.mobile_number) as mobile_number,
+                   b.photoshoot_category as service_name,
+                   COALESCE(ic.item_count, 0) as item_count,
+                   COALESCE(ic.items_total, 0) as items_total,
+                   c.full_name as customer_full_name, c.mobile_number as customer_mobile,
+                   b.customer_name as booking_customer_name, b.mobile_number as booking_mobile
+            FROM hits h
+            JOIN invoices i ON i.id = h.id
             LEFT JOIN customers c ON i.customer_id = c.id
             LEFT JOIN bookings b ON i.booking_id = b.id
-            WHERE i.invoice_number LIKE ? 
-               OR c.full_name LIKE ? 
-               OR c.mobile_number LIKE ?
-               OR i.guest_name LIKE ?
-               OR b.customer_name LIKE ?
-               OR b.mobile_number LIKE ?
-            ORDER BY i.created_at DESC
+            LEFT JOIN (
+                SELECT invoice_id, COUNT(*) as item_count, SUM(total_price) as items_total
+                FROM invoice_items
+                WHERE invoice_id IN (SELECT id FROM hits)
+                GROUP BY invoice_id
+            ) ic ON ic.invoice_id = i.id
+            WHERE {self._invoice_kind_filter(kind)}
+            ORDER BY h.rank, i.created_at DESC, i.id DESC
         '''
-        search_pattern = f'%{search_term}%'
-        return self.execute_query(query, (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern, search_pattern))
+        return self.execute_query(query, params)
     
     def generate_invoice_number(self) -> str:
         """Generate a unique invoice number"""
@@ -369,12 +564,71 @@ class DatabaseManager:
         max_id = result[0]['max_id'] if result and result[0]['max_id'] else 0
         return f"INV{str(max_id + 1).zfill(6)}"
     
+    def create_booking_invoice(self, booking: Dict[str, Any], items: List[Dict[str, Any]],
+                               created_by: int) -> Optional[Dict[str, Any]]:
+        """Create a booking invoice with all its items in one transaction.
+        Allocates a unique BK- invoice number, inserts the header and items,
+        and returns the committed invoice row (with customer details, the booking
+        date and 'items') so the PDF can be rendered from it afterwards.
+        Returns None on failure."""
+        full_amount = float(booking['full_amount'])
+        advance_payment = float(booking['advance_payment'])
+        balance = full_amount - advance_payment
+        
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                
+                # Allocate invoice number (BK-YYYYMMDDHHMMSS, suffixed if taken)
+                base_number = f"BK-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                invoice_number = base_number
+                suffix = 1
+                while cursor.execute('SELECT 1 FROM invoices WHERE invoice_number = ?',
+                                     (invoice_number,)).fetchone():
+                    invoice_number = f"{base_number}-{suffix}"
+                    suffix += 1
+                
+                cursor.execute('''
+                    INSERT INTO invoices (invoice_number, booking_id, customer_id, guest_name, subtotal,
+                                        discount, category_service_cost, advance_payment, total_amount,
+                                        paid_amount, balance_amount, created_by)
+                    VALUES (?, ?, NULL, ?, ?, 0, 0, ?, ?, ?, ?, ?)
+                ''', (invoice_number, booking.get('id'), booking['customer_name'], full_amount,
+                      advance_payment, full_amount, advance_payment, balance, created_by))
+                invoice_id = cursor.lastrowid
+                
+                cursor.executemany('''
+                    INSERT INTO invoice_items (invoice_id, item_type, item_id, item_name,
+                                              quantity, unit_price, total_price, buying_price)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(invoice_id, item['item_type'], item['item_id'], item['item_name'],
+                       item.get('quantity', 1), item['unit_price'], item['total_price'],
+                       item.get('buying_price', 0)) for item in items])
+                
+                cursor.execute('''
+                    SELECT i.*, 
+                           COALESCE(c.full_name, i.guest_name, b.customer_name) as full_name, 
+                           COALESCE(c.mobile_number, b.mobile_number) as mobile_number,
+                           b.booking_date,
+                           u.full_name as created_by_name
+                    FROM invoices i
+                    LEFT JOIN customers c ON i.customer_id = c.id
+                    LEFT JOIN bookings b ON i.booking_id = b.id
+                    LEFT JOIN users u ON i.created_by = u.id
+                    WHERE i.id = ?
+                ''', (invoice_id,))
+                invoice = dict(cursor.fetchone())
+                cursor.execute('SELECT * FROM invoice_items WHERE invoice_id = ?', (invoice_id,))
+                invoice['items'] = [dict(row) for row in cursor.fetchall()]
+                return invoice
+        except sqlite3.Error as e:
+            print(f"Create booking invoice error: {e}")
+            return None
+    
     def delete_invoice(self, invoice_id: int) -> bool:
         """Delete an invoice and its items (CASCADE)"""
-        conn = None
         try:
-            with self._lock:
-                conn = self.get_connection()
+            with self._write_lock, self.pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Delete invoice items first
@@ -384,22 +638,17 @@ class DatabaseManager:
                 cursor.execute('DELETE FROM invoices WHERE id = ?', (invoice_id,))
                 
                 conn.commit()
+                self._bump_write_generation()
                 return True
         except sqlite3.Error as e:
+            # Uncommitted changes are rolled back when the connection returns to the pool
             print(f"Delete invoice error: {e}")
-            if conn:
-                conn.rollback()
             return False
-        finally:
-            if conn:
-                conn.close()
     
     def delete_all_invoices(self) -> bool:
         """Delete all invoices and their items"""
-        conn = None
         try:
-            with self._lock:
-                conn = self.get_connection()
+            with self._write_lock, self.pool.connection() as conn:
                 cursor = conn.cursor()
                 
                 # Delete all invoice items first
@@ -409,15 +658,11 @@ class DatabaseManager:
                 cursor.execute('DELETE FROM invoices')
                 
                 conn.commit()
+                self._bump_write_generation()
                 return True
         except sqlite3.Error as e:
             print(f"Delete all invoices error: {e}")
-            if conn:
-                conn.rollback()
             return False
-        finally:
-            if conn:
-                conn.close()
     
     # Booking operations
     def create_booking(self, customer_name: str, mobile_number: str, 
@@ -463,15 +708,32 @@ class DatabaseManager:
         query = 'DELETE FROM bookings WHERE id = ?'
         return self.execute_update(query, (booking_id,))
     
-    def get_all_bookings(self) -> List[Dict[str, Any]]:
-        """Get all bookings"""
+    def get_all_bookings(self, page_size: Optional[int] = None, status: Optional[str] = None,
+                         after_booking_date: Optional[str] = None, after_created_at: Optional[str] = None,
+                         after_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get bookings, latest booking date first, optionally only one status.
+        With page_size, returns one page; pass the booking_date, created_at and id of
+        the last row seen as after_booking_date/after_created_at/after_id for the next one."""
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append('b.status = ?')
+            params.append(status)
+        if after_booking_date is not None and after_created_at is not None and after_id is not None:
+            conditions.append('(b.booking_date, b.created_at, b.id) < (?, ?, ?)')
+            params.extend([after_booking_date, after_created_at, after_id])
         query = '''
             SELECT b.*, u.full_name as created_by_name
             FROM bookings b
             JOIN users u ON b.created_by = u.id
-            ORDER BY b.booking_date DESC, b.created_at DESC
         '''
-        return self.execute_query(query)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY b.booking_date DESC, b.created_at DESC, b.id DESC'
+        if page_size is not None:
+            query += ' LIMIT ?'
+            params.append(page_size)
+        return self.execute_query(query, tuple(params))
     
     def get_booking_by_id(self, booking_id: int) -> Optional[Dict[str, Any]]:
         """Get booking by ID with mobile number"""
@@ -484,17 +746,38 @@ class DatabaseManager:
         results = self.execute_query(query, (booking_id,))
         return results[0] if results else None
     
-    def search_bookings(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search bookings by customer name or mobile"""
+    def get_bookings_by_mobile(self, mobile_number: str) -> List[Dict[str, Any]]:
+        """Get every booking made under a mobile number, newest booking date first"""
         query = '''
             SELECT b.*, u.full_name as created_by_name
             FROM bookings b
             JOIN users u ON b.created_by = u.id
-            WHERE b.customer_name LIKE ? OR b.mobile_number LIKE ?
-            ORDER BY b.booking_date DESC
+            WHERE b.mobile_number = ?
+            ORDER BY b.booking_date DESC, b.created_at DESC
+        '''
+        return self.execute_query(query, (mobile_number,))
+    
+    def search_bookings(self, search_term: str) -> List[Dict[str, Any]]:
+        """Search bookings by customer name, mobile or category, best full-text matches first"""
+        phrase = self._search_phrase(search_term)
+        if phrase:
+            hits = 'SELECT rowid AS id, rank FROM bookings_fts WHERE bookings_fts MATCH ?'
+            params = (phrase,)
+        else:
+            hits = '''
+                SELECT id, 0 AS rank FROM bookings
+                WHERE customer_name LIKE ? OR mobile_number LIKE ? OR photoshoot_category LIKE ?
+            '''
+            params = (f'%{search_term}%',) * 3
+        query = f'''
+            WITH hits AS ({hits})
+            SELECT b.*, u.full_name as created_by_name
+            FROM hits h
+            JOIN bookings b ON b.id = h.id
+            JOIN users u ON b.created_by = u.id
+            ORDER BY h.rank, b.booking_date DESC
         '''
-        search_pattern = f'%{search_term}%'
-        return self.execute_query(query, (search_pattern, search_pattern))
+        return self.execute_query(query, params)
     
     # ==================== User Permissions Operations ====================
     
@@ -593,19 +876,19 @@ class DatabaseManager:
             SELECT i.*, c.full_name as customer_name, c.mobile_number as customer_mobile
             FROM invoices i
             LEFT JOIN customers c ON i.customer_id = c.id
-            WHERE i.created_by = ? AND DATE(i.created_at) = ?
+            WHERE i.created_by = ? AND i.created_at >= ? AND i.created_at < ?
             ORDER BY i.created_at ASC
         '''
-        return self.execute_query(query, (user_id, date))
+        return self.execute_query(query, (user_id, *day_window(date)))
     
     def get_staff_bookings_by_date(self, user_id: int, date: str) -> List[Dict[str, Any]]:
         """Get all bookings created by a staff member on a specific date"""
         query = '''
             SELECT * FROM bookings
-            WHERE created_by = ? AND DATE(created_at) = ?
+            WHERE created_by = ? AND created_at >= ? AND created_at < ?
             ORDER BY created_at ASC
         '''
-        return self.execute_query(query, (user_id, date))
+        return self.execute_query(query, (user_id, *day_window(date)))
     
     def get_staff_customers_by_date(self, user_id: int, date: str) -> List[Dict[str, Any]]:
         """Get all customers added on a specific date
@@ -613,25 +896,29 @@ class DatabaseManager:
         """
         query = '''
             SELECT * FROM customers
-            WHERE DATE(created_at) = ?
+            WHERE created_at >= ? AND created_at < ?
             ORDER BY created_at ASC
         '''
-        return self.execute_query(query, (date,))
+        return self.execute_query(query, day_window(date))
     
     def get_staff_daily_summary(self, user_id: int, date: str) -> Dict[str, Any]:
-        """Get a summary of staff daily work"""
-        invoices = self.get_staff_invoices_by_date(user_id, date)
+        """Get a summary of staff daily work (invoice totals come from daily_sales_rollup)"""
+        query = '''
+            SELECT invoice_count, total_amount, paid_amount
+            FROM daily_sales_rollup
+            WHERE sale_date = ? AND created_by = ?
+        '''
+        rollup = self.execute_query(query, (day_window(date)[0], user_id))
+        invoices = rollup[0] if rollup else {'invoice_count': 0, 'total_amount': 0, 'paid_amount': 0}
         bookings = self.get_staff_bookings_by_date(user_id, date)
         
-        total_invoice_amount = sum(inv.get('total_amount', 0) for inv in invoices)
-        total_paid = sum(inv.get('paid_amount', 0) for inv in invoices)
         total_booking_amount = sum(b.get('full_amount', 0) for b in bookings)
         total_advance = sum(b.get('advance_payment', 0) for b in bookings)
         
         return {
-            'invoice_count': len(invoices),
-            'total_invoice_amount': total_invoice_amount,
-            'total_paid': total_paid,
+            'invoice_count': invoices['invoice_count'],
+            'total_invoice_amount': invoices['total_amount'],
+            'total_paid': invoices['paid_amount'],
             'booking_count': len(bookings),
             'total_booking_amount': total_booking_amount,
             'total_advance': total_advance
@@ -692,16 +979,117 @@ class DatabaseManager:
         max_id = result[0]['max_id'] if result and result[0]['max_id'] else 0
         return f"BILL{str(max_id + 1).zfill(6)}"
     
-    def get_all_bills(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get all bills with customer info"""
+    def checkout_bill(self, cart: List[Dict[str, Any]], customer_id: Optional[int],
+                      discount: float, created_by: int, service_charge: float = 0,
+                      cash_given: float = 0, guest_name: str = None,
+                      service_charge_name: str = None) -> Optional[Dict[str, Any]]:
+        """Create a complete bill in one transaction.
+        Allocates the bill number, inserts the header and all items, and
+        decrements frame stock. Cart entries use the billing cart format
+        (type, id, name, quantity, unit_price, total). Returns the bill row
+        with customer details and its 'items', or None if nothing was saved."""
+        subtotal = sum(item['total'] for item in cart)
+        total_amount = max(0, subtotal + service_charge - discount)
+        
+        try:
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                
+                # Allocate bill number inside the write transaction
+                cursor.execute('SELECT MAX(id) FROM bills')
+                max_id = cursor.fetchone()[0] or 0
+                bill_number = f"BILL{str(max_id + 1).zfill(6)}"
+                
+                cursor.execute('''
+                    INSERT INTO bills (bill_number, customer_id, guest_name, subtotal, discount,
+                                     service_charge, total_amount, cash_given, created_by)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (bill_number, customer_id, guest_name, subtotal, discount,
+                      service_charge, total_amount, cash_given, created_by))
+                bill_id = cursor.lastrowid
+                
+                # Buying prices for all frames in the cart, in one lookup
+                frame_ids = list({item['id'] for item in cart if item['type'] == 'Frame'})
+                buying_prices = {}
+                if frame_ids:
+                    placeholders = ', '.join('?' * len(frame_ids))
+                    cursor.execute(
+                        f'SELECT id, buying_price FROM photo_frames WHERE id IN ({placeholders})',
+                        frame_ids
+                    )
+                    buying_prices = {row['id']: row['buying_price'] or 0 for row in cursor.fetchall()}
+                
+                rows = []
+                for item in cart:
+                    buying_price = buying_prices.get(item['id'], 0) if item['type'] == 'Frame' else 0
+                    rows.append((bill_id, item['type'], item['id'], item['name'], item['quantity'],
+                                 item['unit_price'], item['total'], buying_price * item['quantity']))
+                
+                # Service charge is stored as a separate line
+                if service_charge > 0 and service_charge_name:
+                    rows.append((bill_id, 'CategoryService', 0,
+                                 f"Service Charge - {service_charge_name}",
+                                 1, service_charge, service_charge, 0))
+                
+                cursor.executemany('''
+                    INSERT INTO bill_items (bill_id, item_type, item_id, item_name,
+                                           quantity, unit_price, total_price, buying_price)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+                
+                # Decrement frame stock, refusing to go below zero
+                for item in cart:
+                    if item['type'] != 'Frame':
+                        continue
+                    cursor.execute('''
+                        UPDATE photo_frames
+                        SET quantity = quantity - ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ? AND quantity >= ?
+                    ''', (item['quantity'], item['id'], item['quantity']))
+                    if cursor.rowcount == 0:
+                        raise sqlite3.IntegrityError(f"Insufficient stock for {item['name']}")
+                
+                # Hydrate the bill before committing, on the same connection
+                cursor.execute('''
+                    SELECT b.*, 
+                           COALESCE(c.full_name, b.guest_name) as full_name,
+                           c.mobile_number,
+                           u.full_name as created_by_name
+                    FROM bills b
+                    LEFT JOIN customers c ON b.customer_id = c.id
+                    LEFT JOIN users u ON b.created_by = u.id
+                    WHERE b.id = ?
+                ''', (bill_id,))
+                bill = dict(cursor.fetchone())
+                cursor.execute('SELECT * FROM bill_items WHERE bill_id = ?', (bill_id,))
+                bill['items'] = [dict(row) for row in cursor.fetchall()]
+            if frame_ids:
+                self.catalog.invalidate('photo_frames')
+            return bill
+        except sqlite3.Error as e:
+            print(f"Checkout bill error: {e}")
+            return None
+    
+    def get_all_bills(self, page_size: int = 100, after_created_at: Optional[str] = None,
+                      after_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get newest bills with customer info.
+        Pass the created_at and id of the last row seen as after_created_at/after_id
+        to fetch the next page."""
+        conditions = []
+        params = []
+        if after_created_at is not None and after_id is not None:
+            conditions.append('(b.created_at, b.id) < (?, ?)')
+            params.extend([after_created_at, after_id])
         query = '''
             SELECT b.*, 
                    COALESCE(c.full_name, b.guest_name) as full_name,
                    c.mobile_number
             FROM bills b
             LEFT JOIN customers c ON b.customer_id = c.id
-            ORDER BY b.created_at DESC
-            LIMIT ?
         '''
-        return self.execute_query(query, (limit,))
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY b.created_at DESC, b.id DESC LIMIT ?'
+        params.append(page_size)
+        return self.execute_query(query, tuple(params))
 
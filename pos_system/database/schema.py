@@ -2,7 +2,329 @@ import sqlite3
 import os
 from datetime import datetime
 
+# Fills invoices_fts with each invoice plus the customer and booking fields it is
+# searched by; the triggers in migration 4 append a WHERE for the affected rows
+_INVOICES_FTS_INSERT = '''
+                INSERT INTO invoices_fts (rowid, invoice_number, customer_name, customer_mobile,
+                                          guest_name, booking_customer_name, booking_mobile, category)
+                SELECT i.id, i.invoice_number, c.full_name, c.mobile_number,
+                       i.guest_name, b.customer_name, b.mobile_number, b.photoshoot_category
+                FROM invoices i
+                LEFT JOIN customers c ON c.id = i.customer_id
+                LEFT JOIN bookings b ON b.id = i.booking_id'''
+
 class DatabaseSchema:
+    # Versioned migrations, applied in order once tables exist.
+    # The number of applied migrations is stored in PRAGMA user_version.
+    MIGRATIONS = [
+        # 1: Indexes for hot lookup and listing columns
+        [
+            'CREATE INDEX IF NOT EXISTS idx_invoice_items_invoice ON invoice_items (invoice_id)',
+            'CREATE INDEX IF NOT EXISTS idx_bill_items_bill ON bill_items (bill_id)',
+            'CREATE INDEX IF NOT EXISTS idx_invoices_created ON invoices (created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_invoices_booking_created ON invoices (booking_id, created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_invoices_created_by ON invoices (created_by, created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_bills_created ON bills (created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings (status)',
+            'CREATE INDEX IF NOT EXISTS idx_bookings_date ON bookings (booking_date, created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_bookings_mobile ON bookings (mobile_number)',
+            'CREATE INDEX IF NOT EXISTS idx_services_category ON services (category_id)',
+            'CREATE INDEX IF NOT EXISTS idx_photo_frames_quantity ON photo_frames (quantity)',
+        ],
+        # 2: Indexes for created_at date-range filters
+        [
+            'CREATE INDEX IF NOT EXISTS idx_bookings_created_by ON bookings (created_by, created_at)',
+            'CREATE INDEX IF NOT EXISTS idx_customers_created ON customers (created_at)',
+        ],
+        # 3: Daily sales rollup kept current by triggers, filled from existing invoices
+        [
+            '''
+            CREATE TABLE IF NOT EXISTS daily_sales_rollup (
+                sale_date TEXT NOT NULL,
+                created_by INTEGER NOT NULL,
+                invoice_count INTEGER NOT NULL DEFAULT 0,
+                total_amount REAL NOT NULL DEFAULT 0,
+                paid_amount REAL NOT NULL DEFAULT 0,
+                balance_amount REAL NOT NULL DEFAULT 0,
+                frame_quantity INTEGER NOT NULL DEFAULT 0,
+                frame_revenue REAL NOT NULL DEFAULT 0,
+                frame_cost REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (sale_date, created_by)
+            )
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_invoice_insert AFTER INSERT ON invoices
+            BEGIN
+                INSERT OR IGNORE INTO daily_sales_rollup (sale_date, created_by)
+                VALUES (DATE(NEW.created_at), NEW.created_by);
+                UPDATE daily_sales_rollup
+                SET invoice_count = invoice_count + 1,
+                    total_amount = total_amount + NEW.total_amount,
+                    paid_amount = paid_amount + NEW.paid_amount,
+                    balance_amount = balance_amount + MAX(NEW.balance_amount, 0)
+                WHERE sale_date = DATE(NEW.created_at) AND created_by = NEW.created_by;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_invoice_delete AFTER DELETE ON invoices
+            BEGIN
+                UPDATE daily_sales_rollup
+                SET invoice_count = invoice_count - 1,
+                    total_amount = total_amount - OLD.total_amount,
+                    paid_amount = paid_amount - OLD.paid_amount,
+                    balance_amount = balance_amount - MAX(OLD.balance_amount, 0)
+                WHERE sale_date = DATE(OLD.created_at) AND created_by = OLD.created_by;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_invoice_update
+            AFTER UPDATE OF total_amount, paid_amount, balance_amount, created_at, created_by ON invoices
+            BEGIN
+                UPDATE daily_sales_rollup
+                SET invoice_count = invoice_count - 1,
+                    total_amount = total_amount - OLD.total_amount,
+                    paid_amount = paid_amount - OLD.paid_amount,
+                    balance_amount = balance_amount - MAX(OLD.balance_amount, 0),
+                    frame_quantity = frame_quantity - (SELECT COALESCE(SUM(quantity), 0) FROM invoice_items
+                                                       WHERE invoice_id = OLD.id AND item_type = 'Frame'),
+                    frame_revenue = frame_revenue - (SELECT COALESCE(SUM(total_price), 0) FROM invoice_items
+                                                     WHERE invoice_id = OLD.id AND item_type = 'Frame'),
+                    frame_cost = frame_cost - (SELECT COALESCE(SUM(buying_price), 0) FROM invoice_items
+                                               WHERE invoice_id = OLD.id AND item_type = 'Frame')
+                WHERE sale_date = DATE(OLD.created_at) AND created_by = OLD.created_by;
+                INSERT OR IGNORE INTO daily_sales_rollup (sale_date, created_by)
+                VALUES (DATE(NEW.created_at), NEW.created_by);
+                UPDATE daily_sales_rollup
+                SET invoice_count = invoice_count + 1,
+                    total_amount = total_amount + NEW.total_amount,
+                    paid_amount = paid_amount + NEW.paid_amount,
+                    balance_amount = balance_amount + MAX(NEW.balance_amount, 0),
+                    frame_quantity = frame_quantity + (SELECT COALESCE(SUM(quantity), 0) FROM invoice_items
+                                                       WHERE invoice_id = NEW.id AND item_type = 'Frame'),
+                    frame_revenue = frame_revenue + (SELECT COALESCE(SUM(total_price), 0) FROM invoice_items
+                                                     WHERE invoice_id = NEW.id AND item_type = 'Frame'),
+                    frame_cost = frame_cost + (SELECT COALESCE(SUM(buying_price), 0) FROM invoice_items
+                                               WHERE invoice_id = NEW.id AND item_type = 'Frame')
+                WHERE sale_date = DATE(NEW.created_at) AND created_by = NEW.created_by;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_frame_insert AFTER INSERT ON invoice_items
+            WHEN NEW.item_type = 'Frame'
+            BEGIN
+                UPDATE daily_sales_rollup
+                SET frame_quantity = frame_quantity + NEW.quantity,
+                    frame_revenue = frame_revenue + NEW.total_price,
+                    frame_cost = frame_cost + COALESCE(NEW.buying_price, 0)
+                WHERE (sale_date, created_by) =
+                      (SELECT DATE(created_at), created_by FROM invoices WHERE id = NEW.invoice_id);
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_frame_delete AFTER DELETE ON invoice_items
+            WHEN OLD.item_type = 'Frame'
+            BEGIN
+                UPDATE daily_sales_rollup
+                SET frame_quantity = frame_quantity - OLD.quantity,
+                    frame_revenue = frame_revenue - OLD.total_price,
+                    frame_cost = frame_cost - COALESCE(OLD.buying_price, 0)
+                WHERE (sale_date, created_by) =
+                      (SELECT DATE(created_at), created_by FROM invoices WHERE id = OLD.invoice_id);
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_rollup_frame_update
+            AFTER UPDATE OF item_type, quantity, total_price, buying_price, invoice_id ON invoice_items
+            BEGIN
+                UPDATE daily_sales_rollup
+                SET frame_quantity = frame_quantity - OLD.quantity,
+                    frame_revenue = frame_revenue - OLD.total_price,
+                    frame_cost = frame_cost - COALESCE(OLD.buying_price, 0)
+                WHERE OLD.item_type = 'Frame' AND (sale_date, created_by) =
+                      (SELECT DATE(created_at), created_by FROM invoices WHERE id = OLD.invoice_id);
+                UPDATE daily_sales_rollup
+                SET frame_quantity = frame_quantity + NEW.quantity,
+                    frame_revenue = frame_revenue + NEW.total_price,
+                    frame_cost = frame_cost + COALESCE(NEW.buying_price, 0)
+                WHERE NEW.item_type = 'Frame' AND (sale_date, created_by) =
+                      (SELECT DATE(created_at), created_by FROM invoices WHERE id = NEW.invoice_id);
+            END
+            ''',
+            'DELETE FROM daily_sales_rollup',
+            '''
+            INSERT INTO daily_sales_rollup (sale_date, created_by, invoice_count, total_amount, paid_amount,
+                                            balance_amount, frame_quantity, frame_revenue, frame_cost)
+            SELECT DATE(i.created_at), i.created_by, COUNT(*),
+                   SUM(i.total_amount), SUM(i.paid_amount), SUM(MAX(i.balance_amount, 0)),
+                   COALESCE(SUM(f.quantity), 0), COALESCE(SUM(f.revenue), 0), COALESCE(SUM(f.cost), 0)
+            FROM invoices i
+            LEFT JOIN (
+                SELECT invoice_id, SUM(quantity) as quantity, SUM(total_price) as revenue,
+                       SUM(COALESCE(buying_price, 0)) as cost
+                FROM invoice_items
+                WHERE item_type = 'Frame'
+                GROUP BY invoice_id
+            ) f ON f.invoice_id = i.id
+            GROUP BY DATE(i.created_at), i.created_by
+            ''',
+        ],
+        # 4: Full-text search. Trigram FTS5 tables answer LIKE '%term%'-style
+        # substring searches (3+ characters) from an index; triggers keep them in
+        # sync, including invoices whose customer or booking is edited.
+        [
+            'CREATE INDEX IF NOT EXISTS idx_invoices_customer ON invoices (customer_id)',
+            '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+                full_name, mobile_number, tokenize='trigram'
+            )
+            ''',
+            '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS bookings_fts USING fts5(
+                customer_name, mobile_number, photoshoot_category, tokenize='trigram'
+            )
+            ''',
+            '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS invoices_fts USING fts5(
+                invoice_number, customer_name, customer_mobile, guest_name,
+                booking_customer_name, booking_mobile, category, tokenize='trigram'
+            )
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_customers_fts_insert
+            AFTER INSERT ON customers
+            BEGIN
+                INSERT INTO customers_fts (rowid, full_name, mobile_number)
+                VALUES (NEW.id, NEW.full_name, NEW.mobile_number);
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_customers_fts_update
+            AFTER UPDATE OF full_name, mobile_number ON customers
+            BEGIN
+                DELETE FROM customers_fts WHERE rowid = OLD.id;
+                INSERT INTO customers_fts (rowid, full_name, mobile_number)
+                VALUES (NEW.id, NEW.full_name, NEW.mobile_number);
+                DELETE FROM invoices_fts WHERE rowid IN (SELECT id FROM invoices WHERE customer_id = OLD.id);
+                {_INVOICES_FTS_INSERT}
+                WHERE i.customer_id = NEW.id;
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_customers_fts_delete
+            AFTER DELETE ON customers
+            BEGIN
+                DELETE FROM customers_fts WHERE rowid = OLD.id;
+                DELETE FROM invoices_fts WHERE rowid IN (SELECT id FROM invoices WHERE customer_id = OLD.id);
+                {_INVOICES_FTS_INSERT}
+                WHERE i.customer_id = OLD.id;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_insert
+            AFTER INSERT ON bookings
+            BEGIN
+                INSERT INTO bookings_fts (rowid, customer_name, mobile_number, photoshoot_category)
+                VALUES (NEW.id, NEW.customer_name, NEW.mobile_number, NEW.photoshoot_category);
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_update
+            AFTER UPDATE OF customer_name, mobile_number, photoshoot_category ON bookings
+            BEGIN
+                DELETE FROM bookings_fts WHERE rowid = OLD.id;
+                INSERT INTO bookings_fts (rowid, customer_name, mobile_number, photoshoot_category)
+                VALUES (NEW.id, NEW.customer_name, NEW.mobile_number, NEW.photoshoot_category);
+                DELETE FROM invoices_fts WHERE rowid IN (SELECT id FROM invoices WHERE booking_id = OLD.id);
+                {_INVOICES_FTS_INSERT}
+                WHERE i.booking_id = NEW.id;
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_delete
+            AFTER DELETE ON bookings
+            BEGIN
+                DELETE FROM bookings_fts WHERE rowid = OLD.id;
+                DELETE FROM invoices_fts WHERE rowid IN (SELECT id FROM invoices WHERE booking_id = OLD.id);
+                {_INVOICES_FTS_INSERT}
+                WHERE i.booking_id = OLD.id;
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_invoices_fts_insert
+            AFTER INSERT ON invoices
+            BEGIN
+                {_INVOICES_FTS_INSERT}
+                WHERE i.id = NEW.id;
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_invoices_fts_update
+            AFTER UPDATE OF invoice_number, customer_id, guest_name, booking_id ON invoices
+            BEGIN
+                DELETE FROM invoices_fts WHERE rowid = OLD.id;
+                {_INVOICES_FTS_INSERT}
+                WHERE i.id = NEW.id;
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS trg_invoices_fts_delete
+            AFTER DELETE ON invoices
+            BEGIN
+                DELETE FROM invoices_fts WHERE rowid = OLD.id;
+            END
+            ''',
+            'DELETE FROM customers_fts',
+            'INSERT INTO customers_fts (rowid, full_name, mobile_number) SELECT id, full_name, mobile_number FROM customers',
+            'DELETE FROM bookings_fts',
+            '''
+            INSERT INTO bookings_fts (rowid, customer_name, mobile_number, photoshoot_category)
+            SELECT id, customer_name, mobile_number, photoshoot_category FROM bookings
+            ''',
+            'DELETE FROM invoices_fts',
+            _INVOICES_FTS_INSERT,
+        ],
+    ]
+    
+    # 5: Booking invoice lines are stored as 'BookingService', since their item_id is the
+    # booking's id rather than a service's. SQLite cannot change a CHECK constraint, so
+    # invoice_items is rebuilt. Its index and frame rollup triggers go with the old
+    # table, and the invoice update trigger (which reads invoice_items) must be dropped
+    # for the rename; all of them are created again.
+    MIGRATIONS.append([
+        'DROP TRIGGER IF EXISTS trg_rollup_invoice_update',
+        '''
+        CREATE TABLE invoice_items_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            invoice_id INTEGER NOT NULL,
+            item_type TEXT NOT NULL CHECK(item_type IN ('Service', 'Frame', 'CategoryService', 'BookingService')),
+            item_id INTEGER NOT NULL,
+            item_name TEXT NOT NULL,
+            quantity INTEGER NOT NULL DEFAULT 1,
+            unit_price REAL NOT NULL,
+            total_price REAL NOT NULL,
+            buying_price REAL DEFAULT 0,
+            FOREIGN KEY (invoice_id) REFERENCES invoices (id)
+        )
+        ''',
+        '''
+        INSERT INTO invoice_items_new (id, invoice_id, item_type, item_id, item_name, quantity,
+                                       unit_price, total_price, buying_price)
+        SELECT id, invoice_id, item_type, item_id, item_name, quantity,
+               unit_price, total_price, buying_price
+        FROM invoice_items
+        ''',
+        'DROP TABLE invoice_items',
+        'ALTER TABLE invoice_items_new RENAME TO invoice_items',
+        MIGRATIONS[0][0],
+    ] + [statement for statement in MIGRATIONS[2]
+         if 'CREATE TRIGGER' in statement and 'invoice_items' in statement])
+    
+    # Statements that recompute daily_sales_rollup from invoices (last two of migration 3)
+    ROLLUP_REBUILD = MIGRATIONS[2][-2:]
+    
+    # Statements that refill the search indexes from their tables (last six of migration 4)
+    SEARCH_REBUILD = MIGRATIONS[3][-6:]
+    
     def __init__(self, db_path='pos_database.db'):
         self.db_path = db_path
         self.conn = None
@@ -177,7 +499,7 @@ class DatabaseSchema:
             CREATE TABLE IF NOT EXISTS invoice_items (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 invoice_id INTEGER NOT NULL,
-                item_type TEXT NOT NULL CHECK(item_type IN ('Service', 'Frame', 'CategoryService')),
+                item_type TEXT NOT NULL CHECK(item_type IN ('Service', 'Frame', 'CategoryService', 'BookingService')),
                 item_id INTEGER NOT NULL,
                 item_name TEXT NOT NULL,
                 quantity INTEGER NOT NULL DEFAULT 1,
@@ -272,8 +594,59 @@ class DatabaseSchema:
         ''')
         
         self.conn.commit()
+        
+        self._apply_migrations()
         self.close()
+    
+    def _apply_migrations(self):
+        """Apply migrations newer than the database's user_version"""
+        self.cursor.execute('PRAGMA user_version')
+        version = self.cursor.fetchone()[0]
+        
+        for number, statements in enumerate(self.MIGRATIONS[version:], start=version + 1):
+            try:
+                # Each migration and its version bump commit together
+                self.cursor.execute('BEGIN')
+                for statement in statements:
+                    self.cursor.execute(statement)
+                # PRAGMA does not accept bound parameters
+                self.cursor.execute(f'PRAGMA user_version = {number}')
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"Migration {number} error: {e}")
+                break
         
+    def rebuild_daily_sales_rollup(self):
+        """Recompute daily_sales_rollup from the invoices table"""
+        self.connect()
+        try:
+            self.cursor.execute('BEGIN')
+            for statement in self.ROLLUP_REBUILD:
+                self.cursor.execute(statement)
+            self.conn.commit()
+            print("Rebuilt daily sales rollup")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"Rollup rebuild error: {e}")
+        finally:
+            self.close()
+    
+    def rebuild_search_index(self):
+        """Refill the full-text search tables from customers, bookings and invoices"""
+        self.connect()
+        try:
+            self.cursor.execute('BEGIN')
+            for statement in self.SEARCH_REBUILD:
+                self.cursor.execute(statement)
+            self.conn.commit()
+            print("Rebuilt search index")
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"Search index rebuild error: {e}")
+        finally:
+            self.close()
+    
     def initialize_default_data(self):
         """Insert default data for testing"""
         self.connect()
@@ -413,13 +786,15 @@ class DatabaseSchema:
         """Drop all tables and recreate (use with caution)"""
         self.connect()
         
-        tables = ['bill_items', 'bills', 'invoice_items', 'invoices', 'bookings', 
+        tables = ['customers_fts', 'bookings_fts', 'invoices_fts', 'daily_sales_rollup', 'bill_items', 'bills', 'invoice_items', 'invoices', 'bookings', 
                   'photo_frames', 'services', 'categories', 'customers', 
                   'user_permissions', 'users']
         
         for table in tables:
             self.cursor.execute(f'DROP TABLE IF EXISTS {table}')
         
+        # Dropped tables take their indexes with them, so migrations must run again
+        self.cursor.execute('PRAGMA user_version = 0')
         self.conn.commit()
         self.close()
         
@@ -2,34 +2,39 @@ import customtkinter as ctk
 from tkinter import ttk
 from database import DatabaseManager
 from auth import AuthManager
-from ui.components import LoginWindow, Toast, MessageDialog
-from ui.sidebar import Sidebar
+from ui.components import LoginWindow, Toast, MessageDialog, FrameCache
 from PIL import Image
+from importlib import import_module
 import os
-
-# Import all frames
-from ui.customer_frame import CustomerManagementFrame
-from ui.service_frame import ServiceManagementFrame
-from ui.frame_frame import FrameManagementFrame
-from ui.billing_frame import BillingFrame
-from ui.booking_frame import BookingManagementFrame
-from ui.invoice_history_frame import InvoiceHistoryFrame
-from ui.bill_history_frame import BillHistoryFrame
-from ui.dashboard_frame import DashboardFrame
-from ui.users_frame import UsersManagementFrame
-from ui.settings_frame import SettingsFrame
-from ui.support_frame import SupportFrame
-from ui.user_guide_frame import UserGuideFrame
-from ui.profile_frame import ProfileFrame
-from ui.category_frame import CategoryManagementFrame
-from ui.permissions_frame import PermissionsFrame
-from ui.staff_reports_frame import StaffReportsFrame
 from services.user_service import UserService
 
 
 class MainApplication(ctk.CTk):
     """Main application window"""
     
+    # Page -> (module, class); each module is imported the first time its page is opened
+    FRAME_CLASSES = {
+        "dashboard": ("ui.dashboard_frame", "DashboardFrame"),
+        "billing": ("ui.billing_frame", "BillingFrame"),
+        "customers": ("ui.customer_frame", "CustomerManagementFrame"),
+        "categories": ("ui.category_frame", "CategoryManagementFrame"),
+        "services": ("ui.service_frame", "ServiceManagementFrame"),
+        "frames": ("ui.frame_frame", "FrameManagementFrame"),
+        "bookings": ("ui.booking_frame", "BookingManagementFrame"),
+        "invoices": ("ui.invoice_history_frame", "InvoiceHistoryFrame"),
+        "bills": ("ui.bill_history_frame", "BillHistoryFrame"),
+        "users": ("ui.users_frame", "UsersManagementFrame"),
+        "permissions": ("ui.permissions_frame", "PermissionsFrame"),
+        "staff_reports": ("ui.staff_reports_frame", "StaffReportsFrame"),
+        "settings": ("ui.settings_frame", "SettingsFrame"),
+        "profile": ("ui.profile_frame", "ProfileFrame"),
+        "support": ("ui.support_frame", "SupportFrame"),
+        "guide": ("ui.user_guide_frame", "UserGuideFrame"),
+    }
+    
+    # Pages kept alive for instant return; the least recently used beyond this are destroyed
+    FRAME_CACHE_SIZE = 6
+    
     def __init__(self):
         super().__init__()
         
@@ -127,6 +132,7 @@ class MainApplication(ctk.CTk):
         # Create main container
         self.main_container = None
         self.content_frame = None
+        self.frame_cache = None
         self.sidebar = None
         self.profile_image_label = None
         
@@ -206,6 +212,7 @@ class MainApplication(ctk.CTk):
     
     def create_main_interface(self):
         """Create main application interface with modern sidebar"""
+        from ui.sidebar import Sidebar
         
         # Main container
         self.main_container = ctk.CTkFrame(self, fg_color="#0d0d1a")
@@ -248,6 +255,7 @@ class MainApplication(ctk.CTk):
         # Content area
         self.content_frame = ctk.CTkFrame(right_container, fg_color="#0d0d1a")
         self.content_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.frame_cache = FrameCache(self.content_frame, self.FRAME_CACHE_SIZE)
         
         # Show default view (Dashboard)
         self.navigate_to("dashboard")
@@ -287,42 +295,31 @@ class MainApplication(ctk.CTk):
             Toast.show_toast(self, "Access Denied", "You don't have permission to access this feature.", "error")
             return
         
-        self.clear_content()
-        
         # Update sidebar active state
         if self.sidebar:
             self.sidebar.set_active(page)
         
-        frame_classes = {
-            "dashboard": DashboardFrame,
-            "billing": BillingFrame,
-            "customers": CustomerManagementFrame,
-            "categories": CategoryManagementFrame,
-            "services": ServiceManagementFrame,
-            "frames": FrameManagementFrame,
-            "bookings": BookingManagementFrame,
-            "invoices": InvoiceHistoryFrame,
-            "bills": BillHistoryFrame,
-            "users": UsersManagementFrame,
-            "permissions": PermissionsFrame,
-            "staff_reports": StaffReportsFrame,
-            "settings": SettingsFrame,
-            "profile": ProfileFrame,
-            "support": SupportFrame,
-            "guide": UserGuideFrame,
-        }
-        
-        frame_class = frame_classes.get(page)
-        if frame_class:
-            # Pass main_app reference to ProfileFrame and DashboardFrame
-            if page in ["profile", "dashboard"]:
-                frame = frame_class(self.content_frame, self.auth_manager, self.db_manager, self)
-            else:
-                frame = frame_class(self.content_frame, self.auth_manager, self.db_manager)
-            frame.pack(fill="both", expand=True)
+        if page in self.FRAME_CLASSES:
+            self.frame_cache.show(page, lambda: self.create_page(page))
+    
+    @classmethod
+    def load_frame_class(cls, page: str):
+        """Import and return the frame class for a page"""
+        module_name, class_name = cls.FRAME_CLASSES[page]
+        return getattr(import_module(module_name), class_name)
+    
+    def create_page(self, page: str):
+        """Construct the frame for a page"""
+        frame_class = self.load_frame_class(page)
+        # Pass main_app reference to ProfileFrame and DashboardFrame
+        if page in ["profile", "dashboard"]:
+            return frame_class(self.content_frame, self.auth_manager, self.db_manager, self)
+        return frame_class(self.content_frame, self.auth_manager, self.db_manager)
     
     def clear_content(self):
         """Clear content frame"""
+        if self.frame_cache:
+            self.frame_cache.clear()
         for widget in self.content_frame.winfo_children():
             widget.destroy()
     
@@ -429,6 +426,7 @@ class MainApplication(ctk.CTk):
                 self.main_container = None
             
             self.content_frame = None
+            self.frame_cache = None
             self.sidebar = None
             self.withdraw()
             self.show_login()
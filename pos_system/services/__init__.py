@@ -1,13 +1,34 @@
-from .invoice_generator import InvoiceGenerator
-from .bill_generator import BillGenerator
-from .dashboard_service import DashboardService
-from .settings_service import SettingsService
-from .user_service import UserService
+from importlib import import_module
+
+from .background_executor import BackgroundExecutor, BackgroundTask
+from .cart import Cart
+
+# Imported on first access, so that e.g. ui.components can use BackgroundExecutor
+# without loading ReportLab through the PDF generators
+_LAZY_EXPORTS = {
+    'InvoiceGenerator': '.invoice_generator',
+    'BillGenerator': '.bill_generator',
+    'DashboardService': '.dashboard_service',
+    'SettingsService': '.settings_service',
+    'UserService': '.user_service',
+}
 
 __all__ = [
     'InvoiceGenerator',
     'BillGenerator',
     'DashboardService',
     'SettingsService',
-    'UserService'
+    'UserService',
+    'BackgroundExecutor',
+    'BackgroundTask',
+    'Cart'
 ]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,118 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class BackgroundTask:
+    """Handle for work submitted to BackgroundExecutor"""
+
+    def __init__(self, owner: Any, key: Any, on_done: Optional[Callable], on_error: Optional[Callable]):
+        self.owner = owner
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop the result; the work itself is skipped if it has not started yet"""
+        self.cancelled = True
+        if self.future:
+            self.future.cancel()
+
+
+class BackgroundExecutor:
+    """Shared worker pool for database work triggered from the UI.
+
+    Workers never call back directly: finished tasks are queued, and the UI
+    thread delivers them by calling dispatch_completed() (see TkDispatcher in
+    ui.components). Submitting with the same owner and key cancels the previous
+    task, so only the newest request for a table or search is delivered.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pos-worker')
+        self._completed = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._latest = {}
+
+    @classmethod
+    def shared(cls) -> 'BackgroundExecutor':
+        """Get the application-wide executor"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def submit(self, func: Callable[[], Any], on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               owner: Any = None, key: Any = None) -> BackgroundTask:
+        """Run func() on a worker; on_done(result) or on_error(exc) later runs on the UI thread"""
+        task = BackgroundTask(owner, key, on_done, on_error)
+        with self._lock:
+            if key is not None:
+                previous = self._latest.get((id(owner), key))
+                if previous:
+                    previous.cancel()
+                self._latest[(id(owner), key)] = task
+            self._pending.add(task)
+        task.future = self._pool.submit(func)
+        task.future.add_done_callback(lambda future: self._completed.put(task))
+        return task
+
+    def cancel_owner(self, owner: Any) -> int:
+        """Cancel every pending task submitted by owner (e.g. a frame being destroyed or hidden).
+        Returns how many were still live."""
+        with self._lock:
+            tasks = [t for t in self._pending if t.owner is owner and not t.cancelled]
+            for task in tasks:
+                task.cancel()
+            return len(tasks)
+
+    def has_pending(self) -> bool:
+        """Check whether any task is still running or waiting for dispatch"""
+        with self._lock:
+            return bool(self._pending)
+
+    def dispatch_completed(self) -> int:
+        """Deliver finished tasks to their callbacks; call from the UI thread only.
+        Returns the number of callbacks run."""
+        delivered = 0
+        while True:
+            try:
+                task = self._completed.get_nowait()
+            except queue.Empty:
+                return delivered
+
+            with self._lock:
+                self._pending.discard(task)
+                latest_key = (id(task.owner), task.key)
+                if self._latest.get(latest_key) is task:
+                    del self._latest[latest_key]
+            if task.cancelled or task.future.cancelled():
+                continue
+
+            error = task.future.exception()
+            try:
+                if error is None:
+                    if task.on_done:
+                        task.on_done(task.future.result())
+                elif task.on_error:
+                    task.on_error(error)
+                else:
+                    print(f"Background task error: {error}")
+            except Exception as e:
+                print(f"Background callback error: {e}")
+            delivered += 1
+
+    def shutdown(self):
+        """Cancel queued work and stop the workers"""
+        with self._lock:
+            for task in list(self._pending):
+                task.cancel()
+        self._pool.shutdown(wait=False)
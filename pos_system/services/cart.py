@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CartKey = Tuple[str, int]
+
+
+class Cart:
+    """Billing cart keyed by (type, id), with totals kept as lines change.
+
+    Lines use the format checkout_bill expects (type, id, name, quantity,
+    unit_price, total). Adding an item that is already in the cart raises its
+    quantity instead of adding a second line. The subtotal, the number of
+    service lines (which makes the category service charge apply) and the
+    frame quantities reserved by the cart are updated per change, never
+    re-summed. Frame changes are checked against the stock passed in, counting
+    what the cart already reserves of that frame, and refused (returning
+    None/False) if the reservation would exceed it. Has no Tk
+    dependency, so it can be driven from scripts and benchmarks.
+    """
+
+    def __init__(self):
+        self._lines: 'OrderedDict[CartKey, Dict[str, Any]]' = OrderedDict()
+        self.subtotal = 0.0
+        self.service_lines = 0
+        self._reserved: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __bool__(self) -> bool:
+        return bool(self._lines)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._lines.values())
+
+    def __contains__(self, key: CartKey) -> bool:
+        return key in self._lines
+
+    def get(self, key: CartKey) -> Optional[Dict[str, Any]]:
+        """Get the line for a key, or None"""
+        return self._lines.get(key)
+
+    def lines(self) -> List[Dict[str, Any]]:
+        """Get all lines in the order they were added"""
+        return list(self._lines.values())
+
+    def reserved(self, frame_id: int) -> int:
+        """Get how many of a frame the cart holds"""
+        return self._reserved.get(frame_id, 0)
+
+    @property
+    def has_services(self) -> bool:
+        """Whether the cart holds a service, which makes the category service charge apply"""
+        return self.service_lines > 0
+
+    def service_charge(self, category_service_cost: float) -> float:
+        """Get the category service charge that applies to this cart"""
+        return category_service_cost if category_service_cost > 0 and self.has_services else 0
+
+    def total(self, category_service_cost: float = 0, discount: float = 0) -> float:
+        """Get the amount due after service charge and discount"""
+        return max(0, self.subtotal + self.service_charge(category_service_cost) - discount)
+
+    def add(self, item_type: str, item_id: int, name: str, unit_price: float, quantity: int,
+            stock: Optional[int] = None) -> Optional[CartKey]:
+        """Add quantity of an item, merging with its existing line.
+        Returns the line's key, or None if a frame would exceed stock."""
+        key = (item_type, item_id)
+        line = self._lines.get(key)
+        if line is None:
+            if not self._within_stock(item_type, item_id, quantity, stock):
+                return None
+            self._lines[key] = {
+                'type': item_type,
+                'id': item_id,
+                'name': name,
+                'quantity': 0,
+                'unit_price': unit_price,
+                'total': 0,
+            }
+            if item_type == 'Service':
+                self.service_lines += 1
+            self._apply_quantity(key, quantity)
+            return key
+        if not self.set_quantity(key, line['quantity'] + quantity, stock):
+            return None
+        return key
+
+    def set_quantity(self, key: CartKey, quantity: int, stock: Optional[int] = None) -> bool:
+        """Change a line's quantity; False if the line is missing or a frame would exceed stock"""
+        line = self._lines.get(key)
+        if line is None or not self._within_stock(key[0], key[1], quantity - line['quantity'], stock):
+            return False
+        self._apply_quantity(key, quantity)
+        return True
+
+    def remove(self, key: CartKey) -> Optional[Dict[str, Any]]:
+        """Remove a line and return it (None if it was not in the cart)"""
+        if key not in self._lines:
+            return None
+        self._apply_quantity(key, 0)
+        line = self._lines.pop(key)
+        if key[0] == 'Service':
+            self.service_lines -= 1
+        if not self._lines:
+            # Drop any rounding residue left by the running sum
+            self.subtotal = 0.0
+        return line
+
+    def clear(self):
+        """Remove every line"""
+        self._lines.clear()
+        self.subtotal = 0.0
+        self.service_lines = 0
+        self._reserved.clear()
+
+    def _within_stock(self, item_type: str, item_id: int, change: int, stock: Optional[int]) -> bool:
+        """Check that changing a frame's reservation by `change` keeps it within stock
+        (None means unchecked)"""
+        return item_type != 'Frame' or stock is None or self.reserved(item_id) + change <= stock
+
+    def _apply_quantity(self, key: CartKey, quantity: int):
+        """Set a line's quantity and move the running totals by the difference"""
+        line = self._lines[key]
+        change = quantity - line['quantity']
+        total = line['unit_price'] * quantity
+        self.subtotal += total - line['total']
+        line['quantity'] = quantity
+        line['total'] = total
+        if key[0] == 'Frame':
+            reserved = self._reserved.get(key[1], 0) + change
+            if reserved:
+                self._reserved[key[1]] = reserved
+            else:
+                self._reserved.pop(key[1], None)
@@ -1,25 +1,63 @@
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Dict, Any
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Any
+
+from database.db_manager import DatabaseManager
+from database.date_window import day_window, last_days_window, month_window
 
 
 class DashboardService:
     """Dashboard statistics service"""
     
+    # Seconds a cached stats dict may be served without re-reading. Writes through
+    # DatabaseManager invalidate sooner; the TTL bounds staleness from anything else.
+    CACHE_TTL = 60.0
+    
+    # Shared by every instance, since the dashboard frame is rebuilt on navigation:
+    # (db_path, key) -> (write generation, day, cached at, stats)
+    _cache = {}
+    _cache_lock = threading.Lock()
+    
     def __init__(self, db_path='pos_database.db'):
         self.db_path = db_path
     
+    def _cached(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return cached stats for key, recomputing after a write, a date change or the TTL"""
+        generation = DatabaseManager.get_write_generation(self.db_path)
+        today = date.today()
+        with self._cache_lock:
+            entry = self._cache.get((self.db_path, key))
+        if entry:
+            cached_generation, cached_day, cached_at, stats = entry
+            if (cached_generation == generation and cached_day == today
+                    and time.monotonic() - cached_at < self.CACHE_TTL):
+                return stats
+        
+        stats = compute()
+        with self._cache_lock:
+            # Stamp with the generation read before computing, so a write that
+            # lands mid-computation still invalidates this entry
+            self._cache[(self.db_path, key)] = (generation, today, time.monotonic(), stats)
+        return stats
+    
+    def invalidate_cache(self):
+        """Drop cached stats for this database so the next read recomputes"""
+        with self._cache_lock:
+            for cache_key in [k for k in self._cache if k[0] == self.db_path]:
+                del self._cache[cache_key]
+    
     def get_today_sales(self) -> float:
         """Get total sales for today"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            today = datetime.now().strftime('%Y-%m-%d')
             cursor.execute('''
                 SELECT COALESCE(SUM(total_amount), 0) 
                 FROM invoices 
-                WHERE DATE(created_at) = ?
-            ''', (today,))
+                WHERE created_at >= ? AND created_at < ?
+            ''', day_window())
             result = cursor.fetchone()[0]
             conn.close()
             return float(result)
@@ -44,10 +82,9 @@ class DashboardService:
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            today = datetime.now().strftime('%Y-%m-%d')
             cursor.execute('''
-                SELECT COUNT(*) FROM invoices WHERE DATE(created_at) = ?
-            ''', (today,))
+                SELECT COUNT(*) FROM invoices WHERE created_at >= ? AND created_at < ?
+            ''', day_window())
             result = cursor.fetchone()[0]
             conn.close()
             return result
@@ -111,12 +148,11 @@ class DashboardService:
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
             cursor.execute('''
                 SELECT COALESCE(SUM(total_amount), 0) 
                 FROM invoices 
-                WHERE DATE(created_at) >= ?
-            ''', (week_ago,))
+                WHERE created_at >= ? AND created_at < ?
+            ''', last_days_window(7))
             result = cursor.fetchone()[0]
             conn.close()
             return float(result)
@@ -128,12 +164,11 @@ class DashboardService:
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            first_day = datetime.now().replace(day=1).strftime('%Y-%m-%d')
             cursor.execute('''
                 SELECT COALESCE(SUM(total_amount), 0) 
                 FROM invoices 
-                WHERE DATE(created_at) >= ?
-            ''', (first_day,))
+                WHERE created_at >= ? AND created_at < ?
+            ''', month_window())
             result = cursor.fetchone()[0]
             conn.close()
             return float(result)
@@ -186,7 +221,6 @@ class DashboardService:
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            today = datetime.now().strftime('%Y-%m-%d')
             
             cursor.execute('''
                 SELECT 
@@ -195,8 +229,8 @@ class DashboardService:
                     COALESCE(SUM(ii.buying_price), 0) as total_buying
                 FROM invoice_items ii
                 JOIN invoices i ON ii.invoice_id = i.id
-                WHERE ii.item_type = 'Frame' AND DATE(i.created_at) = ?
-            ''', (today,))
+                WHERE ii.item_type = 'Frame' AND i.created_at >= ? AND i.created_at < ?
+            ''', day_window())
             result = cursor.fetchone()
             
             total_sold = result[0] or 0
@@ -226,7 +260,6 @@ class DashboardService:
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            first_day = datetime.now().replace(day=1).strftime('%Y-%m-%d')
             
             cursor.execute('''
                 SELECT 
@@ -235,8 +268,8 @@ class DashboardService:
                     COALESCE(SUM(ii.buying_price), 0) as total_buying
                 FROM invoice_items ii
                 JOIN invoices i ON ii.invoice_id = i.id
-                WHERE ii.item_type = 'Frame' AND DATE(i.created_at) >= ?
-            ''', (first_day,))
+                WHERE ii.item_type = 'Frame' AND i.created_at >= ? AND i.created_at < ?
+            ''', month_window())
             result = cursor.fetchone()
             
             total_sold = result[0] or 0
@@ -263,105 +296,191 @@ class DashboardService:
     
     # ==================== Staff Dashboard Widgets ====================
     
-    def get_upcoming_bookings(self, limit: int = 5) -> list:
-        """Get upcoming bookings for staff dashboard"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            cursor.execute('''
-                SELECT b.id, b.event_date, b.event_time, b.event_location, 
-                       b.event_type, b.status, c.full_name as customer_name
-                FROM bookings b
-                JOIN customers c ON b.customer_id = c.id
-                WHERE b.event_date >= ? AND b.status IN ('Pending', 'Confirmed')
-                ORDER BY b.event_date ASC, b.event_time ASC
-                LIMIT ?
-            ''', (today, limit))
-            
-            bookings = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-            return bookings
-        except sqlite3.Error as e:
-            print(f"Error getting upcoming bookings: {e}")
-            return []
+    def get_upcoming_bookings(self, limit: int = 5, cursor=None) -> list:
+        """Get upcoming bookings for staff dashboard (on cursor's connection if given)"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        return self._list_rows('upcoming bookings', '''
+            SELECT b.id, b.event_date, b.event_time, b.event_location, 
+                   b.event_type, b.status, c.full_name as customer_name
+            FROM bookings b
+            JOIN customers c ON b.customer_id = c.id
+            WHERE b.event_date >= ? AND b.status IN ('Pending', 'Confirmed')
+            ORDER BY b.event_date ASC, b.event_time ASC
+            LIMIT ?
+        ''', (today, limit), cursor)
+    
+    def get_recent_customers(self, limit: int = 5, cursor=None) -> list:
+        """Get recently added customers for staff dashboard (on cursor's connection if given)"""
+        return self._list_rows('recent customers', '''
+            SELECT id, full_name, mobile_number, created_at
+            FROM customers
+            ORDER BY created_at DESC
+            LIMIT ?
+        ''', (limit,), cursor)
+    
+    def get_frame_stock_summary(self, limit: int = 5, cursor=None) -> list:
+        """Get frame stock summary for staff dashboard (no prices), lowest stock first"""
+        return self._list_rows('frame stock', '''
+            SELECT id, frame_name, size, quantity
+            FROM photo_frames
+            ORDER BY quantity ASC
+            LIMIT ?
+        ''', (limit,), cursor)
     
-    def get_recent_customers(self, limit: int = 5) -> list:
-        """Get recently added customers for staff dashboard"""
+    def _list_rows(self, label: str, query: str, params: tuple, cursor=None) -> list:
+        """Run a staff widget query on cursor, or on a connection of its own, and
+        return the rows as dicts. A failed query gives an empty list."""
+        conn = None
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT id, full_name, mobile_number, created_at
-                FROM customers
-                ORDER BY created_at DESC
-                LIMIT ?
-            ''', (limit,))
-            
-            customers = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-            return customers
+            if cursor is None:
+                conn = sqlite3.connect(self.db_path)
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
-            print(f"Error getting recent customers: {e}")
+            print(f"Error getting {label}: {e}")
             return []
+        finally:
+            if conn:
+                conn.close()
     
-    def get_frame_stock_summary(self, limit: int = 5) -> list:
-        """Get frame stock summary for staff dashboard (no prices)"""
+    def _collect_stats(self, include_frame_profit: bool = False,
+                       include_staff_lists: bool = False) -> Dict[str, Any]:
+        """Compute every dashboard counter in one pass over daily_sales_rollup.
+        The rollup holds one row per day and staff member, so this reads O(days)
+        rows; table-wide counts ride along as scalar subqueries. The staff list
+        widgets, if asked for, are read on the same connection."""
+        today_start, today_end = day_window()
+        week_start, week_end = last_days_window(7)
+        month_start, month_end = month_window()
         try:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
-            # Get frames sorted by stock level (lowest first for alerts)
             cursor.execute('''
-                SELECT id, frame_name, size, quantity
-                FROM photo_frames
-                ORDER BY quantity ASC
-                LIMIT ?
-            ''', (limit,))
-            
-            frames = [dict(row) for row in cursor.fetchall()]
+                SELECT 
+                    COALESCE(SUM(invoice_count), 0) as total_invoices,
+                    COALESCE(SUM(balance_amount), 0) as pending_balances,
+                    COALESCE(SUM(CASE WHEN sale_date >= :today_start AND sale_date < :today_end
+                                      THEN invoice_count END), 0) as today_invoices,
+                    COALESCE(SUM(CASE WHEN sale_date >= :today_start AND sale_date < :today_end
+                                      THEN total_amount END), 0) as today_sales,
+                    COALESCE(SUM(CASE WHEN sale_date >= :week_start AND sale_date < :week_end
+                                      THEN total_amount END), 0) as weekly_sales,
+                    COALESCE(SUM(CASE WHEN sale_date >= :month_start AND sale_date < :month_end
+                                      THEN total_amount END), 0) as monthly_sales,
+                    COALESCE(SUM(frame_quantity), 0) as frame_quantity,
+                    COALESCE(SUM(frame_revenue), 0) as frame_revenue,
+                    COALESCE(SUM(frame_cost), 0) as frame_cost,
+                    COALESCE(SUM(CASE WHEN sale_date >= :today_start AND sale_date < :today_end
+                                      THEN frame_quantity END), 0) as today_frame_quantity,
+                    COALESCE(SUM(CASE WHEN sale_date >= :today_start AND sale_date < :today_end
+                                      THEN frame_revenue END), 0) as today_frame_revenue,
+                    COALESCE(SUM(CASE WHEN sale_date >= :today_start AND sale_date < :today_end
+                                      THEN frame_cost END), 0) as today_frame_cost,
+                    COALESCE(SUM(CASE WHEN sale_date >= :month_start AND sale_date < :month_end
+                                      THEN frame_quantity END), 0) as month_frame_quantity,
+                    COALESCE(SUM(CASE WHEN sale_date >= :month_start AND sale_date < :month_end
+                                      THEN frame_revenue END), 0) as month_frame_revenue,
+                    COALESCE(SUM(CASE WHEN sale_date >= :month_start AND sale_date < :month_end
+                                      THEN frame_cost END), 0) as month_frame_cost,
+                    (SELECT COUNT(*) FROM customers) as total_customers,
+                    (SELECT COUNT(*) FROM bookings WHERE status = 'Pending') as pending_bookings,
+                    (SELECT COUNT(*) FROM photo_frames WHERE quantity < 10) as low_stock_frames
+                FROM daily_sales_rollup
+            ''', {
+                'today_start': today_start, 'today_end': today_end,
+                'week_start': week_start, 'week_end': week_end,
+                'month_start': month_start, 'month_end': month_end,
+            })
+            row = cursor.fetchone()
+            staff_lists = self._staff_lists(cursor) if include_staff_lists else {}
             conn.close()
-            return frames
+            
+            stats = {
+                'today_sales': float(row['today_sales']),
+                'today_invoices': row['today_invoices'],
+                'total_invoices': row['total_invoices'],
+                'pending_balances': float(row['pending_balances']),
+                'total_customers': row['total_customers'],
+                'pending_bookings': row['pending_bookings'],
+                'low_stock_frames': row['low_stock_frames'],
+                'weekly_sales': float(row['weekly_sales']),
+                'monthly_sales': float(row['monthly_sales']),
+            }
+            if include_frame_profit:
+                stats['frame_profit'] = self._frame_profit(
+                    row['frame_quantity'], row['frame_revenue'], row['frame_cost'])
+                stats['today_frame_profit'] = self._frame_profit(
+                    row['today_frame_quantity'], row['today_frame_revenue'], row['today_frame_cost'])
+                stats['monthly_frame_profit'] = self._frame_profit(
+                    row['month_frame_quantity'], row['month_frame_revenue'], row['month_frame_cost'])
+            stats.update(staff_lists)
+            return stats
         except sqlite3.Error as e:
-            print(f"Error getting frame stock: {e}")
-            return []
+            print(f"Error getting dashboard stats: {e}")
+            return self._empty_stats(include_frame_profit, include_staff_lists)
     
-    def get_staff_dashboard_stats(self) -> Dict[str, Any]:
-        """Get dashboard statistics for staff users (no financial data)"""
+    def _staff_lists(self, cursor) -> Dict[str, list]:
+        """Read the staff dashboard list widgets on an open cursor"""
         return {
-            'today_invoices': self.get_today_invoices(),
-            'total_invoices': self.get_total_invoices(),
-            'total_customers': self.get_total_customers(),
-            'pending_bookings': self.get_pending_bookings(),
-            'low_stock_frames': self.get_low_stock_frames(),
-            'upcoming_bookings': self.get_upcoming_bookings(),
-            'recent_customers': self.get_recent_customers(),
-            'frame_stock': self.get_frame_stock_summary(),
+            'upcoming_bookings': self.get_upcoming_bookings(cursor=cursor),
+            'recent_customers': self.get_recent_customers(cursor=cursor),
+            'frame_stock': self.get_frame_stock_summary(cursor=cursor),
         }
     
-    def get_dashboard_stats(self) -> Dict[str, Any]:
-        """Get all dashboard statistics"""
+    @staticmethod
+    def _frame_profit(total_sold, total_selling, total_buying) -> Dict[str, Any]:
+        """Build a frame profit dict from summed quantity, selling and buying amounts"""
+        total_selling = float(total_selling or 0)
+        total_buying = float(total_buying or 0)
         return {
-            'today_sales': self.get_today_sales(),
-            'today_invoices': self.get_today_invoices(),
-            'total_invoices': self.get_total_invoices(),
-            'pending_balances': self.get_pending_balances(),
-            'total_customers': self.get_total_customers(),
-            'pending_bookings': self.get_pending_bookings(),
-            'low_stock_frames': self.get_low_stock_frames(),
-            'weekly_sales': self.get_weekly_sales(),
-            'monthly_sales': self.get_monthly_sales(),
+            'total_frames_sold': total_sold or 0,
+            'total_buying_cost': total_buying,
+            'total_selling_amount': total_selling,
+            'net_profit': total_selling - total_buying
         }
     
+    def get_staff_dashboard_stats(self) -> Dict[str, Any]:
+        """Get everything the staff dashboard shows (no financial data): the shared
+        counters and the list widgets, from one cached pass on one connection"""
+        return self._cached('staff', self._collect_staff_stats)
+    
+    def _collect_staff_stats(self) -> Dict[str, Any]:
+        """Compute the staff dashboard: shared counters plus the list widgets"""
+        stats = self._collect_stats(include_staff_lists=True)
+        return {key: stats[key] for key in (
+            'today_invoices', 'total_invoices', 'total_customers', 'pending_bookings',
+            'low_stock_frames', 'upcoming_bookings', 'recent_customers', 'frame_stock')}
+    
+    def get_dashboard_stats(self) -> Dict[str, Any]:
+        """Get all dashboard statistics in a single aggregate pass (cached)"""
+        return self._cached('general', self._collect_stats)
+    
     def get_admin_dashboard_stats(self) -> Dict[str, Any]:
-        """Get dashboard statistics including admin-only frame profit data"""
-        stats = self.get_dashboard_stats()
-        stats['frame_profit'] = self.get_frame_profit_stats()
-        stats['today_frame_profit'] = self.get_today_frame_profit()
-        stats['monthly_frame_profit'] = self.get_monthly_frame_profit()
+        """Get dashboard statistics including admin-only frame profit data (cached)"""
+        return self._cached('admin', lambda: self._collect_stats(include_frame_profit=True))
+    
+    def _empty_stats(self, include_frame_profit: bool = False,
+                     include_staff_lists: bool = False) -> Dict[str, Any]:
+        """Zeroed stats dict used when the aggregate query fails"""
+        stats = {
+            'today_sales': 0.0,
+            'today_invoices': 0,
+            'total_invoices': 0,
+            'pending_balances': 0.0,
+            'total_customers': 0,
+            'pending_bookings': 0,
+            'low_stock_frames': 0,
+            'weekly_sales': 0.0,
+            'monthly_sales': 0.0,
+        }
+        if include_frame_profit:
+            stats['frame_profit'] = self._frame_profit(0, 0, 0)
+            stats['today_frame_profit'] = self._frame_profit(0, 0, 0)
+            stats['monthly_frame_profit'] = self._frame_profit(0, 0, 0)
+        if include_staff_lists:
+            stats.update(upcoming_bookings=[], recent_customers=[], frame_stock=[])
         return stats
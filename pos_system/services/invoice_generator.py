@@ -6,33 +6,38 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from datetime import datetime
 import os
 
-# Register Unicode font for Sinhala text support
-try:
-    # Try Iskoola Pota first (Windows built-in, best for Sinhala)
-    pdfmetrics.registerFont(TTFont('IskooPota', 'C:/Windows/Fonts/iskpota.ttf'))
-    pdfmetrics.registerFont(TTFont('IskooPota-Bold', 'C:/Windows/Fonts/iskpotab.ttf'))
-    SINHALA_FONT = 'IskooPota'
-    SINHALA_FONT_BOLD = 'IskooPota-Bold'
-except:
+# (regular, bold) font names for Sinhala text, registered on first use so that
+# importing this module does not read the Windows font files
+_sinhala_fonts = None
+
+
+def get_sinhala_fonts():
+    """Register a Unicode font for Sinhala text support and return (regular, bold) font names"""
+    global _sinhala_fonts
+    if _sinhala_fonts is not None:
+        return _sinhala_fonts
     try:
-        # Fallback to Nirmala UI
-        pdfmetrics.registerFont(TTFont('NirmalaUI', 'C:/Windows/Fonts/Nirmala.ttf'))
-        pdfmetrics.registerFont(TTFont('NirmalaUI-Bold', 'C:/Windows/Fonts/NirmalaB.ttf'))
-        SINHALA_FONT = 'NirmalaUI'
-        SINHALA_FONT_BOLD = 'NirmalaUI-Bold'
+        # Try Iskoola Pota first (Windows built-in, best for Sinhala)
+        pdfmetrics.registerFont(TTFont('IskooPota', 'C:/Windows/Fonts/iskpota.ttf'))
+        pdfmetrics.registerFont(TTFont('IskooPota-Bold', 'C:/Windows/Fonts/iskpotab.ttf'))
+        _sinhala_fonts = ('IskooPota', 'IskooPota-Bold')
     except:
         try:
-            # Fallback to Arial Unicode MS
-            pdfmetrics.registerFont(TTFont('ArialUnicode', 'C:/Windows/Fonts/ARIALUNI.TTF'))
-            SINHALA_FONT = 'ArialUnicode'
-            SINHALA_FONT_BOLD = 'ArialUnicode'
+            # Fallback to Nirmala UI
+            pdfmetrics.registerFont(TTFont('NirmalaUI', 'C:/Windows/Fonts/Nirmala.ttf'))
+            pdfmetrics.registerFont(TTFont('NirmalaUI-Bold', 'C:/Windows/Fonts/NirmalaB.ttf'))
+            _sinhala_fonts = ('NirmalaUI', 'NirmalaUI-Bold')
         except:
-            # Final fallback - use default font (Sinhala won't render)
-            SINHALA_FONT = 'Helvetica'
-            SINHALA_FONT_BOLD = 'Helvetica-Bold'
+            try:
+                # Fallback to Arial Unicode MS
+                pdfmetrics.registerFont(TTFont('ArialUnicode', 'C:/Windows/Fonts/ARIALUNI.TTF'))
+                _sinhala_fonts = ('ArialUnicode', 'ArialUnicode')
+            except:
+                # Final fallback - use default font (Sinhala won't render)
+                _sinhala_fonts = ('Helvetica', 'Helvetica-Bold')
+    return _sinhala_fonts
 
 
 class InvoiceGenerator:
@@ -377,11 +382,10 @@ class InvoiceGenerator:
             print(f"Error opening invoice: {e}")
             return False
     
-    def generate_booking_invoice(self, booking_data, created_by_name):
-        """Generate PDF booking invoice with premium black theme"""
-        
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        invoice_number = f"BK-{timestamp}"
+    def generate_booking_invoice(self, invoice):
+        """Generate PDF booking invoice with premium black theme from a saved invoice:
+        the row DatabaseManager.create_booking_invoice returns, with its 'items'"""
+        invoice_number = invoice['invoice_number']
         
         filename = f"Booking_{invoice_number}.pdf"
         filepath = os.path.join(self.invoice_folder, filename)
@@ -414,7 +418,7 @@ class InvoiceGenerator:
         title = Paragraph("<b>INVOICE</b>", ParagraphStyle('Title', fontSize=28, textColor=colors.HexColor('#1a1a2e'), alignment=TA_RIGHT, fontName='Helvetica-Bold'))
         meta_style = ParagraphStyle('Meta', fontSize=11, alignment=TA_RIGHT, leading=15)
         receipt_no = Paragraph(f"Invoice No: <b>{invoice_number}</b>", meta_style)
-        receipt_date = Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}", meta_style)
+        receipt_date = Paragraph(f"Date: {str(invoice['created_at'])[:16]}", meta_style)
         
         right_content = Table([[title], [Spacer(1, 2*mm)], [receipt_no], [receipt_date]], colWidths=[page_width*0.45])
         right_content.setStyle(TableStyle([('ALIGN', (0, 0), (-1, -1), 'RIGHT'), ('VALIGN', (0, 0), (-1, -1), 'TOP')]))
@@ -435,9 +439,9 @@ class InvoiceGenerator:
         
         bill_to_info = Table([
             [Paragraph("<b>Bill To:</b>", ParagraphStyle('BillTo', fontSize=12, fontName='Helvetica-Bold'))],
-            [Paragraph(f"Customer: {booking_data['customer_name']}", ParagraphStyle('Cust', fontSize=11))],
-            [Paragraph(f"Mobile: {booking_data['mobile_number']}", ParagraphStyle('Mob', fontSize=11))],
-            [Paragraph(f"Booking Date: {booking_data['booking_date']}", ParagraphStyle('Date', fontSize=11))],
+            [Paragraph(f"Customer: {invoice['full_name']}", ParagraphStyle('Cust', fontSize=11))],
+            [Paragraph(f"Mobile: {invoice.get('mobile_number') or 'N/A'}", ParagraphStyle('Mob', fontSize=11))],
+            [Paragraph(f"Booking Date: {invoice.get('booking_date') or 'N/A'}", ParagraphStyle('Date', fontSize=11))],
         ], colWidths=[page_width*0.5])
         bill_to_info.setStyle(TableStyle([('ALIGN', (0, 0), (-1, -1), 'LEFT'), ('BOTTOMPADDING', (0, 0), (-1, -1), 2)]))
         
@@ -457,21 +461,15 @@ class InvoiceGenerator:
         center_style = ParagraphStyle('Center', fontSize=11, alignment=TA_CENTER)
         right_style = ParagraphStyle('Right', fontSize=11, alignment=TA_RIGHT)
         
-        # Parse service name
-        photoshoot_cat = booking_data['photoshoot_category']
-        if ' - ' in photoshoot_cat:
-            parts = photoshoot_cat.split(' - ', 1)
-            service_name = f"{parts[0]} - {parts[1]}"
-        else:
-            service_name = photoshoot_cat
-        
-        full_amount = float(booking_data['full_amount'])
-        advance_payment = float(booking_data.get('advance_payment', 0))
+        full_amount = float(invoice['total_amount'])
+        advance_payment = float(invoice.get('advance_payment') or 0)
         
         table_data = [
-            [Paragraph("Description", header_desc_style), Paragraph("Advance Amount", header_center_style), Paragraph("Full Amount", header_right_style), Paragraph("Amount", header_right_style)],
-            [Paragraph(service_name, desc_style), Paragraph(f"Rs. {advance_payment:,.2f}", center_style), Paragraph(f"Rs. {full_amount:,.2f}", right_style), Paragraph(f"Rs. {full_amount:,.2f}", right_style)]
+            [Paragraph("Description", header_desc_style), Paragraph("Advance Amount", header_center_style), Paragraph("Full Amount", header_right_style), Paragraph("Amount", header_right_style)]
         ]
+        for item in invoice['items']:
+            line_total = float(item['total_price'])
+            table_data.append([Paragraph(item['item_name'], desc_style), Paragraph(f"Rs. {advance_payment:,.2f}", center_style), Paragraph(f"Rs. {line_total:,.2f}", right_style), Paragraph(f"Rs. {line_total:,.2f}", right_style)])
         
         col_widths = [page_width*0.44, page_width*0.18, page_width*0.19, page_width*0.19]
         items_table = Table(table_data, colWidths=col_widths)
@@ -510,15 +508,15 @@ class InvoiceGenerator:
         story.append(Spacer(1, 6*mm))
         
         # === FINANCIAL SUMMARY (Right-aligned) ===
-        advance_payment = float(booking_data['advance_payment'])
-        balance = full_amount - advance_payment
+        subtotal = float(invoice['subtotal'])
+        balance = float(invoice['balance_amount'])
         
         summary_style = ParagraphStyle('Sum', fontSize=11, alignment=TA_RIGHT)
         summary_bold = ParagraphStyle('SumBold', fontSize=11, alignment=TA_RIGHT, fontName='Helvetica-Bold')
         balance_style = ParagraphStyle('Bal', fontSize=11, alignment=TA_RIGHT, fontName='Helvetica-Bold', textColor=colors.HexColor('#c0392b'))
         
         summary_data = [
-            [Paragraph("Subtotal:", summary_style), Paragraph(f"Rs. {full_amount:,.2f}", summary_style)],
+            [Paragraph("Subtotal:", summary_style), Paragraph(f"Rs. {subtotal:,.2f}", summary_style)],
             [Paragraph("<b>TOTAL:</b>", summary_bold), Paragraph(f"<b>Rs. {full_amount:,.2f}</b>", summary_bold)],
             [Paragraph("Advance Paid:", summary_style), Paragraph(f"Rs. {advance_payment:,.2f}", summary_style)],
             [Paragraph("Balance Due:", balance_style), Paragraph(f"Rs. {balance:,.2f}", balance_style)],
@@ -946,7 +944,7 @@ class InvoiceGenerator:
         
         # === TERMS & CONDITIONS (Sinhala Policy) ===
         terms_title_style = ParagraphStyle('TermsTitle', fontSize=10, fontName='Helvetica-Bold', alignment=TA_LEFT, textColor=colors.HexColor('#333333'))
-        terms_text_style = ParagraphStyle('TermsText', fontSize=9, fontName=SINHALA_FONT, alignment=TA_LEFT, textColor=colors.HexColor('#555555'), leading=12)
+        terms_text_style = ParagraphStyle('TermsText', fontSize=9, fontName=get_sinhala_fonts()[0], alignment=TA_LEFT, textColor=colors.HexColor('#555555'), leading=12)
         
         story.append(Paragraph("<b>Terms &amp; Conditions:</b>", terms_title_style))
         story.append(Spacer(1, 1*mm))
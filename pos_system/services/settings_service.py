@@ -1,6 +1,8 @@
 import sqlite3
 from typing import Dict, Any, Optional
 
+from database.db_manager import DatabaseManager
+
 
 class SettingsService:
     """Manage application settings stored in database"""
@@ -72,6 +74,7 @@ class SettingsService:
                     updated_at = CURRENT_TIMESTAMP
             ''', (key, value, setting_type, description))
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
         except sqlite3.Error as e:
@@ -106,6 +109,7 @@ class SettingsService:
                         updated_at = CURRENT_TIMESTAMP
                 ''', (key, value))
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
         except sqlite3.Error as e:
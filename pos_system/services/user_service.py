@@ -2,6 +2,8 @@ import sqlite3
 import hashlib
 from typing import List, Dict, Any, Optional
 
+from database.db_manager import DatabaseManager
+
 
 class UserService:
     """User management service"""
@@ -56,6 +58,7 @@ class UserService:
                 UPDATE users SET profile_picture = ? WHERE id = ?
             ''', (picture_path, user_id))
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
         except sqlite3.Error as e:
@@ -88,6 +91,7 @@ class UserService:
             ''', (username, password_hash, role, full_name))
             user_id = cursor.lastrowid
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return user_id
         except sqlite3.IntegrityError:
@@ -109,6 +113,7 @@ class UserService:
                 WHERE id = ?
             ''', (username, role, full_name, is_active, user_id))
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
         except sqlite3.Error as e:
@@ -125,6 +130,7 @@ class UserService:
                 UPDATE users SET password_hash = ? WHERE id = ?
             ''', (password_hash, user_id))
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
         except sqlite3.Error as e:
@@ -153,6 +159,7 @@ class UserService:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM users WHERE id = ?', (user_id,))
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
         except sqlite3.Error as e:
@@ -169,6 +176,7 @@ class UserService:
                 WHERE id = ?
             ''', (user_id,))
             conn.commit()
+            DatabaseManager.mark_written(self.db_path)
             conn.close()
             return True
         except sqlite3.Error as e:
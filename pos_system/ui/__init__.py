@@ -1,17 +1,24 @@
+from importlib import import_module
+
 from .components import LoginWindow, MessageDialog, BaseFrame
-from .customer_frame import CustomerManagementFrame
-from .service_frame import ServiceManagementFrame
-from .frame_frame import FrameManagementFrame
-from .billing_frame import BillingFrame
-from .booking_frame import BookingManagementFrame
-from .invoice_history_frame import InvoiceHistoryFrame
-from .sidebar import Sidebar
-from .dashboard_frame import DashboardFrame
-from .users_frame import UsersManagementFrame
-from .settings_frame import SettingsFrame
-from .support_frame import SupportFrame
-from .user_guide_frame import UserGuideFrame
-from .profile_frame import ProfileFrame
+
+# Page frames are imported on first access; main.py loads each one when it is
+# first navigated to, so startup only pays for the login window
+_LAZY_EXPORTS = {
+    'CustomerManagementFrame': '.customer_frame',
+    'ServiceManagementFrame': '.service_frame',
+    'FrameManagementFrame': '.frame_frame',
+    'BillingFrame': '.billing_frame',
+    'BookingManagementFrame': '.booking_frame',
+    'InvoiceHistoryFrame': '.invoice_history_frame',
+    'Sidebar': '.sidebar',
+    'DashboardFrame': '.dashboard_frame',
+    'UsersManagementFrame': '.users_frame',
+    'SettingsFrame': '.settings_frame',
+    'SupportFrame': '.support_frame',
+    'UserGuideFrame': '.user_guide_frame',
+    'ProfileFrame': '.profile_frame',
+}
 
 __all__ = [
     'LoginWindow',
@@ -31,3 +38,12 @@ __all__ = [
     'UserGuideFrame',
     'ProfileFrame'
 ]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
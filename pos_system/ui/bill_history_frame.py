@@ -1,7 +1,7 @@
 import customtkinter as ctk
 from tkinter import ttk
-from ui.components import BaseFrame, MessageDialog
-from services.bill_generator import BillGenerator
+from ui.components import BaseFrame, MessageDialog, KeyedTable, PagedTableLoader
+from functools import cached_property
 
 
 class BillHistoryFrame(BaseFrame):
@@ -9,10 +9,19 @@ class BillHistoryFrame(BaseFrame):
     
     def __init__(self, parent, auth_manager, db_manager):
         super().__init__(parent, auth_manager, db_manager)
-        self.bill_generator = BillGenerator()
         self.create_widgets()
         self.load_bills()
     
+    @cached_property
+    def bill_generator(self):
+        """Bill generator for reprints, created on first use"""
+        from services.bill_generator import BillGenerator
+        return BillGenerator()
+    
+    def reload(self):
+        """Refresh the list when shown again, keeping any search term"""
+        self.search_controller.search_now()
+    
     def create_widgets(self):
         """Create bill history widgets"""
         
@@ -135,7 +144,24 @@ class BillHistoryFrame(BaseFrame):
         self.tree.tag_configure('hasbalance', background='#3a2e1e', foreground='#ffd93d')
         
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        # Rows load a page at a time as the user scrolls
+        self.table_loader = PagedTableLoader(
+            KeyedTable(self.tree, self.bill_row_values, self.bill_row_tag), scrollbar,
+            on_count=lambda count: self.record_count_label.configure(text=f"{count} records"),
+            runner=self.run_in_background,
+            fill=self.fill_table
+        )
+        self.search_controller = self.create_search(
+            self.search_entry,
+            lambda term: self.db_manager.search_invoices(term, kind='bill'),
+            self.table_loader.show_rows,
+            on_empty=self.load_bills,
+            match_fields=self.db_manager.INVOICE_SEARCH_FIELDS,
+            # Ranked full-text results cannot be narrowed in memory
+            narrow_max_length=self.db_manager.FTS_MIN_TERM_LENGTH - 1,
+            on_start=self.table_loader.stop
+        )
         
         self.tree.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
         scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
@@ -144,79 +170,36 @@ class BillHistoryFrame(BaseFrame):
         self.tree.bind("<Double-Button-1>", lambda e: self.view_bill_details())
     
     def load_bills(self):
-        """Load only regular bills (not booking invoices)"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Get all invoices and filter out booking invoices
-        all_invoices = self.db_manager.get_all_invoices(limit=200)
-        bills = [inv for inv in all_invoices if not inv['invoice_number'].startswith('BK-') and not inv.get('booking_id')]
-        
-        for i, bill in enumerate(bills):
-            balance = bill['balance_amount']
-            # Highlight bills with pending balance
-            if balance > 0:
-                tag = 'hasbalance'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            # Count items for this bill
-            items = self.db_manager.get_invoice_items(bill['id'])
-            item_count = len(items)
-            
-            self.tree.insert("", "end", values=(
-                bill['invoice_number'],
-                bill['created_at'],
-                bill['full_name'],
-                bill['mobile_number'] or 'N/A',
-                item_count,
-                f"{bill['total_amount']:.2f}",
-                f"{bill['paid_amount']:.2f}",
-                f"{bill['balance_amount']:.2f}"
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(bills)} records")
+        """Load only regular bills (not booking invoices), newest first, one page at a time"""
+        def fetch_page(last, page_size):
+            return self.db_manager.get_all_invoices(
+                page_size=page_size, kind='bill',
+                after_created_at=last['created_at'] if last else None,
+                after_id=last['id'] if last else None
+            )
+        self.table_loader.reset(fetch_page)
     
     def search_bills(self):
         """Search regular bills only"""
-        search_term = self.search_entry.get().strip()
-        
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if not search_term:
-            self.load_bills()
-            return
-        
-        all_invoices = self.db_manager.search_invoices(search_term)
-        # Filter to only regular bills (not booking invoices)
-        bills = [inv for inv in all_invoices if not inv['invoice_number'].startswith('BK-') and not inv.get('booking_id')]
-        
-        for i, bill in enumerate(bills):
-            balance = bill['balance_amount']
-            if balance > 0:
-                tag = 'hasbalance'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            # Count items for this bill
-            items = self.db_manager.get_invoice_items(bill['id'])
-            item_count = len(items)
-            
-            self.tree.insert("", "end", values=(
-                bill['invoice_number'],
-                bill['created_at'],
-                bill['full_name'],
-                bill['mobile_number'] or 'N/A',
-                item_count,
-                f"{bill['total_amount']:.2f}",
-                f"{bill['paid_amount']:.2f}",
-                f"{bill['balance_amount']:.2f}"
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(bills)} records")
+        # Debounced: runs once typing pauses, narrowing earlier results where it can
+        self.search_controller.schedule()
+    
+    def bill_row_tag(self, bill):
+        """Highlight bills with pending balance"""
+        return 'hasbalance' if bill['balance_amount'] > 0 else None
+    
+    def bill_row_values(self, bill):
+        """Table values for one bill (item count comes from the listing query)"""
+        return (
+            bill['invoice_number'],
+            bill['created_at'],
+            bill['full_name'],
+            bill['mobile_number'] or 'N/A',
+            bill['item_count'],
+            f"{bill['total_amount']:.2f}",
+            f"{bill['paid_amount']:.2f}",
+            f"{bill['balance_amount']:.2f}"
+        )
     
     def view_bill_details(self):
         """View detailed bill information"""
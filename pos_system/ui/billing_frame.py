@@ -1,7 +1,8 @@
 import customtkinter as ctk
 from tkinter import ttk
 from ui.components import BaseFrame, MessageDialog
-from services import InvoiceGenerator, BillGenerator
+from services.cart import Cart
+from functools import cached_property
 
 
 class BillingFrame(BaseFrame):
@@ -9,16 +10,17 @@ class BillingFrame(BaseFrame):
 
     def __init__(self, parent, auth_manager, db_manager):
         super().__init__(parent, auth_manager, db_manager)
-        self.invoice_generator = InvoiceGenerator()
-        self.bill_generator = BillGenerator()
         self.selected_customer = None
         self.is_guest_customer = False
         self.guest_customer_name = ""
-        self.cart_items = []
+        self.cart = Cart()
+        # Amount due, updated by calculate_totals
+        self.cart_total = 0.0
         self.categories_map = {}
         self.categories_data = {}
         self.services_map = {}
         self.frames_map = {}
+        self._catalog_version = None  # catalog version the maps were built from
         self.category_service_cost = 0
         self.selected_category_name = None
         self.selected_category_id = None
@@ -26,7 +28,39 @@ class BillingFrame(BaseFrame):
         self.payment_type = "full"  # 'full' or 'advance'
         self.booking_reference = None  # For linking to booking
         self.create_widgets()
+        self.refresh_catalog()
+        # Build the customer index off the Tk thread before the first suggestion
+        self.run_in_background(self.db_manager.load_customer_index)
+
+    @cached_property
+    def invoice_generator(self):
+        """PDF invoice generator, created on first use so ReportLab loads with the first PDF"""
+        from services.invoice_generator import InvoiceGenerator
+        return InvoiceGenerator()
+
+    @cached_property
+    def bill_generator(self):
+        """PDF bill generator, created on first use so ReportLab loads with the first PDF"""
+        from services.bill_generator import BillGenerator
+        return BillGenerator()
+
+    def reload(self):
+        """Refresh the catalog copies when shown again; the cart is kept"""
+        self.refresh_catalog()
+
+    def refresh_catalog(self):
+        """Rebuild categories, the chosen category's services and the frame list
+        if the catalog changed (a sale's stock change included) since they were built"""
+        version = self.db_manager.get_catalog_version()
+        if version == self._catalog_version:
+            return
+        self._catalog_version = version
         self.load_categories()
+        if self.selected_category_id is not None:
+            services = self.db_manager.get_services_by_category(self.selected_category_id)
+            self.services_map = {s['service_name']: s for s in services}
+        if self.item_type.get() == "Frame":
+            self.load_frames()
 
     def create_widgets(self):
         """Create billing widgets"""
@@ -134,6 +168,15 @@ class BillingFrame(BaseFrame):
         # Customer suggestions dropdown (hidden by default)
         self.suggestions_frame = ctk.CTkFrame(customer_frame, fg_color="#2d2d5a", corner_radius=8)
         self.suggestion_buttons = []
+        # Suggestions come from the in-memory customer index; they are looked up in the
+        # background so typing never waits for the index build started in __init__
+        self.mobile_search_controller = self.create_search(
+            self.mobile_search,
+            lambda term: self.db_manager.suggest_customers(term, limit=5),
+            self.update_suggestions,
+            on_empty=self.hide_suggestions,
+            min_length=5
+        )
 
         # Customer details display card (hidden by default)
         self.customer_card = ctk.CTkFrame(customer_frame, fg_color="#1e3a2f", corner_radius=10, border_width=2, border_color="#00ff88")
@@ -579,7 +622,8 @@ class BillingFrame(BaseFrame):
         )
         scroll_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
-        categories = self.db_manager.get_all_categories()
+        # Each category comes with its free service, in one query
+        categories = self.db_manager.get_categories_with_services()
         
         if not categories:
             ctk.CTkLabel(
@@ -615,13 +659,10 @@ class BillingFrame(BaseFrame):
                         anchor="w"
                     ).pack(anchor="w")
 
-                # Check for free service (price = 0)
-                category_id = cat['id']
-                services = self.db_manager.get_services_by_category(category_id)
-                free_services = [s for s in services if s.get('price', 0) == 0]
+                # Free service (price = 0) included with the category
+                free_service_name = cat['free_service_name']
                 
-                if free_services:
-                    free_service_name = free_services[0]['service_name']
+                if free_service_name:
                     ctk.CTkLabel(
                         info_frame,
                         text=f"🎁 Free Service Included: {free_service_name}",
@@ -630,8 +671,8 @@ class BillingFrame(BaseFrame):
                         anchor="w"
                     ).pack(anchor="w")
 
-                def select_cat(c=cat, fs=free_services):
-                    self.on_category_selected(c, fs[0]['service_name'] if fs else None)
+                def select_cat(c=cat, fs=free_service_name):
+                    self.on_category_selected(c, fs)
                     close_popup()
 
                 ctk.CTkButton(
@@ -681,6 +722,7 @@ class BillingFrame(BaseFrame):
 
     def open_item_popup(self):
         """Open popup for item selection"""
+        self.refresh_catalog()
         item_type = self.item_type.get()
         
         popup = ctk.CTkToplevel(self)
@@ -871,43 +913,24 @@ class BillingFrame(BaseFrame):
             unit_price = item.get('price', 0)
             cart_type = 'Service'
         else:
-            # Check stock for frames
-            if item.get('quantity', 0) < qty:
-                MessageDialog.show_error("Error", f"Insufficient stock. Available: {item.get('quantity', 0)}")
-                return
             item_id = item['id']
             item_name = f"{item['frame_name']} - {item['size']}"
             unit_price = item.get('price', 0)
             cart_type = 'Frame'
 
-        # Check for existing item in cart (prevent duplicates)
-        for existing_item in self.cart_items:
-            if existing_item['id'] == item_id and existing_item['type'] == cart_type:
-                # Check stock if adding more frames
-                if cart_type == 'Frame':
-                    new_qty = existing_item['quantity'] + qty
-                    if item.get('quantity', 0) < new_qty:
-                        MessageDialog.show_error("Error", f"Insufficient stock. Available: {item.get('quantity', 0)}")
-                        return
-                # Update existing item quantity
-                existing_item['quantity'] += qty
-                existing_item['total'] = existing_item['unit_price'] * existing_item['quantity']
-                self.refresh_cart()
-                self.calculate_totals()
-                return
-
-        # Add new item to cart
-        cart_item = {
-            'type': cart_type,
-            'id': item_id,
-            'name': item_name,
-            'quantity': qty,
-            'unit_price': unit_price,
-            'total': unit_price * qty
-        }
-
-        self.cart_items.append(cart_item)
-        self.refresh_cart()
+        # Check frames against current catalog stock (the popup's copy may be stale)
+        stock = None
+        if cart_type == 'Frame':
+            frame_data = self.db_manager.get_photo_frame_by_id(item_id)
+            stock = frame_data.get('quantity', 0) if frame_data else 0
+
+        # Items already in the cart have their quantity raised (no duplicate lines)
+        key = self.cart.add(cart_type, item_id, item_name, unit_price, qty, stock=stock)
+        if key is None:
+            MessageDialog.show_error(
+                "Error", f"Insufficient stock. Available: {stock} (already in cart: {self.cart.reserved(item_id)})")
+            return
+        self.show_cart_line(key)
         self.calculate_totals()
 
     def load_frames(self):
@@ -935,6 +958,7 @@ class BillingFrame(BaseFrame):
     def clear_selected_customer_display(self):
         """Clear customer card display without resetting guest mode"""
         self.selected_customer = None
+        self.mobile_search_controller.cancel()
         self.customer_card.pack_forget()
         self.no_customer_label.pack(pady=10)
         self.mobile_search.delete(0, "end")
@@ -955,6 +979,7 @@ class BillingFrame(BaseFrame):
 
     def search_customer(self):
         """Search customer by mobile"""
+        self.mobile_search_controller.cancel()
         self.hide_suggestions()
         mobile = self.mobile_search.get().strip()
 
@@ -983,22 +1008,20 @@ class BillingFrame(BaseFrame):
         self.selected_customer = None
         self.is_guest_customer = False
         self.guest_customer_name = ""
+        self.mobile_search_controller.cancel()
         self.customer_card.pack_forget()
         self.no_customer_label.pack(pady=10)
         self.mobile_search.delete(0, "end")
         self.guest_name_entry.delete(0, "end")
 
     def on_mobile_search_change(self, event=None):
-        """Auto-search when typing 5+ digits"""
-        mobile = self.mobile_search.get().strip()
+        """Auto-search when typing 5+ digits (once typing pauses)"""
+        self.mobile_search_controller.schedule()
 
-        if len(mobile) >= 5:
-            customers = self.db_manager.search_customers(mobile)
-
-            if customers:
-                self.show_suggestions(customers)
-            else:
-                self.hide_suggestions()
+    def update_suggestions(self, customers):
+        """Show matching customers, or hide the dropdown if there are none"""
+        if customers:
+            self.show_suggestions(customers)
         else:
             self.hide_suggestions()
 
@@ -1033,6 +1056,7 @@ class BillingFrame(BaseFrame):
 
     def select_suggestion(self, customer):
         """Select a customer from suggestions"""
+        self.mobile_search_controller.cancel()
         self.hide_suggestions()
         self.mobile_search.delete(0, "end")
         self.mobile_search.insert(0, customer['mobile_number'])
@@ -1182,9 +1206,9 @@ class BillingFrame(BaseFrame):
             MessageDialog.show_error("Error", "Please select an item to remove")
             return
 
-        index = self.cart_tree.index(selection[0])
-        self.cart_items.pop(index)
-        self.refresh_cart()
+        key = self.cart_key(selection[0])
+        self.cart.remove(key)
+        self.cart_tree.delete(selection[0])
         self.calculate_totals()
 
     def edit_cart_item(self):
@@ -1194,8 +1218,11 @@ class BillingFrame(BaseFrame):
             MessageDialog.show_error("Error", "Please select an item to edit")
             return
 
-        index = self.cart_tree.index(selection[0])
-        item = self.cart_items[index]
+        key = self.cart_key(selection[0])
+        item = self.cart.get(key)
+        if item is None:
+            MessageDialog.show_error("Error", "This item is no longer in the cart")
+            return
 
         # Create edit dialog
         dialog = ctk.CTkToplevel(self)
@@ -1242,18 +1269,22 @@ class BillingFrame(BaseFrame):
                 MessageDialog.show_error("Error", "Please enter a valid quantity (positive integer)")
                 return
             new_qty = int(qty_str)
+            if key not in self.cart:
+                MessageDialog.show_error("Error", "This item is no longer in the cart")
+                close_dialog()
+                return
 
-            # Check stock for frames
+            # Check frames against current catalog stock
+            stock = None
             if item['type'] == 'Frame':
                 frame_data = self.db_manager.get_photo_frame_by_id(item['id'])
-                if frame_data and frame_data.get('quantity', 0) < new_qty:
-                    MessageDialog.show_error("Error", f"Insufficient stock. Available: {frame_data.get('quantity', 0)}")
-                    return
+                stock = frame_data.get('quantity', 0) if frame_data else 0
 
             # Update quantity and total
-            item['quantity'] = new_qty
-            item['total'] = item['unit_price'] * new_qty
-            self.refresh_cart()
+            if not self.cart.set_quantity(key, new_qty, stock):
+                MessageDialog.show_error("Error", f"Insufficient stock. Available: {stock}")
+                return
+            self.show_cart_line(key)
             self.calculate_totals()
             close_dialog()
 
@@ -1286,9 +1317,9 @@ class BillingFrame(BaseFrame):
 
     def clear_cart(self):
         """Clear all items from cart"""
-        if not self.cart_items:
+        if not self.cart:
             return
-        self.cart_items = []
+        self.cart.clear()
         self.refresh_cart()
         self.calculate_totals()
 
@@ -1340,10 +1371,8 @@ class BillingFrame(BaseFrame):
         btn_frame.pack(pady=10)
 
         def confirm_remove():
-            index = self.cart_tree.index(item_id)
-            if 0 <= index < len(self.cart_items):
-                self.cart_items.pop(index)
-                self.refresh_cart()
+            if self.cart.remove(self.cart_key(item_id)) is not None:
+                self.cart_tree.delete(item_id)
                 self.calculate_totals()
             close_dialog()
 
@@ -1386,43 +1415,60 @@ class BillingFrame(BaseFrame):
 
         self.calculate_balance()
 
+    @staticmethod
+    def cart_row_id(key):
+        """Treeview row id for a cart key"""
+        return f"{key[0]}:{key[1]}"
+
+    @staticmethod
+    def cart_key(row_id):
+        """Cart key for a Treeview row id"""
+        item_type, item_id = row_id.split(":", 1)
+        return item_type, int(item_id)
+
+    def show_cart_line(self, key):
+        """Insert or update the Treeview row for one cart line"""
+        item = self.cart.get(key)
+        row_id = self.cart_row_id(key)
+        values = (
+            item['name'],
+            item['type'],
+            item['quantity'],
+            f"{item['unit_price']:.2f}",
+            f"{item['total']:.2f}"
+        )
+        if self.cart_tree.exists(row_id):
+            self.cart_tree.item(row_id, values=values)
+        else:
+            self.cart_tree.insert("", "end", iid=row_id, values=values)
+
     def refresh_cart(self):
-        """Refresh cart display"""
+        """Rebuild the whole cart display (after the cart is cleared)"""
         for item in self.cart_tree.get_children():
             self.cart_tree.delete(item)
 
-        for item in self.cart_items:
-            self.cart_tree.insert("", "end", values=(
-                item['name'],
-                item['type'],
-                item['quantity'],
-                f"{item['unit_price']:.2f}",
-                f"{item['total']:.2f}"
-            ))
+        for item in self.cart:
+            self.show_cart_line((item['type'], item['id']))
 
     def calculate_totals(self):
         """Calculate totals including category service cost"""
-        subtotal = sum(item['total'] for item in self.cart_items)
+        subtotal = self.cart.subtotal
 
         discount_str = self.discount_entry.get().strip()
         discount = float(discount_str) if discount_str and self.validate_number(discount_str, True) else 0
 
-        service_cost = 0
-        if self.category_service_cost > 0 and any(item['type'] == 'Service' for item in self.cart_items):
-            service_cost = self.category_service_cost
-
-        total = max(0, subtotal + service_cost - discount)
+        service_cost = self.cart.service_charge(self.category_service_cost)
+        self.cart_total = self.cart.total(self.category_service_cost, discount)
 
         self.subtotal_label.configure(text=f"LKR {subtotal:.2f}")
         self.service_cost_label.configure(text=f"LKR {service_cost:.2f}")
-        self.total_label.configure(text=f"LKR {total:.2f}")
+        self.total_label.configure(text=f"LKR {self.cart_total:.2f}")
 
         self.calculate_balance()
 
     def calculate_balance(self):
         """Calculate remaining balance based on payment type"""
-        total_str = self.total_label.cget("text").replace("LKR ", "").replace(",", "")
-        total = float(total_str) if total_str else 0
+        total = self.cart_total
 
         if self.payment_type == "full":
             # Full payment - no balance remaining
@@ -1464,19 +1510,14 @@ class BillingFrame(BaseFrame):
                 return
 
         # Validate cart has items
-        if not self.cart_items:
+        if not self.cart:
             MessageDialog.show_error("Error", "Please add items to cart")
             return
 
-        # Calculate totals
-        subtotal = sum(item['total'] for item in self.cart_items)
+        # Subtotal and total are computed by checkout_bill from the cart
         discount = float(self.discount_entry.get() or 0)
 
-        service_charge = 0
-        if self.category_service_cost > 0 and any(item['type'] == 'Service' for item in self.cart_items):
-            service_charge = self.category_service_cost
-
-        total = max(0, subtotal + service_charge - discount)
+        service_charge = self.cart.service_charge(self.category_service_cost)
 
         # Get cash given (optional, for display only)
         cash_given_str = self.paid_entry.get().strip()
@@ -1493,8 +1534,6 @@ class BillingFrame(BaseFrame):
             MessageDialog.show_error("Error", "Bills do not support advance payment. Use full payment or create a booking for advance payments.")
             return
 
-        bill_number = self.db_manager.generate_bill_number()
-
         if self.is_guest_customer:
             customer_id = None
             guest_name = self.guest_customer_name
@@ -1502,62 +1541,24 @@ class BillingFrame(BaseFrame):
             customer_id = self.selected_customer['id']
             guest_name = None
 
-        # Create bill in database
-        bill_id = self.db_manager.create_bill(
-            bill_number,
+        # Save bill, items and stock changes in a single transaction
+        bill_data = self.db_manager.checkout_bill(
+            self.cart.lines(),
             customer_id,
-            subtotal,
             discount,
-            total,
             self.auth_manager.get_user_id(),
-            service_charge,
-            cash_given,
-            guest_name
+            service_charge=service_charge,
+            cash_given=cash_given,
+            guest_name=guest_name,
+            service_charge_name=self.selected_category_name
         )
 
-        if not bill_id:
-            MessageDialog.show_error("Error", "Failed to create bill")
+        if not bill_data:
+            MessageDialog.show_error("Error", "Failed to create bill. Please check frame stock and try again.")
             return
 
-        # Add items to bill
-        for item in self.cart_items:
-            buying_price = 0
-            if item['type'] == 'Frame':
-                frame_data = self.db_manager.get_photo_frame_by_id(item['id'])
-                if frame_data:
-                    buying_price = frame_data.get('buying_price', 0) or 0
-
-            self.db_manager.add_bill_item(
-                bill_id,
-                item['type'],
-                item['id'],
-                item['name'],
-                item['quantity'],
-                item['unit_price'],
-                item['total'],
-                buying_price * item['quantity']
-            )
-
-            # Update frame stock
-            if item['type'] == 'Frame':
-                self.db_manager.update_frame_quantity(item['id'], -item['quantity'])
-
-        # Add service charge as separate item
-        if service_charge > 0 and self.selected_category_name:
-            self.db_manager.add_bill_item(
-                bill_id,
-                'CategoryService',
-                0,
-                f"Service Charge - {self.selected_category_name}",
-                1,
-                service_charge,
-                service_charge,
-                0
-            )
-
-        # Generate PDF bill
-        bill_data = self.db_manager.get_bill_by_id(bill_id)
-        items_data = self.db_manager.get_bill_items(bill_id)
+        bill_number = bill_data['bill_number']
+        items_data = bill_data['items']
 
         if self.is_guest_customer:
             customer_data = {
@@ -1592,7 +1593,7 @@ class BillingFrame(BaseFrame):
         self.selected_customer = None
         self.is_guest_customer = False
         self.guest_customer_name = ""
-        self.cart_items = []
+        self.cart.clear()
         self.category_service_cost = 0
         self.selected_category_name = None
         self.selected_category_id = None
@@ -1,24 +1,41 @@
 import customtkinter as ctk
 from tkinter import ttk
 from tkcalendar import DateEntry
-from ui.components import BaseFrame, MessageDialog, Toast
+from ui.components import BaseFrame, MessageDialog, Toast, KeyedTable, PagedTableLoader
 from datetime import datetime
-from services.invoice_generator import InvoiceGenerator
+from functools import cached_property
 
 
 class BookingManagementFrame(BaseFrame):
     """Booking and photoshoot management interface"""
     
+    STATUS_TAGS = {'Completed': 'completed', 'Cancelled': 'cancelled', 'Pending': 'pending'}
+    
     def __init__(self, parent, auth_manager, db_manager):
         super().__init__(parent, auth_manager, db_manager)
         self.selected_booking_id = None
         self.categories_map = {}  # name -> id mapping
         self.services_map = {}  # name -> service data
-        self.invoice_generator = InvoiceGenerator()
+        self._catalog_version = None  # catalog version the maps were built from
         self.create_widgets()
-        self.load_categories()
+        self.refresh_catalog()
         self.load_bookings()
     
+    @cached_property
+    def invoice_generator(self):
+        """Invoice generator; built on first use, which is when ReportLab gets imported"""
+        from services.invoice_generator import InvoiceGenerator
+        return InvoiceGenerator()
+    
+    def reload(self):
+        """Refresh the list when shown again, keeping any search or status filter;
+        categories and services are rebuilt only if the catalog changed"""
+        self.refresh_catalog()
+        if self.search_entry.get().strip():
+            self.search_controller.search_now()
+        else:
+            self.filter_by_status(self.filter_status.get())
+    
     def create_widgets(self):
         """Create booking management widgets"""
         
@@ -434,7 +451,24 @@ class BookingManagementFrame(BaseFrame):
         self.tree.tag_configure('cancelled', background='#3a1e1e', foreground='#ff6b6b')
         
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        # Rows load a page at a time as the user scrolls
+        self.table_loader = PagedTableLoader(
+            KeyedTable(self.tree, self.booking_row_values, self.booking_row_tag), scrollbar,
+            on_count=lambda count: self.record_count_label.configure(text=f"{count} records"),
+            runner=self.run_in_background,
+            fill=self.fill_table
+        )
+        self.search_controller = self.create_search(
+            self.search_entry,
+            self.db_manager.search_bookings,
+            self.table_loader.show_rows,
+            on_empty=self.load_bookings,
+            match_fields=('customer_name', 'mobile_number', 'photoshoot_category'),
+            # Ranked full-text results cannot be narrowed in memory
+            narrow_max_length=self.db_manager.FTS_MIN_TERM_LENGTH - 1,
+            on_start=self.table_loader.stop
+        )
         
         self.tree.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
         scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
@@ -448,6 +482,19 @@ class BookingManagementFrame(BaseFrame):
         category_names = ["Select Category"] + list(self.categories_map.keys())
         self.category_combo.configure(values=category_names)
     
+    def refresh_catalog(self):
+        """Rebuild the category and service dropdowns if the catalog changed since they were built"""
+        version = self.db_manager.get_catalog_version()
+        if version == self._catalog_version:
+            return
+        self._catalog_version = version
+        self.load_categories()
+        category_id = self.categories_map.get(self.category_combo.get())
+        if category_id:
+            services = self.db_manager.get_services_by_category(category_id)
+            self.services_map = {s['service_name']: s for s in services}
+            self.service_combo.configure(values=["Select Service"] + list(self.services_map.keys()))
+    
     def on_category_change(self, selected_category):
         """Load services when category changes"""
         if selected_category == "Select Category":
@@ -664,52 +711,31 @@ class BookingManagementFrame(BaseFrame):
         def generate_invoice():
             """Generate and show invoice"""
             try:
-                # Get current user's name
-                current_user = self.auth_manager.get_current_user()
-                created_by_name = current_user.get('full_name', 'Staff') if current_user else 'Staff'
                 user_id = self.auth_manager.get_user_id()
                 
-                # Generate the invoice PDF
-                filepath = self.invoice_generator.generate_booking_invoice(booking_data, created_by_name)
-                self.generated_invoice_path = filepath
-                
-                # Extract invoice number from filename (Booking_BK-YYYYMMDDHHMMSS.pdf)
-                import os
-                filename = os.path.basename(filepath)
-                invoice_number = filename.replace('Booking_', '').replace('.pdf', '')
-                
-                # Save invoice to database
                 full_amount = float(booking_data['full_amount'])
-                advance_payment = float(booking_data['advance_payment'])
-                balance = full_amount - advance_payment
                 
-                invoice_id = self.db_manager.create_invoice(
-                    invoice_number=invoice_number,
-                    customer_id=None,  # Guest booking
-                    subtotal=full_amount,
-                    discount=0,
-                    total_amount=full_amount,
-                    paid_amount=advance_payment,
-                    balance_amount=balance,
-                    created_by=user_id,
-                    category_service_cost=0,
-                    advance_payment=advance_payment,
-                    guest_name=booking_data['customer_name'],
-                    booking_id=booking_data.get('id')
+                # Save invoice and its line (which refers to the booking) in one transaction first
+                invoice = self.db_manager.create_booking_invoice(
+                    booking_data,
+                    [{
+                        'item_type': 'BookingService',
+                        'item_id': booking_data['id'],
+                        'item_name': booking_data['photoshoot_category'],
+                        'quantity': 1,
+                        'unit_price': full_amount,
+                        'total_price': full_amount,
+                        'buying_price': 0
+                    }],
+                    user_id
                 )
+                if not invoice:
+                    Toast.error(self, "Failed to save invoice")
+                    return
                 
-                # Add invoice item (the service)
-                if invoice_id:
-                    self.db_manager.add_invoice_item(
-                        invoice_id=invoice_id,
-                        item_type='BookingService',
-                        item_id=booking_data.get('id', 0),
-                        item_name=booking_data['photoshoot_category'],
-                        quantity=1,
-                        unit_price=full_amount,
-                        total_price=full_amount,
-                        buying_price=0
-                    )
+                # Render the PDF from the committed invoice
+                filepath = self.invoice_generator.generate_booking_invoice(invoice)
+                self.generated_invoice_path = filepath
                 
                 # Show invoice preview popup
                 popup.destroy()
@@ -1001,147 +1027,56 @@ class BookingManagementFrame(BaseFrame):
         self.add_btn.configure(state="normal")
         self.update_btn.configure(state="disabled")
         self.delete_btn.configure(state="disabled")
-        # Reload categories in case new ones were added
-        self.load_categories()
+        # Pick up categories added since the dropdown was built
+        self.refresh_catalog()
     
-    def load_bookings(self):
-        """Load all bookings"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        bookings = self.db_manager.get_all_bookings()
-        
-        for i, booking in enumerate(bookings):
-            status = booking['status']
-            if status == 'Completed':
-                tag = 'completed'
-            elif status == 'Cancelled':
-                tag = 'cancelled'
-            elif status == 'Pending':
-                tag = 'pending'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            # Split photoshoot_category into category and service
-            photoshoot_cat = booking['photoshoot_category']
-            if ' - ' in photoshoot_cat:
-                parts = photoshoot_cat.split(' - ', 1)
-                category = parts[0]
-                service = parts[1] if len(parts) > 1 else ''
-            else:
-                category = photoshoot_cat
-                service = ''
-            
-            self.tree.insert("", "end", values=(
-                booking['id'],
-                booking['customer_name'],
-                booking['mobile_number'],
-                category,
-                service,
-                f"{booking['full_amount']:.2f}",
-                booking['booking_date'],
-                booking['status']
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(bookings)} records")
+    def load_bookings(self, status=None):
+        """Load bookings (optionally only one status), one page at a time"""
+        def fetch_page(last, page_size):
+            return self.db_manager.get_all_bookings(
+                page_size=page_size, status=status,
+                after_booking_date=last['booking_date'] if last else None,
+                after_created_at=last['created_at'] if last else None,
+                after_id=last['id'] if last else None
+            )
+        self.table_loader.reset(fetch_page)
     
     def search_bookings(self):
         """Search bookings"""
-        search_term = self.search_entry.get().strip()
-        
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if not search_term:
-            self.load_bookings()
-            return
-        
-        bookings = self.db_manager.search_bookings(search_term)
-        
-        for i, booking in enumerate(bookings):
-            status = booking['status']
-            if status == 'Completed':
-                tag = 'completed'
-            elif status == 'Cancelled':
-                tag = 'cancelled'
-            elif status == 'Pending':
-                tag = 'pending'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            # Split photoshoot_category into category and service
-            photoshoot_cat = booking['photoshoot_category']
-            if ' - ' in photoshoot_cat:
-                parts = photoshoot_cat.split(' - ', 1)
-                category = parts[0]
-                service = parts[1] if len(parts) > 1 else ''
-            else:
-                category = photoshoot_cat
-                service = ''
-            
-            self.tree.insert("", "end", values=(
-                booking['id'],
-                booking['customer_name'],
-                booking['mobile_number'],
-                category,
-                service,
-                f"{booking['full_amount']:.2f}",
-                booking['booking_date'],
-                booking['status']
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(bookings)} records")
+        # Debounced: runs once typing pauses, narrowing earlier results where it can
+        self.search_controller.schedule()
     
     def filter_by_status(self, status):
         """Filter bookings by status"""
         self.filter_status.set(status)
+        self.load_bookings(None if status == "All" else status)
+    
+    def booking_row_tag(self, booking):
+        """Color bookings by status (other statuses get alternating colors)"""
+        return self.STATUS_TAGS.get(booking['status'])
+    
+    def booking_row_values(self, booking):
+        """Table values for one booking"""
+        # Split photoshoot_category into category and service
+        photoshoot_cat = booking['photoshoot_category']
+        if ' - ' in photoshoot_cat:
+            parts = photoshoot_cat.split(' - ', 1)
+            category = parts[0]
+            service = parts[1] if len(parts) > 1 else ''
+        else:
+            category = photoshoot_cat
+            service = ''
         
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Get all bookings
-        bookings = self.db_manager.get_all_bookings()
-        
-        # Filter by status
-        if status != "All":
-            bookings = [b for b in bookings if b['status'] == status]
-        
-        for i, booking in enumerate(bookings):
-            booking_status = booking['status']
-            if booking_status == 'Completed':
-                tag = 'completed'
-            elif booking_status == 'Cancelled':
-                tag = 'cancelled'
-            elif booking_status == 'Pending':
-                tag = 'pending'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            # Split photoshoot_category into category and service
-            photoshoot_cat = booking['photoshoot_category']
-            if ' - ' in photoshoot_cat:
-                parts = photoshoot_cat.split(' - ', 1)
-                category = parts[0]
-                service = parts[1] if len(parts) > 1 else ''
-            else:
-                category = photoshoot_cat
-                service = ''
-            
-            self.tree.insert("", "end", values=(
-                booking['id'],
-                booking['customer_name'],
-                booking['mobile_number'],
-                category,
-                service,
-                f"{booking['full_amount']:.2f}",
-                booking['booking_date'],
-                booking['status']
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(bookings)} records")
+        return (
+            booking['id'],
+            booking['customer_name'],
+            booking['mobile_number'],
+            category,
+            service,
+            f"{booking['full_amount']:.2f}",
+            booking['booking_date'],
+            booking['status']
+        )
     
     def on_select(self, event):
         """Handle row selection"""
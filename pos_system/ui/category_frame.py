@@ -1,6 +1,6 @@
 import customtkinter as ctk
 from tkinter import ttk
-from ui.components import BaseFrame, MessageDialog
+from ui.components import BaseFrame, MessageDialog, KeyedTable
 
 
 class CategoryManagementFrame(BaseFrame):
@@ -10,8 +10,19 @@ class CategoryManagementFrame(BaseFrame):
         super().__init__(parent, auth_manager, db_manager)
         self.selected_category_id = None
         self.create_widgets()
+        self.search_controller = self.create_search(
+            self.search_entry,
+            self.db_manager.search_categories,
+            self.show_categories,
+            on_empty=self.load_categories,
+            match_fields=('category_name',)
+        )
         self.load_categories()
     
+    def reload(self):
+        """Refresh the list when shown again, keeping any search term"""
+        self.search_controller.search_now()
+    
     def create_widgets(self):
         """Create category management widgets"""
         
@@ -220,6 +231,8 @@ class CategoryManagementFrame(BaseFrame):
         # Configure row tags
         self.tree.tag_configure('oddrow', background='#1e1e3f', foreground='#e0e0e0')
         self.tree.tag_configure('evenrow', background='#252545', foreground='#e0e0e0')
+        # Refreshes change only the rows that differ
+        self.table = KeyedTable(self.tree, self.category_row_values)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.tree.yview)
@@ -352,54 +365,29 @@ class CategoryManagementFrame(BaseFrame):
     
     def load_categories(self):
         """Load all categories"""
-        # Clear table
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        categories = self.db_manager.get_all_categories()
-        
-        for i, category in enumerate(categories):
-            service_cost = category.get('service_cost')
-            cost_display = f"{service_cost:.2f}" if service_cost is not None else "-"
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
-                category['id'],
-                category['category_name'],
-                cost_display,
-                category['created_at']
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(categories)} records")
+        self.show_categories(self.db_manager.get_all_categories())
     
     def search_categories(self):
         """Search categories by name"""
-        search_term = self.search_entry.get().strip().lower()
-        
-        # Clear table
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        categories = self.db_manager.get_all_categories()
-        
-        filtered = []
-        for category in categories:
-            if not search_term or search_term in category['category_name'].lower():
-                filtered.append(category)
-        
-        for i, category in enumerate(filtered):
-            service_cost = category.get('service_cost')
-            cost_display = f"{service_cost:.2f}" if service_cost is not None else "-"
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
-                category['id'],
-                category['category_name'],
-                cost_display,
-                category['created_at']
-            ), tags=(tag,))
+        # Debounced: runs once typing pauses, narrowing earlier results where it can
+        self.search_controller.schedule()
+    
+    def show_categories(self, categories):
+        """Replace the table contents with categories"""
+        self.fill_table(self.table, categories)
         
         # Update record count
-        self.record_count_label.configure(text=f"{len(filtered)} records")
+        self.record_count_label.configure(text=f"{len(categories)} records")
+    
+    def category_row_values(self, category):
+        """Table values for one category"""
+        service_cost = category.get('service_cost')
+        return (
+            category['id'],
+            category['category_name'],
+            f"{service_cost:.2f}" if service_cost is not None else "-",
+            category['created_at']
+        )
     
     def on_select(self, event):
         """Handle row selection"""
@@ -1,8 +1,13 @@
 import customtkinter as ctk
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 from PIL import Image
 import os
 import random
+import string
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from services.background_executor import BackgroundExecutor, BackgroundTask
 
 
 class ModernToast(ctk.CTkToplevel):
@@ -541,13 +546,109 @@ class MessageDialog:
         return False
 
 
+class TkDispatcher:
+    """Delivers BackgroundExecutor results on the Tk thread.
+    Tk is not thread-safe, so workers only queue results; this polls the queue
+    with after() while tasks are pending and stops once they are all delivered."""
+    
+    POLL_MS = 30
+    
+    def __init__(self, root, executor: BackgroundExecutor):
+        self.root = root
+        self.executor = executor
+        self._polling = False
+    
+    @classmethod
+    def for_widget(cls, widget, executor: BackgroundExecutor) -> 'TkDispatcher':
+        """Get the dispatcher for a widget's root window, creating it on first use"""
+        root = widget.winfo_toplevel()
+        dispatcher = getattr(root, '_background_dispatcher', None)
+        if dispatcher is None:
+            dispatcher = cls(root, executor)
+            root._background_dispatcher = dispatcher
+        return dispatcher
+    
+    def wake(self):
+        """Start polling if it is not already running"""
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+    
+    def _poll(self):
+        self.executor.dispatch_completed()
+        if self.executor.has_pending():
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+
 class BaseFrame(ctk.CTkFrame):
     """Base frame with common functionality"""
     
+    # Rows a table fill inserts per Tk callback
+    TABLE_CHUNK_SIZE = 200
+    
     def __init__(self, parent, auth_manager, db_manager):
         super().__init__(parent, fg_color="transparent")
         self.auth_manager = auth_manager
         self.db_manager = db_manager
+        self.executor = BackgroundExecutor.shared()
+        self._hidden_generation = None
+        self._interrupted = False
+        self._searches = []
+        self._table_fills = {}
+    
+    def on_hide(self):
+        """Called by FrameCache when navigation moves away from this frame.
+        Stops the frame's background queries, pending searches and table fills,
+        the same as destroy() would"""
+        interrupted = self.executor.cancel_owner(self) > 0
+        for search in self._searches:
+            interrupted = search.cancel() or interrupted
+        for table in list(self._table_fills):
+            self.cancel_table_fill(table)
+            interrupted = True
+        self._interrupted = interrupted
+        self._hidden_generation = self.db_manager.get_write_generation(self.db_manager.db_path)
+    
+    def on_show(self):
+        """Called by FrameCache when this cached frame is shown again; reloads
+        its data if something was written while it was hidden, or if hiding
+        cut a load short"""
+        if self._interrupted or self._hidden_generation != self.db_manager.get_write_generation(self.db_manager.db_path):
+            self._interrupted = False
+            self.reload()
+    
+    def reload(self):
+        """Re-read the data this frame displays (override in subclasses)"""
+        pass
+    
+    def run_in_background(self, task: Callable, on_done: Optional[Callable] = None, key=None,
+                          on_error: Optional[Callable] = None) -> BackgroundTask:
+        """Run task() (e.g. a db_manager query) off the Tk thread, then on_done(result) on it.
+        A newer call with the same key supersedes an unfinished one; everything
+        still pending is cancelled when the frame is destroyed."""
+        handle = self.executor.submit(task, on_done, on_error, owner=self, key=key)
+        TkDispatcher.for_widget(self, self.executor).wake()
+        return handle
+    
+    def create_search(self, entry, search: Callable, on_results: Callable, **options) -> 'DebouncedSearch':
+        """Create a DebouncedSearch for an entry that queries in the background and
+        reuses earlier results until the next database write"""
+        options.setdefault('runner', self.run_in_background)
+        options.setdefault('data_version', lambda: self.db_manager.get_write_generation(self.db_manager.db_path))
+        search_controller = DebouncedSearch(self, lambda: entry.get().strip(), search, on_results, **options)
+        self._searches.append(search_controller)
+        return search_controller
+    
+    def destroy(self):
+        """Cancel this frame's background work before its widgets go away"""
+        self.executor.cancel_owner(self)
+        for search in self._searches:
+            search.cancel()
+        for table in list(self._table_fills):
+            self.cancel_table_fill(table)
+        super().destroy()
         
     def validate_number(self, value: str, allow_decimal: bool = False) -> bool:
         """Validate if value is a number"""
@@ -639,3 +740,547 @@ class BaseFrame(ctk.CTkFrame):
         for i, item in enumerate(tree.get_children()):
             tag = 'evenrow' if i % 2 == 0 else 'oddrow'
             tree.item(item, tags=(tag,))
+    
+    def fill_table(self, table: 'KeyedTable', rows, on_done: Optional[Callable] = None):
+        """Show rows in a KeyedTable without freezing the window.
+        The first TABLE_CHUNK_SIZE rows are applied at once; the rest follow a chunk
+        per after() callback, with a progress bar along the bottom of the table.
+        A newer fill of the same table cancels an unfinished one, and so does
+        destroying the frame; on_done() runs only when a fill completes."""
+        self.cancel_table_fill(table)
+        fill = {'steps': table.updates(rows, self.TABLE_CHUNK_SIZE), 'after_id': None, 'progress': None}
+        self._table_fills[table] = fill
+        
+        def next_chunk():
+            fill['after_id'] = None
+            try:
+                done, total = next(fill['steps'])
+            except StopIteration:
+                self._end_table_fill(table)
+                if on_done:
+                    on_done()
+                return
+            if fill['progress'] is None:
+                fill['progress'] = ctk.CTkProgressBar(self, height=4, progress_color="#00d4ff")
+                fill['progress'].place(in_=table.tree, relx=0, rely=1, relwidth=1, anchor="sw")
+            fill['progress'].set(done / total)
+            fill['after_id'] = self.after(1, next_chunk)
+        
+        next_chunk()
+    
+    def cancel_table_fill(self, table: 'KeyedTable'):
+        """Stop an unfinished fill_table, leaving the table consistent"""
+        fill = self._table_fills.get(table)
+        if fill is not None:
+            fill['steps'].close()
+            self._end_table_fill(table)
+    
+    def _end_table_fill(self, table: 'KeyedTable'):
+        """Forget a table's fill and remove its pending callback and progress bar"""
+        fill = self._table_fills.pop(table, None)
+        if fill is None:
+            return
+        if fill['after_id'] is not None:
+            self.after_cancel(fill['after_id'])
+        if fill['progress'] is not None:
+            fill['progress'].destroy()
+
+
+class KeyedTable:
+    """Keeps a Treeview in step with a list of rows without rebuilding it.
+    
+    Each row's Treeview item id comes from key(row) (the row's id by default).
+    set_rows() compares the new rows with the ones shown and applies only the
+    inserts, deletes, moves and value changes needed, so selection and scroll
+    position survive a refresh. Rows get row_tag(row) if that returns a tag,
+    otherwise the alternating evenrow/oddrow colors (no tag if striped is False).
+    """
+    
+    def __init__(self, tree, row_values: Callable[[Any], tuple],
+                 row_tag: Optional[Callable[[Any], Optional[str]]] = None,
+                 key: Optional[Callable[[Any], Any]] = None, striped: bool = True):
+        self.tree = tree
+        self.row_values = row_values
+        self.row_tag = row_tag
+        self.striped = striped
+        self.key = key or (lambda row: row['id'])
+        self._order = []
+        self._values = {}
+        self._tags = {}
+    
+    def __len__(self) -> int:
+        return len(self._order)
+    
+    def set_rows(self, rows):
+        """Show exactly rows, in order, changing only what differs from the table"""
+        for _ in self.updates(rows):
+            pass
+    
+    def updates(self, rows, chunk_size: Optional[int] = None):
+        """set_rows as a generator that yields (rows done, total) after every
+        chunk_size rows, so the caller can spread the work over Tk callbacks.
+        Closed early, it leaves the table consistent: the rows placed so far,
+        followed by the unchanged rows it had not reached."""
+        tree = self.tree
+        new_ids = self._item_ids(rows)
+        new_index = {iid: i for i, iid in enumerate(new_ids)}
+        old_index = {iid: i for i, iid in enumerate(self._order)}
+        selection = tree.selection()
+        top = self._top_item()
+        
+        gone = [iid for iid in self._order if iid not in new_index]
+        if gone:
+            tree.delete(*gone)
+            for iid in gone:
+                del self._values[iid], self._tags[iid]
+        
+        # Rows already in the right relative order stay put; the rest are
+        # detached and put back at their new position
+        kept = [iid for iid in new_ids if iid in old_index]
+        in_place = self._in_order(kept, old_index)
+        moved = [iid for iid in kept if iid not in in_place]
+        if moved:
+            tree.detach(*moved)
+        
+        # Once no row that stays put is left below, new rows can go at the end
+        last_in_place = max((new_index[iid] for iid in in_place), default=-1)
+        done = 0
+        try:
+            for i, (iid, row) in enumerate(zip(new_ids, rows)):
+                values = tuple(self.row_values(row))
+                tags = self._tags_for(row, i)
+                position = i if i <= last_in_place else "end"
+                if iid not in old_index:
+                    tree.insert("", position, iid=iid, values=values, tags=tags)
+                else:
+                    if iid not in in_place:
+                        tree.move(iid, "", position)
+                    if values != self._values[iid] or tags != self._tags[iid]:
+                        tree.item(iid, values=values, tags=tags)
+                self._values[iid] = values
+                self._tags[iid] = tags
+                done = i + 1
+                if chunk_size and done % chunk_size == 0 and done < len(new_ids):
+                    yield done, len(new_ids)
+        finally:
+            if done < len(new_ids):
+                # Stopped early: drop the detached rows not put back yet
+                remaining = new_ids[done:]
+                unplaced = [iid for iid in remaining if iid in old_index and iid not in in_place]
+                if unplaced:
+                    tree.delete(*unplaced)
+                    for iid in unplaced:
+                        del self._values[iid], self._tags[iid]
+                new_ids = new_ids[:done] + [iid for iid in remaining if iid in in_place]
+                new_index = {iid: i for i, iid in enumerate(new_ids)}
+            self._order = new_ids
+            
+            # Detaching deselects, so put back the selected rows that are still shown
+            still_selected = [iid for iid in selection if iid in new_index]
+            if list(tree.selection()) != still_selected:
+                tree.selection_set(still_selected)
+            if top is not None and top in new_index:
+                tree.yview_moveto(new_index[top] / len(new_ids))
+    
+    def append_rows(self, rows):
+        """Add rows after the ones shown (e.g. the next page)"""
+        for iid, row in zip(self._item_ids(rows, len(self._order)), rows):
+            values = tuple(self.row_values(row))
+            tags = self._tags_for(row, len(self._order))
+            self.tree.insert("", "end", iid=iid, values=values, tags=tags)
+            self._order.append(iid)
+            self._values[iid] = values
+            self._tags[iid] = tags
+    
+    def clear(self):
+        """Remove all rows"""
+        if self._order:
+            self.tree.delete(*self._order)
+        self._order = []
+        self._values.clear()
+        self._tags.clear()
+    
+    def _item_ids(self, rows, start: int = 0) -> list:
+        """Treeview item ids for rows; a repeated key gets a numbered suffix"""
+        ids = []
+        seen = set(self._order) if start else set()
+        for row in rows:
+            iid = base = str(self.key(row))
+            n = 1
+            while iid in seen:
+                n += 1
+                iid = f"{base}#{n}"
+            seen.add(iid)
+            ids.append(iid)
+        return ids
+    
+    def _tags_for(self, row, index: int) -> tuple:
+        """The row's own tag, or the alternating color for its position if striped"""
+        tag = self.row_tag(row) if self.row_tag else None
+        if not tag and self.striped:
+            tag = 'evenrow' if index % 2 == 0 else 'oddrow'
+        return (tag,) if tag else ()
+    
+    def _top_item(self):
+        """Item id of the first visible row, or None when scrolled to the top"""
+        first = self.tree.yview()[0]
+        if first <= 0 or not self._order:
+            return None
+        return self._order[min(int(round(first * len(self._order))), len(self._order) - 1)]
+    
+    @staticmethod
+    def _in_order(ids: list, old_index: dict) -> set:
+        """Largest set of ids whose old positions already increase
+        (longest increasing subsequence); these need no move"""
+        tails, tail_ids, previous = [], [], {}
+        for iid in ids:
+            position = old_index[iid]
+            k = bisect_left(tails, position)
+            previous[iid] = tail_ids[k - 1] if k else None
+            if k == len(tails):
+                tails.append(position)
+                tail_ids.append(iid)
+            else:
+                tails[k] = position
+                tail_ids[k] = iid
+        keep = set()
+        iid = tail_ids[-1] if tail_ids else None
+        while iid is not None:
+            keep.add(iid)
+            iid = previous[iid]
+        return keep
+
+
+class PagedTableLoader:
+    """Fills a KeyedTable one page at a time, fetching the next page as the user scrolls near the bottom"""
+    
+    def __init__(self, table: KeyedTable, scrollbar, page_size: int = 100,
+                 on_count: Optional[Callable] = None, runner: Optional[Callable] = None,
+                 fill: Optional[Callable] = None):
+        self.table = table
+        self.tree = table.tree
+        self.scrollbar = scrollbar
+        self.page_size = page_size
+        self.on_count = on_count
+        # runner(task, on_done, key=...) fetches pages off the Tk thread, e.g. BaseFrame.run_in_background
+        self.runner = runner
+        # fill(table, rows, on_done) shows a replacement row set, e.g. BaseFrame.fill_table
+        self.fill = fill
+        self._generation = 0
+        self.fetch_page = None
+        self.last_row = None
+        self.has_more = False
+        self._loading = False
+        self._replace = False
+        
+        # Watch scroll position to know when the last rows come into view
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+    
+    @property
+    def row_count(self) -> int:
+        return len(self.table)
+    
+    def reset(self, fetch_page: Callable):
+        """Load the first page in place of the rows shown.
+        fetch_page(last_row, page_size) returns the rows after last_row (None for the first page).
+        The first fetch covers as many rows as are loaded now, so refreshing a long
+        list after an edit keeps the user's place and changes only the edited rows."""
+        self.fetch_page = fetch_page
+        self.last_row = None
+        self.has_more = True
+        self._loading = False
+        self._replace = True
+        self._generation += 1
+        self.load_more(max(self.page_size, self.row_count))
+    
+    def stop(self):
+        """Stop paging and ignore any page still in flight, e.g. while a search is pending"""
+        self.has_more = False
+        self._loading = False
+        self._replace = False
+        self._generation += 1
+    
+    def show_rows(self, rows):
+        """Show a fixed list of rows (e.g. search results) without paging"""
+        self.fetch_page = None
+        self.last_row = None
+        self.has_more = False
+        self._loading = False
+        self._replace = False
+        self._generation += 1
+        if self.fill:
+            self.fill(self.table, rows, self._update_count)
+            return
+        self.table.set_rows(rows)
+        self._update_count()
+    
+    def load_more(self, size: Optional[int] = None):
+        """Fetch and append the next page"""
+        if self._loading or not self.has_more or not self.fetch_page:
+            return
+        self._loading = True
+        size = size or self.page_size
+        fetch_page, last_row = self.fetch_page, self.last_row
+        if self.runner:
+            # Keyed on the loader, so a reset supersedes a page still in flight; a page
+            # that arrives after stop() or show_rows() is dropped by the generation check
+            generation = self._generation
+            
+            def current(handler):
+                return lambda result: handler(result) if generation == self._generation else None
+            
+            self.runner(lambda: fetch_page(last_row, size),
+                        current(lambda rows: self._append_page(rows, size)),
+                        key=self, on_error=current(self._page_failed))
+            return
+        try:
+            rows = fetch_page(last_row, size)
+        except Exception as e:
+            self._page_failed(e)
+            return
+        self._append_page(rows, size)
+    
+    def _append_page(self, rows, size: int):
+        """Show a fetched page and record where the next one starts"""
+        if self._replace:
+            self._replace = False
+            if self.fill:
+                # A large first fetch is shown in chunks; paging resumes once it is in,
+                # unless a reset or search has replaced it by then
+                generation = self._generation
+                
+                def shown():
+                    if generation == self._generation:
+                        self._page_shown(rows, size)
+                
+                self.fill(self.table, rows, shown)
+                return
+            self.table.set_rows(rows)
+        else:
+            self.table.append_rows(rows)
+        self._page_shown(rows, size)
+    
+    def _page_shown(self, rows, size: int):
+        """Record where the next page starts once a page is in the table"""
+        if rows:
+            self.last_row = rows[-1]
+        self.has_more = len(rows) == size
+        self._loading = False
+        self._update_count()
+    
+    def _page_failed(self, error):
+        """Stop paging after a failed fetch"""
+        print(f"Load page error: {error}")
+        self.has_more = False
+        self._loading = False
+        self._update_count()
+    
+    def _update_count(self):
+        """Report the loaded row count (with a '+' while more pages remain)"""
+        if self.on_count:
+            self.on_count(f"{self.row_count}+" if self.has_more else str(self.row_count))
+    
+    def _on_yscroll(self, first, last):
+        """Forward to the scrollbar and load the next page once the bottom is near"""
+        self.scrollbar.set(first, last)
+        if self.has_more and not self._loading and float(last) >= 0.95:
+            self.tree.after_idle(self.load_more)
+
+
+class FrameCache:
+    """Keeps page frames alive between navigations and swaps them with pack_forget/pack.
+    
+    Shown again, a frame gets on_show() (if it has one) to refresh its data;
+    hidden, it gets on_hide(). Beyond capacity, the least recently shown frame
+    is destroyed; capacity 0 rebuilds every page, like destroy-and-rebuild.
+    """
+    
+    def __init__(self, container, capacity: int = 6):
+        self.container = container
+        self.capacity = capacity
+        self._frames = OrderedDict()
+        self.current = None
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.hit_time = 0.0
+        self.miss_time = 0.0
+    
+    def show(self, key, create: Callable[[], Any]):
+        """Show the frame for key, building it with create() if it is not cached"""
+        start = time.perf_counter()
+        if self.current is not None and self.current in self._frames:
+            previous = self._frames[self.current]
+            previous.pack_forget()
+            if hasattr(previous, 'on_hide'):
+                previous.on_hide()
+        
+        frame = self._frames.get(key)
+        if frame is not None and frame.winfo_exists():
+            self._frames.move_to_end(key)
+            frame.pack(fill="both", expand=True)
+            if hasattr(frame, 'on_show'):
+                frame.on_show()
+            self.hits += 1
+            self.hit_time += time.perf_counter() - start
+        else:
+            frame = create()
+            frame.pack(fill="both", expand=True)
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            self.misses += 1
+            self.miss_time += time.perf_counter() - start
+        self.current = key
+        self._evict()
+        return frame
+    
+    def clear(self):
+        """Destroy every cached frame"""
+        while self._frames:
+            _, frame = self._frames.popitem(last=False)
+            frame.destroy()
+        self.current = None
+    
+    def get_stats(self) -> dict:
+        """Get cache statistics (hits, misses, evictions, average show time in ms)"""
+        return {
+            'cached': len(self._frames),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'avg_hit_ms': self.hit_time * 1000 / self.hits if self.hits else 0.0,
+            'avg_miss_ms': self.miss_time * 1000 / self.misses if self.misses else 0.0,
+        }
+    
+    def _evict(self):
+        """Destroy least recently shown frames beyond capacity (never the current one)"""
+        while len(self._frames) > max(self.capacity, 1):
+            key, frame = next(iter(self._frames.items()))
+            if key == self.current:
+                break
+            del self._frames[key]
+            frame.destroy()
+            self.evictions += 1
+
+
+# SQLite's LIKE folds ASCII letters only, so in-memory filtering must do the same
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def like_contains(value, term: str) -> bool:
+    """Python equivalent of SQL `value LIKE '%term%'` for a term without wildcards"""
+    if value is None:
+        return False
+    return term.translate(_ASCII_LOWER) in str(value).translate(_ASCII_LOWER)
+
+
+class DebouncedSearch:
+    """Search-as-you-type that waits for typing to pause before querying.
+    
+    Keystrokes within delay_ms of each other collapse into one search, which
+    runs through runner (e.g. BaseFrame.run_in_background) so a newer search
+    supersedes one still in flight. search(term) must return every row whose
+    match_fields contain the term (LIKE '%term%'); when a new term contains the
+    previous one, the previous rows are filtered in memory instead of queried,
+    as long as data_version() reports no write since they were fetched.
+    Narrowing keeps the previous order, so for searches that rank their
+    results (the full-text searches), narrow_max_length limits it to terms
+    short enough to be answered by LIKE in name order.
+    on_start runs when a search is scheduled and again before it runs (e.g.
+    PagedTableLoader.stop, so no unfiltered page is appended under a search).
+    """
+    
+    def __init__(self, widget, get_term: Callable[[], str], search: Callable[[str], list],
+                 on_results: Callable[[list], None], on_empty: Optional[Callable[[], None]] = None,
+                 match_fields=(), min_length: int = 1, delay_ms: int = 250,
+                 runner: Optional[Callable] = None, key=None,
+                 data_version: Optional[Callable[[], Any]] = None,
+                 narrow_max_length: Optional[int] = None,
+                 on_start: Optional[Callable[[], None]] = None):
+        self.widget = widget
+        self.get_term = get_term
+        self.search = search
+        self.on_results = on_results
+        self.on_empty = on_empty
+        self.match_fields = match_fields
+        self.min_length = min_length
+        self.delay_ms = delay_ms
+        self.runner = runner
+        self.key = key if key is not None else self
+        self.data_version = data_version
+        self.narrow_max_length = narrow_max_length
+        self.on_start = on_start
+        self._after_id = None
+        self._generation = 0
+        self._last_term = None
+        self._last_rows = None
+        self._last_version = None
+    
+    def schedule(self, event=None):
+        """Restart the typing delay; the search runs once it elapses"""
+        if self._after_id:
+            self.widget.after_cancel(self._after_id)
+        if self.on_start:
+            self.on_start()
+        self._after_id = self.widget.after(self.delay_ms, self.search_now)
+    
+    def search_now(self):
+        """Search for the current term immediately"""
+        if self._after_id:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        
+        term = self.get_term()
+        # Results of anything still in flight are now stale
+        self._generation += 1
+        generation = self._generation
+        
+        if len(term) < self.min_length:
+            self._last_term = self._last_rows = None
+            if self.on_empty:
+                self.on_empty()
+            return
+        
+        if self.on_start:
+            self.on_start()
+        version = self.data_version() if self.data_version else None
+        if self._can_narrow(term, version):
+            rows = [row for row in self._last_rows
+                    if any(like_contains(row.get(field), term) for field in self.match_fields)]
+            self._deliver(generation, term, version, rows)
+            return
+        
+        if self.runner:
+            self.runner(lambda: self.search(term),
+                        lambda rows: self._deliver(generation, term, version, rows), key=self.key)
+        else:
+            self._deliver(generation, term, version, self.search(term))
+    
+    def cancel(self) -> bool:
+        """Drop a pending search and ignore any result still on its way.
+        Returns whether a typed search was still waiting to run."""
+        pending = self._after_id is not None
+        if pending:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._generation += 1
+        return pending
+    
+    def _can_narrow(self, term: str, version) -> bool:
+        """Check whether term can be answered by filtering the previous results"""
+        if not self.match_fields or self._last_rows is None or version != self._last_version:
+            return False
+        if '%' in term or '_' in term:
+            return False
+        if self.narrow_max_length is not None and len(term) > self.narrow_max_length:
+            return False
+        return self._last_term.translate(_ASCII_LOWER) in term.translate(_ASCII_LOWER)
+    
+    def _deliver(self, generation: int, term: str, version, rows: list):
+        """Show rows unless a newer search has started since they were requested"""
+        if generation != self._generation:
+            return
+        self._last_term, self._last_rows, self._last_version = term, rows, version
+        self.on_results(rows)
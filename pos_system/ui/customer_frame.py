@@ -1,6 +1,6 @@
 import customtkinter as ctk
 from tkinter import ttk
-from ui.components import BaseFrame, MessageDialog
+from ui.components import BaseFrame, MessageDialog, KeyedTable, PagedTableLoader
 
 
 class CustomerManagementFrame(BaseFrame):
@@ -12,6 +12,10 @@ class CustomerManagementFrame(BaseFrame):
         self.create_widgets()
         self.load_customers()
     
+    def reload(self):
+        """Refresh the list when shown again, keeping any search term"""
+        self.search_controller.search_now()
+    
     def create_widgets(self):
         """Create customer management widgets"""
         
@@ -162,7 +166,24 @@ class CustomerManagementFrame(BaseFrame):
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        # Rows load a page at a time as the user scrolls
+        self.table_loader = PagedTableLoader(
+            KeyedTable(self.tree, self.customer_row_values), scrollbar,
+            on_count=lambda count: self.record_count_label.configure(text=f"{count} records"),
+            runner=self.run_in_background,
+            fill=self.fill_table
+        )
+        self.search_controller = self.create_search(
+            self.search_entry,
+            self.db_manager.search_customers,
+            self.table_loader.show_rows,
+            on_empty=self.load_customers,
+            match_fields=('full_name', 'mobile_number'),
+            # Ranked full-text results cannot be narrowed in memory
+            narrow_max_length=self.db_manager.FTS_MIN_TERM_LENGTH - 1,
+            on_start=self.table_loader.stop
+        )
         
         self.tree.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
         scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
@@ -277,50 +298,28 @@ class CustomerManagementFrame(BaseFrame):
         self.name_entry.focus()
     
     def load_customers(self):
-        """Load all customers"""
-        # Clear table
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        customers = self.db_manager.get_all_customers()
-        
-        for i, customer in enumerate(customers):
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
-                customer['id'],
-                customer['full_name'],
-                customer['mobile_number'],
-                customer['created_at']
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(customers)} records")
+        """Load customers by name, one page at a time"""
+        def fetch_page(last, page_size):
+            return self.db_manager.get_all_customers(
+                page_size=page_size,
+                after_full_name=last['full_name'] if last else None,
+                after_id=last['id'] if last else None
+            )
+        self.table_loader.reset(fetch_page)
     
     def search_customers(self):
         """Search customers"""
-        search_term = self.search_entry.get().strip()
-        
-        # Clear table
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if not search_term:
-            self.load_customers()
-            return
-        
-        customers = self.db_manager.search_customers(search_term)
-        
-        for i, customer in enumerate(customers):
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
-                customer['id'],
-                customer['full_name'],
-                customer['mobile_number'],
-                customer['created_at']
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(customers)} records")
+        # Debounced: runs once typing pauses, narrowing earlier results where it can
+        self.search_controller.schedule()
+    
+    def customer_row_values(self, customer):
+        """Table values for one customer"""
+        return (
+            customer['id'],
+            customer['full_name'],
+            customer['mobile_number'],
+            customer['created_at']
+        )
     
     def on_select(self, event):
         """Handle row selection"""
@@ -1,19 +1,20 @@
 import customtkinter as ctk
 from services.dashboard_service import DashboardService
+from ui.components import BaseFrame
 from datetime import datetime
 
 
-class DashboardFrame(ctk.CTkFrame):
+class DashboardFrame(BaseFrame):
     """Dashboard page with statistics and summary cards"""
     
     def __init__(self, parent, auth_manager, db_manager, main_app=None):
-        super().__init__(parent, fg_color="transparent")
-        self.auth_manager = auth_manager
-        self.db_manager = db_manager
+        super().__init__(parent, auth_manager, db_manager)
         self.dashboard_service = DashboardService()
         self.main_app = main_app
         
         self.create_widgets()
+        # Cards show a placeholder until the first load arrives from the worker thread
+        self.show_placeholders()
         self.load_stats()
     
     def is_admin(self):
@@ -25,6 +26,16 @@ class DashboardFrame(ctk.CTkFrame):
         if self.main_app:
             self.main_app.navigate_to(page)
     
+    def on_show(self):
+        """Refresh statistics in the background when shown again (served from the
+        stats cache if nothing changed); the previous figures stay until they arrive"""
+        self.load_stats()
+    
+    def on_hide(self):
+        """Stop a stats load still in flight; a refresh overlay is taken down with it"""
+        super().on_hide()
+        self.complete_refresh()
+    
     def create_widgets(self):
         """Create dashboard widgets"""
         
@@ -449,30 +460,63 @@ class DashboardFrame(ctk.CTkFrame):
         
         animate()
         
-        # Perform refresh after short delay
-        self.after(800, self.complete_refresh)
+        # Explicit refresh always re-reads instead of serving cached stats;
+        # the overlay stays until the worker finishes
+        self.load_stats(fresh=True, on_done=self.complete_refresh)
     
     def complete_refresh(self):
         """Complete the refresh process"""
-        try:
-            # Reload stats
-            self.load_stats()
-        finally:
-            # Remove loading overlay
-            if hasattr(self, 'loading_overlay') and self.loading_overlay.winfo_exists():
-                self.loading_overlay.destroy()
-            
-            # Re-enable refresh button
-            self.refresh_btn.configure(state="normal", text="🔄 Refresh")
+        # Remove loading overlay
+        if hasattr(self, 'loading_overlay') and self.loading_overlay.winfo_exists():
+            self.loading_overlay.destroy()
+        
+        # Re-enable refresh button
+        self.refresh_btn.configure(state="normal", text="🔄 Refresh")
     
-    def load_stats(self):
-        """Load dashboard statistics"""
+    def fetch_stats(self, is_admin: bool):
+        """Read dashboard statistics; touches no widgets, so it is safe off the Tk thread.
+        Returns (stats, staff_stats), with staff_stats None for admins."""
         # Load appropriate stats based on user role
-        if self.is_admin():
-            stats = self.dashboard_service.get_admin_dashboard_stats()
-        else:
-            stats = self.dashboard_service.get_dashboard_stats()
-        
+        if is_admin:
+            return self.dashboard_service.get_admin_dashboard_stats(), None
+        # The staff stats carry the shared counters too, so one cached pass serves both
+        staff_stats = self.dashboard_service.get_staff_dashboard_stats()
+        return staff_stats, staff_stats
+    
+    def load_stats(self, fresh: bool = False, on_done=None):
+        """Load dashboard statistics in the background and show them once they arrive,
+        so a large database never blocks the Tk thread. A newer load supersedes one
+        still in flight. fresh skips the stats cache; on_done() runs on the Tk thread
+        afterwards, even if the load failed."""
+        is_admin = self.is_admin()
+        
+        def work():
+            if fresh:
+                self.dashboard_service.invalidate_cache()
+            return self.fetch_stats(is_admin)
+        
+        def shown(fetched):
+            try:
+                self.apply_stats(*fetched)
+            finally:
+                if on_done:
+                    on_done()
+        
+        def failed(error):
+            print(f"Dashboard refresh error: {error}")
+            if on_done:
+                on_done()
+        
+        self.run_in_background(work, shown, key='stats', on_error=failed)
+    
+    def show_placeholders(self):
+        """Show a placeholder in every statistics card"""
+        for widget in list(vars(self).values()):
+            if isinstance(widget, ctk.CTkFrame) and hasattr(widget, 'value_label'):
+                widget.value_label.configure(text="…")
+    
+    def apply_stats(self, stats, staff_stats=None):
+        """Show fetched statistics in the cards and staff widgets"""
         # Update general stats (visible to all)
         self.today_invoices_card.value_label.configure(
             text=str(stats['today_invoices'])
@@ -546,11 +590,10 @@ class DashboardFrame(ctk.CTkFrame):
             )
         else:
             # Load staff-specific widget data
-            self.load_staff_widgets()
+            self.load_staff_widgets(staff_stats or {})
     
-    def load_staff_widgets(self):
+    def load_staff_widgets(self, staff_stats):
         """Load staff-specific widget data"""
-        staff_stats = self.dashboard_service.get_staff_dashboard_stats()
         
         # Clear existing widget contents
         for widget in self.bookings_list_frame.winfo_children():
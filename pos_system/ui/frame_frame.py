@@ -1,6 +1,6 @@
 import customtkinter as ctk
 from tkinter import ttk
-from ui.components import BaseFrame, MessageDialog
+from ui.components import BaseFrame, MessageDialog, KeyedTable
 
 
 class FrameManagementFrame(BaseFrame):
@@ -12,6 +12,10 @@ class FrameManagementFrame(BaseFrame):
         self.create_widgets()
         self.load_frames()
     
+    def reload(self):
+        """Refresh the frame list when shown again"""
+        self.load_frames()
+    
     def create_widgets(self):
         """Create frame management widgets"""
         
@@ -203,6 +207,8 @@ class FrameManagementFrame(BaseFrame):
         self.tree.tag_configure('oddrow', background='#1e1e3f', foreground='#e0e0e0')
         self.tree.tag_configure('evenrow', background='#252545', foreground='#e0e0e0')
         self.tree.tag_configure('lowstock', background='#3a2020', foreground='#ff6b6b')
+        # Refreshes change only the rows that differ
+        self.table = KeyedTable(self.tree, self.frame_row_values, self.frame_row_tag)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.tree.yview)
@@ -362,47 +368,41 @@ class FrameManagementFrame(BaseFrame):
     
     def load_frames(self):
         """Load all photo frames"""
-        # Clear table
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         frames = self.db_manager.get_all_photo_frames()
+        self.fill_table(self.table, frames)
         
-        for i, frame in enumerate(frames):
+        # Update record count
+        self.record_count_label.configure(text=f"{len(frames)} records")
+    
+    def frame_row_tag(self, frame):
+        """Color code low stock items (others get alternating colors)"""
+        return 'lowstock' if frame['quantity'] < 10 else None
+    
+    def frame_row_values(self, frame):
+        """Table values for one frame (cost and profit columns for admins only)"""
+        if self.is_admin():
             buying = frame.get('buying_price', 0) or 0
             selling = frame.get('selling_price', 0) or 0
             profit = selling - buying
-            
-            # Color code low stock items, otherwise use alternating colors
-            if frame['quantity'] < 10:
-                tag = 'lowstock'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            if self.is_admin():
-                self.tree.insert("", "end", values=(
-                    frame['id'],
-                    frame['frame_name'],
-                    frame['size'],
-                    f"{buying:.2f}",
-                    f"{selling:.2f}",
-                    f"{frame['price']:.2f}",
-                    frame['quantity'],
-                    f"{profit:.2f}",
-                    frame['created_at']
-                ), tags=(tag,))
-            else:
-                self.tree.insert("", "end", values=(
-                    frame['id'],
-                    frame['frame_name'],
-                    frame['size'],
-                    f"{frame['price']:.2f}",
-                    frame['quantity'],
-                    frame['created_at']
-                ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(frames)} records")
+            return (
+                frame['id'],
+                frame['frame_name'],
+                frame['size'],
+                f"{buying:.2f}",
+                f"{selling:.2f}",
+                f"{frame['price']:.2f}",
+                frame['quantity'],
+                f"{profit:.2f}",
+                frame['created_at']
+            )
+        return (
+            frame['id'],
+            frame['frame_name'],
+            frame['size'],
+            f"{frame['price']:.2f}",
+            frame['quantity'],
+            frame['created_at']
+        )
     
     def on_select(self, event):
         """Handle row selection"""
@@ -1,7 +1,7 @@
 import customtkinter as ctk
 from tkinter import ttk
-from ui.components import BaseFrame, MessageDialog
-from services import InvoiceGenerator
+from ui.components import BaseFrame, MessageDialog, KeyedTable, PagedTableLoader
+from functools import cached_property
 
 
 class InvoiceHistoryFrame(BaseFrame):
@@ -9,10 +9,19 @@ class InvoiceHistoryFrame(BaseFrame):
     
     def __init__(self, parent, auth_manager, db_manager):
         super().__init__(parent, auth_manager, db_manager)
-        self.invoice_generator = InvoiceGenerator()
         self.create_widgets()
         self.load_invoices()
     
+    @cached_property
+    def invoice_generator(self):
+        """Invoice generator for reprints, created on first use"""
+        from services.invoice_generator import InvoiceGenerator
+        return InvoiceGenerator()
+    
+    def reload(self):
+        """Refresh the list when shown again, keeping any search term"""
+        self.search_controller.search_now()
+    
     def create_widgets(self):
         """Create invoice history widgets"""
         
@@ -146,7 +155,24 @@ class InvoiceHistoryFrame(BaseFrame):
         self.tree.tag_configure('hasbalance', background='#3a2e1e', foreground='#ffd93d')
         
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        # Rows load a page at a time as the user scrolls
+        self.table_loader = PagedTableLoader(
+            KeyedTable(self.tree, self.invoice_row_values, self.invoice_row_tag), scrollbar,
+            on_count=lambda count: self.record_count_label.configure(text=f"{count} records"),
+            runner=self.run_in_background,
+            fill=self.fill_table
+        )
+        self.search_controller = self.create_search(
+            self.search_entry,
+            lambda term: self.db_manager.search_invoices(term, kind='booking'),
+            self.table_loader.show_rows,
+            on_empty=self.load_invoices,
+            match_fields=self.db_manager.INVOICE_SEARCH_FIELDS,
+            # Ranked full-text results cannot be narrowed in memory
+            narrow_max_length=self.db_manager.FTS_MIN_TERM_LENGTH - 1,
+            on_start=self.table_loader.stop
+        )
         
         self.tree.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
         scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
@@ -155,91 +181,41 @@ class InvoiceHistoryFrame(BaseFrame):
         self.tree.bind("<Double-Button-1>", lambda e: self.view_invoice_details())
     
     def load_invoices(self):
-        """Load only booking invoices (not bills)"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Get only booking invoices (invoice_number starts with 'BK-' or has booking_id)
-        all_invoices = self.db_manager.get_all_invoices(limit=200)
-        invoices = [inv for inv in all_invoices if inv['invoice_number'].startswith('BK-') or inv.get('booking_id')]
-        
-        for i, invoice in enumerate(invoices):
-            balance = invoice['balance_amount']
-            # Highlight invoices with pending balance
-            if balance > 0:
-                tag = 'hasbalance'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            # Get service name from booking
-            service_name = 'N/A'
-            if invoice.get('booking_id'):
-                booking = self.db_manager.get_booking_by_id(invoice['booking_id'])
-                if booking:
-                    service_name = booking.get('photoshoot_category', 'N/A')
-                    # Remove "Category - " prefix if it exists
-                    if ' - ' in service_name:
-                        service_name = service_name.split(' - ', 1)[1]
-            
-            self.tree.insert("", "end", values=(
-                invoice['invoice_number'],
-                invoice['created_at'],
-                invoice['full_name'],
-                invoice['mobile_number'],
-                service_name,
-                f"{invoice['total_amount']:.2f}",
-                f"{invoice['paid_amount']:.2f}",
-                f"{invoice['balance_amount']:.2f}"
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(invoices)} records")
+        """Load only booking invoices (not bills), newest first, one page at a time"""
+        def fetch_page(last, page_size):
+            return self.db_manager.get_all_invoices(
+                page_size=page_size, kind='booking',
+                after_created_at=last['created_at'] if last else None,
+                after_id=last['id'] if last else None
+            )
+        self.table_loader.reset(fetch_page)
     
     def search_invoices(self):
         """Search booking invoices only"""
-        search_term = self.search_entry.get().strip()
-        
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if not search_term:
-            self.load_invoices()
-            return
-        
-        all_invoices = self.db_manager.search_invoices(search_term)
-        # Filter to only booking invoices
-        invoices = [inv for inv in all_invoices if inv['invoice_number'].startswith('BK-') or inv.get('booking_id')]
-        
-        for i, invoice in enumerate(invoices):
-            balance = invoice['balance_amount']
-            if balance > 0:
-                tag = 'hasbalance'
-            else:
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            
-            # Get service name from booking
-            service_name = 'N/A'
-            if invoice.get('booking_id'):
-                booking = self.db_manager.get_booking_by_id(invoice['booking_id'])
-                if booking:
-                    service_name = booking.get('photoshoot_category', 'N/A')
-                    # Remove "Category - " prefix if it exists
-                    if ' - ' in service_name:
-                        service_name = service_name.split(' - ', 1)[1]
-            
-            self.tree.insert("", "end", values=(
-                invoice['invoice_number'],
-                invoice['created_at'],
-                invoice['full_name'],
-                invoice['mobile_number'],
-                service_name,
-                f"{invoice['total_amount']:.2f}",
-                f"{invoice['paid_amount']:.2f}",
-                f"{invoice['balance_amount']:.2f}"
-            ), tags=(tag,))
-        
-        # Update record count
-        self.record_count_label.configure(text=f"{len(invoices)} records")
+        # Debounced: runs once typing pauses, narrowing earlier results where it can
+        self.search_controller.schedule()
+    
+    def invoice_row_tag(self, invoice):
+        """Highlight invoices with pending balance"""
+        return 'hasbalance' if invoice['balance_amount'] > 0 else None
+    
+    def invoice_row_values(self, invoice):
+        """Table values for one invoice (service name comes joined in from the query)"""
+        service_name = invoice.get('service_name') or 'N/A'
+        # Remove "Category - " prefix if it exists
+        if ' - ' in service_name:
+            service_name = service_name.split(' - ', 1)[1]
+        
+        return (
+            invoice['invoice_number'],
+            invoice['created_at'],
+            invoice['full_name'],
+            invoice['mobile_number'],
+            service_name,
+            f"{invoice['total_amount']:.2f}",
+            f"{invoice['paid_amount']:.2f}",
+            f"{invoice['balance_amount']:.2f}"
+        )
     
     def view_invoice_details(self):
         """View detailed invoice information"""
@@ -30,6 +30,10 @@ class PermissionsFrame(ctk.CTkFrame):
         self.create_ui()
         self.load_staff_users()
     
+    def on_show(self):
+        """Refresh the staff list when shown again"""
+        self.load_staff_users()
+    
     def create_ui(self):
         """Create the permissions management UI"""
         # Header
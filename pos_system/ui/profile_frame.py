@@ -20,6 +20,10 @@ class ProfileFrame(ctk.CTkFrame):
         self.create_widgets()
         self.load_profile()
     
+    def on_show(self):
+        """Refresh profile details when shown again"""
+        self.load_profile()
+    
     def create_widgets(self):
         """Create profile widgets with full-width layout"""
         
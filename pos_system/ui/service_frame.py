@@ -1,6 +1,6 @@
 import customtkinter as ctk
 from tkinter import ttk
-from ui.components import BaseFrame, MessageDialog
+from ui.components import BaseFrame, MessageDialog, KeyedTable
 
 
 class ServiceManagementFrame(BaseFrame):
@@ -14,6 +14,11 @@ class ServiceManagementFrame(BaseFrame):
         self.load_categories()
         self.load_services()
     
+    def reload(self):
+        """Refresh categories and services when shown again"""
+        self.load_categories()
+        self.load_services()
+    
     def create_widgets(self):
         """Create service management widgets"""
         
@@ -160,6 +165,8 @@ class ServiceManagementFrame(BaseFrame):
         # Configure row tags for alternating colors
         self.tree.tag_configure('oddrow', background='#1e1e3f', foreground='#e0e0e0')
         self.tree.tag_configure('evenrow', background='#252545', foreground='#e0e0e0')
+        # Refreshes change only the rows that differ
+        self.table = KeyedTable(self.tree, self.service_row_values)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.tree.yview)
@@ -277,26 +284,22 @@ class ServiceManagementFrame(BaseFrame):
     
     def load_services(self):
         """Load all services"""
-        # Clear table
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         services = self.db_manager.get_all_services()
-        
-        for i, service in enumerate(services):
-            category_name = service.get('category_name', 'N/A') or 'N/A'
-            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
-                service['id'],
-                service['service_name'],
-                category_name,
-                f"{service['price']:.2f}",
-                service['created_at']
-            ), tags=(tag,))
+        self.fill_table(self.table, services)
         
         # Update record count
         self.record_count_label.configure(text=f"{len(services)} records")
     
+    def service_row_values(self, service):
+        """Table values for one service"""
+        return (
+            service['id'],
+            service['service_name'],
+            service.get('category_name', 'N/A') or 'N/A',
+            f"{service['price']:.2f}",
+            service['created_at']
+        )
+    
     def on_select(self, event):
         """Handle row selection"""
         selection = self.tree.selection()
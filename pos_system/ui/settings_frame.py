@@ -46,6 +46,10 @@ class SettingsFrame(ctk.CTkFrame):
             text_color="#aaaaaa"
         ).pack()
     
+    def on_show(self):
+        """Refresh settings when shown again"""
+        self.load_settings()
+    
     def create_widgets(self):
         """Create settings widgets"""
         
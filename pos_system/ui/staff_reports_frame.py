@@ -2,25 +2,32 @@ import customtkinter as ctk
 from tkinter import ttk
 from datetime import datetime, date
 from tkcalendar import DateEntry
-from ui.components import Toast
-from services.staff_report_generator import StaffReportGenerator
+from ui.components import BaseFrame, Toast, KeyedTable
+from functools import cached_property
 
 
-class StaffReportsFrame(ctk.CTkFrame):
+class StaffReportsFrame(BaseFrame):
     """Admin frame for viewing and generating staff daily work reports"""
     
     def __init__(self, parent, auth_manager, db_manager):
-        super().__init__(parent, fg_color="transparent")
+        super().__init__(parent, auth_manager, db_manager)
         
-        self.auth_manager = auth_manager
-        self.db_manager = db_manager
-        self.report_generator = StaffReportGenerator()
         self.selected_user_id = None
         self.selected_user_data = None
         
         self.create_ui()
         self.load_users()
     
+    @cached_property
+    def report_generator(self):
+        """Report generator, created when the first report is exported"""
+        from services.staff_report_generator import StaffReportGenerator
+        return StaffReportGenerator()
+    
+    def reload(self):
+        """Refresh the staff list when shown again"""
+        self.load_users()
+    
     def create_ui(self):
         """Create the staff reports UI"""
         # Header
@@ -279,6 +286,7 @@ class StaffReportsFrame(ctk.CTkFrame):
         # Configure row tags
         self.invoices_tree.tag_configure('oddrow', background='#1e1e3f', foreground='#e0e0e0')
         self.invoices_tree.tag_configure('evenrow', background='#252545', foreground='#e0e0e0')
+        self.invoices_table = KeyedTable(self.invoices_tree, self.invoice_row_values, striped=False)
         
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.invoices_tree.yview)
         self.invoices_tree.configure(yscrollcommand=scrollbar.set)
@@ -330,6 +338,7 @@ class StaffReportsFrame(ctk.CTkFrame):
         # Configure row tags
         self.bookings_tree.tag_configure('oddrow', background='#1e1e3f', foreground='#e0e0e0')
         self.bookings_tree.tag_configure('evenrow', background='#252545', foreground='#e0e0e0')
+        self.bookings_table = KeyedTable(self.bookings_tree, self.booking_row_values, striped=False)
         
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.bookings_tree.yview)
         self.bookings_tree.configure(yscrollcommand=scrollbar.set)
@@ -375,6 +384,7 @@ class StaffReportsFrame(ctk.CTkFrame):
         # Configure row tags
         self.customers_tree.tag_configure('oddrow', background='#1e1e3f', foreground='#e0e0e0')
         self.customers_tree.tag_configure('evenrow', background='#252545', foreground='#e0e0e0')
+        self.customers_table = KeyedTable(self.customers_tree, self.customer_row_values, striped=False)
         
         scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.customers_tree.yview)
         self.customers_tree.configure(yscrollcommand=scrollbar.set)
@@ -415,59 +425,36 @@ class StaffReportsFrame(ctk.CTkFrame):
             return
         
         selected_date = self.date_entry.get_date().strftime('%Y-%m-%d')
-        
-        # Get records
-        invoices = self.db_manager.get_staff_invoices_by_date(self.selected_user_id, selected_date)
-        bookings = self.db_manager.get_staff_bookings_by_date(self.selected_user_id, selected_date)
-        customers = self.db_manager.get_staff_customers_by_date(self.selected_user_id, selected_date)
+        user_id = self.selected_user_id
+        
+        def fetch_records():
+            return {
+                'invoices': self.db_manager.get_staff_invoices_by_date(user_id, selected_date),
+                'bookings': self.db_manager.get_staff_bookings_by_date(user_id, selected_date),
+                'customers': self.db_manager.get_staff_customers_by_date(user_id, selected_date),
+                'summary': self.db_manager.get_staff_daily_summary(user_id, selected_date),
+            }
+        
+        # Query off the Tk thread; picking another staff member or date supersedes this request
+        self.run_in_background(
+            fetch_records,
+            lambda records: self.show_records(selected_date, records),
+            key='records'
+        )
+    
+    def show_records(self, selected_date: str, records: dict):
+        """Fill the summary cards and tables with fetched records"""
+        invoices = records['invoices']
+        bookings = records['bookings']
+        customers = records['customers']
         
         # Update summary
-        summary = self.db_manager.get_staff_daily_summary(self.selected_user_id, selected_date)
-        self.create_summary_cards(summary)
-        
-        # Update invoices table
-        for item in self.invoices_tree.get_children():
-            self.invoices_tree.delete(item)
+        self.create_summary_cards(records['summary'])
         
-        for inv in invoices:
-            created_time = inv.get('created_at', '')
-            if ' ' in created_time:
-                created_time = created_time.split(' ')[1][:5]
-            
-            self.invoices_tree.insert('', 'end', values=(
-                inv.get('invoice_number', '-'),
-                inv.get('customer_name', '-'),
-                f"{inv.get('total_amount', 0):,.2f}",
-                f"{inv.get('paid_amount', 0):,.2f}",
-                f"{inv.get('balance_amount', 0):,.2f}",
-                created_time
-            ))
-        
-        # Update bookings table
-        for item in self.bookings_tree.get_children():
-            self.bookings_tree.delete(item)
-        
-        for b in bookings:
-            self.bookings_tree.insert('', 'end', values=(
-                b.get('customer_name', '-'),
-                b.get('photoshoot_category', '-'),
-                b.get('booking_date', '-'),
-                f"{b.get('full_amount', 0):,.2f}",
-                f"{b.get('advance_payment', 0):,.2f}",
-                b.get('status', '-')
-            ))
-        
-        # Update customers table
-        for item in self.customers_tree.get_children():
-            self.customers_tree.delete(item)
-        
-        for c in customers:
-            created_at = c.get('created_at', '-')
-            self.customers_tree.insert('', 'end', values=(
-                c.get('full_name', '-'),
-                c.get('mobile_number', '-'),
-                created_at
-            ))
+        # Update tables (only rows that differ change; long lists fill in chunks)
+        self.fill_table(self.invoices_table, invoices)
+        self.fill_table(self.bookings_table, bookings)
+        self.fill_table(self.customers_table, customers)
         
         # Store current records for PDF generation
         self.current_records = {
@@ -478,6 +465,40 @@ class StaffReportsFrame(ctk.CTkFrame):
         
         Toast.show_toast(self, "Records Loaded", f"Showing records for {selected_date}", "success")
     
+    def invoice_row_values(self, inv):
+        """Invoices table values for one invoice"""
+        created_time = inv.get('created_at', '')
+        if ' ' in created_time:
+            created_time = created_time.split(' ')[1][:5]
+        
+        return (
+            inv.get('invoice_number', '-'),
+            inv.get('customer_name', '-'),
+            f"{inv.get('total_amount', 0):,.2f}",
+            f"{inv.get('paid_amount', 0):,.2f}",
+            f"{inv.get('balance_amount', 0):,.2f}",
+            created_time
+        )
+    
+    def booking_row_values(self, b):
+        """Bookings table values for one booking"""
+        return (
+            b.get('customer_name', '-'),
+            b.get('photoshoot_category', '-'),
+            b.get('booking_date', '-'),
+            f"{b.get('full_amount', 0):,.2f}",
+            f"{b.get('advance_payment', 0):,.2f}",
+            b.get('status', '-')
+        )
+    
+    def customer_row_values(self, c):
+        """Customers table values for one customer"""
+        return (
+            c.get('full_name', '-'),
+            c.get('mobile_number', '-'),
+            c.get('created_at', '-')
+        )
+    
     def download_report(self):
         """Generate and download PDF report"""
         if not self.selected_user_id or not self.selected_user_data:
@@ -48,6 +48,10 @@ class UsersManagementFrame(ctk.CTkFrame):
             text_color="#aaaaaa"
         ).pack()
     
+    def on_show(self):
+        """Refresh the user list when shown again"""
+        self.load_users()
+    
     def create_widgets(self):
         """Create user management widgets"""
         